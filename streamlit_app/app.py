@@ -5,6 +5,27 @@ import plotly.graph_objects as go
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
+import os
+import tempfile
+import textwrap
+import weakref
+from sandoz_pipeline.store import ProductStore
+from sandoz_pipeline.loaders import load_portfolio_data, portfolio_fingerprint
+from sandoz_pipeline.export import EXPORT_FORMATS, export_to_file
+from sandoz_pipeline.simulation import simulate_portfolio
+from utils import (
+    create_scenario_comparison_dataframe, create_portfolio_table,
+    sort_portfolio_table, paginate
+)
+from sandoz_pipeline.config import SIMULATION_CONFIG, VALUATION_CONFIG, REVENUE_WATERFALL, REPORTING_CURRENCY, MILESTONE_SCHEDULE, OPTIMIZER_CONFIG, PHASE_COLORS, PRIORITY_COLORS, DIFFUSION_CONFIG
+from sandoz_pipeline.diffusion import DIFFUSION_MODELS, PARAMETER_NAMES, UPTAKE_TIMES, diffusion_share, monthly_uptake, peak_adoption_year
+from sandoz_pipeline.phases import Phase
+from sandoz_pipeline.optimizer import launch_candidates, optimize_portfolio, priority_ranking, selection_frame, summarize
+from sandoz_pipeline.fx import load_rate_table, currency_symbol
+from sandoz_pipeline.sensitivity import run_sensitivity, tornado_frame, driver_ranking
+from sandoz_pipeline.versioning import VersionLog, describe_change, is_structured
+from sandoz_pipeline.ingest import INGEST_FORMATS, ingest_products
+from sandoz_pipeline.profiling import Profiler, chrome_trace, record_cache, tracked_call
 
 # Page configuration
 st.set_page_config(
@@ -14,782 +35,761 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for styling
-st.markdown("""
-    <style>
-    .main {
-        background: linear-gradient(135deg, #f0f4f8 0%, #e8eef5 100%);
-    }
+# Opt-in rerun profiling, kept per session so reruns build a rolling history
+PROFILER = st.session_state.setdefault("profiler", Profiler())
+PROFILER.enabled = st.sidebar.checkbox("🛠️ Profile reruns", False, key="profiling_enabled",
+                                       help="Time each section of the app and keep a history across reruns")
+if PROFILER.enabled:
+    PROFILER.begin_run()
+
+try:
+    # Custom CSS for styling
+    with PROFILER.section("css_injection"):
+        st.markdown("""
+        <style>
+        .main {
+            background: linear-gradient(135deg, #f0f4f8 0%, #e8eef5 100%);
+        }
     
-    /* Enhanced metric card */
-    .metric-card {
-        background: white;
-        padding: 20px;
-        border-radius: 12px;
-        box-shadow: 0 4px 16px rgba(0,0,0,0.12), 0 1px 3px rgba(0,0,0,0.08);
-        border-left: 5px solid #2563eb;
-        transition: all 0.3s ease;
-    }
+        /* Enhanced metric card */
+        .metric-card {
+            background: white;
+            padding: 20px;
+            border-radius: 12px;
+            box-shadow: 0 4px 16px rgba(0,0,0,0.12), 0 1px 3px rgba(0,0,0,0.08);
+            border-left: 5px solid #2563eb;
+            transition: all 0.3s ease;
+        }
     
-    .metric-card:hover {
-        box-shadow: 0 8px 32px rgba(0,0,0,0.16), 0 2px 6px rgba(0,0,0,0.1);
-        transform: translateY(-2px);
-    }
+        .metric-card:hover {
+            box-shadow: 0 8px 32px rgba(0,0,0,0.16), 0 2px 6px rgba(0,0,0,0.1);
+            transform: translateY(-2px);
+        }
     
-    .metric-value {
-        font-size: 32px;
-        font-weight: 800;
-        color: #1f2937;
-        text-shadow: 0 2px 4px rgba(0,0,0,0.05);
-    }
+        .metric-value {
+            font-size: 32px;
+            font-weight: 800;
+            color: #1f2937;
+            text-shadow: 0 2px 4px rgba(0,0,0,0.05);
+        }
     
-    .metric-label {
-        font-size: 12px;
-        color: #6b7280;
-        margin-bottom: 8px;
-        font-weight: 600;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
+        .metric-label {
+            font-size: 12px;
+            color: #6b7280;
+            margin-bottom: 8px;
+            font-weight: 600;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+        }
     
-    /* Product card with depth */
-    .product-card {
-        background: white;
-        padding: 18px;
-        border-radius: 12px;
-        border: 1px solid #e5e7eb;
-        margin-bottom: 12px;
-        box-shadow: 0 2px 12px rgba(0,0,0,0.08);
-        transition: all 0.3s ease;
-        cursor: pointer;
-    }
+        /* Product card with depth */
+        .product-card {
+            background: white;
+            padding: 18px;
+            border-radius: 12px;
+            border: 1px solid #e5e7eb;
+            margin-bottom: 12px;
+            box-shadow: 0 2px 12px rgba(0,0,0,0.08);
+            transition: all 0.3s ease;
+            cursor: pointer;
+        }
     
-    .product-card:hover {
-        box-shadow: 0 8px 24px rgba(37, 99, 235, 0.15), 0 4px 12px rgba(0,0,0,0.1);
-        transform: translateY(-2px);
-        border-color: #3b82f6;
-    }
+        .product-card:hover {
+            box-shadow: 0 8px 24px rgba(37, 99, 235, 0.15), 0 4px 12px rgba(0,0,0,0.1);
+            transform: translateY(-2px);
+            border-color: #3b82f6;
+        }
     
-    .section-header {
-        font-size: 20px;
-        font-weight: 800;
-        color: #1f2937;
-        margin-bottom: 20px;
-        display: flex;
-        align-items: center;
-        text-shadow: 0 1px 2px rgba(0,0,0,0.05);
-    }
+        .section-header {
+            font-size: 20px;
+            font-weight: 800;
+            color: #1f2937;
+            margin-bottom: 20px;
+            display: flex;
+            align-items: center;
+            text-shadow: 0 1px 2px rgba(0,0,0,0.05);
+        }
     
-    /* Enhanced Tab styling */
-    .stTabs [data-baseweb="tab-list"] button {
-        font-size: 16px;
-        font-weight: 700;
-        padding: 14px 28px;
-        border-radius: 10px;
-        background-color: #f3f4f6;
-        color: #374151;
-        border: 2px solid #d1d5db;
-        margin-right: 12px;
-        transition: all 0.3s ease;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.06);
-    }
+        /* Enhanced Tab styling */
+        .stTabs [data-baseweb="tab-list"] button {
+            font-size: 16px;
+            font-weight: 700;
+            padding: 14px 28px;
+            border-radius: 10px;
+            background-color: #f3f4f6;
+            color: #374151;
+            border: 2px solid #d1d5db;
+            margin-right: 12px;
+            transition: all 0.3s ease;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.06);
+        }
     
-    .stTabs [data-baseweb="tab-list"] button:hover {
-        background-color: #e5e7eb;
-        transform: translateY(-2px);
-        box-shadow: 0 4px 16px rgba(0,0,0,0.1);
-    }
+        .stTabs [data-baseweb="tab-list"] button:hover {
+            background-color: #e5e7eb;
+            transform: translateY(-2px);
+            box-shadow: 0 4px 16px rgba(0,0,0,0.1);
+        }
     
-    .stTabs [data-baseweb="tab-list"] button[aria-selected="true"] {
-        background: linear-gradient(135deg, #3b82f6 0%, #1d4ed8 100%);
-        color: white;
-        border: 2px solid #1d4ed8;
-        box-shadow: 0 8px 24px rgba(59, 130, 246, 0.5), 0 4px 12px rgba(59, 130, 246, 0.3);
-        font-weight: 800;
-    }
+        .stTabs [data-baseweb="tab-list"] button[aria-selected="true"] {
+            background: linear-gradient(135deg, #3b82f6 0%, #1d4ed8 100%);
+            color: white;
+            border: 2px solid #1d4ed8;
+            box-shadow: 0 8px 24px rgba(59, 130, 246, 0.5), 0 4px 12px rgba(59, 130, 246, 0.3);
+            font-weight: 800;
+        }
     
-    /* Colored containers for sections with enhanced shadows */
-    .uptake-container {
-        background: linear-gradient(135deg, #e0f2fe 0%, #f0f9ff 100%);
-        padding: 18px;
-        border-radius: 14px;
-        border-left: 6px solid #0284c7;
-        margin: 16px 0;
-        box-shadow: 0 4px 16px rgba(2, 132, 199, 0.15), 0 2px 8px rgba(0,0,0,0.06);
-        transition: all 0.3s ease;
-    }
+        /* Colored containers for sections with enhanced shadows */
+        .uptake-container {
+            background: linear-gradient(135deg, #e0f2fe 0%, #f0f9ff 100%);
+            padding: 18px;
+            border-radius: 14px;
+            border-left: 6px solid #0284c7;
+            margin: 16px 0;
+            box-shadow: 0 4px 16px rgba(2, 132, 199, 0.15), 0 2px 8px rgba(0,0,0,0.06);
+            transition: all 0.3s ease;
+        }
     
-    .uptake-container:hover {
-        box-shadow: 0 8px 28px rgba(2, 132, 199, 0.25), 0 4px 12px rgba(0,0,0,0.1);
-        transform: translateY(-2px);
-    }
+        .uptake-container:hover {
+            box-shadow: 0 8px 28px rgba(2, 132, 199, 0.25), 0 4px 12px rgba(0,0,0,0.1);
+            transform: translateY(-2px);
+        }
     
-    .pricing-container {
-        background: linear-gradient(135deg, #f0fdf4 0%, #f7fee7 100%);
-        padding: 18px;
-        border-radius: 14px;
-        border-left: 6px solid #65a30d;
-        margin: 16px 0;
-        box-shadow: 0 4px 16px rgba(101, 163, 13, 0.15), 0 2px 8px rgba(0,0,0,0.06);
-        transition: all 0.3s ease;
-    }
+        .pricing-container {
+            background: linear-gradient(135deg, #f0fdf4 0%, #f7fee7 100%);
+            padding: 18px;
+            border-radius: 14px;
+            border-left: 6px solid #65a30d;
+            margin: 16px 0;
+            box-shadow: 0 4px 16px rgba(101, 163, 13, 0.15), 0 2px 8px rgba(0,0,0,0.06);
+            transition: all 0.3s ease;
+        }
     
-    .pricing-container:hover {
-        box-shadow: 0 8px 28px rgba(101, 163, 13, 0.25), 0 4px 12px rgba(0,0,0,0.1);
-        transform: translateY(-2px);
-    }
+        .pricing-container:hover {
+            box-shadow: 0 8px 28px rgba(101, 163, 13, 0.25), 0 4px 12px rgba(0,0,0,0.1);
+            transform: translateY(-2px);
+        }
     
-    .access-container {
-        background: linear-gradient(135deg, #fef3c7 0%, #fffbeb 100%);
-        padding: 18px;
-        border-radius: 14px;
-        border-left: 6px solid #ca8a04;
-        margin: 16px 0;
-        box-shadow: 0 4px 16px rgba(202, 138, 4, 0.15), 0 2px 8px rgba(0,0,0,0.06);
-        transition: all 0.3s ease;
-    }
+        .access-container {
+            background: linear-gradient(135deg, #fef3c7 0%, #fffbeb 100%);
+            padding: 18px;
+            border-radius: 14px;
+            border-left: 6px solid #ca8a04;
+            margin: 16px 0;
+            box-shadow: 0 4px 16px rgba(202, 138, 4, 0.15), 0 2px 8px rgba(0,0,0,0.06);
+            transition: all 0.3s ease;
+        }
     
-    .access-container:hover {
-        box-shadow: 0 8px 28px rgba(202, 138, 4, 0.25), 0 4px 12px rgba(0,0,0,0.1);
-        transform: translateY(-2px);
-    }
+        .access-container:hover {
+            box-shadow: 0 8px 28px rgba(202, 138, 4, 0.25), 0 4px 12px rgba(0,0,0,0.1);
+            transform: translateY(-2px);
+        }
     
-    .section-title {
-        font-size: 18px;
-        font-weight: 800;
-        color: #1f2937;
-        margin-bottom: 12px;
-        text-shadow: 0 1px 2px rgba(0,0,0,0.05);
-    }
+        .section-title {
+            font-size: 18px;
+            font-weight: 800;
+            color: #1f2937;
+            margin-bottom: 12px;
+            text-shadow: 0 1px 2px rgba(0,0,0,0.05);
+        }
     
-    /* Enhanced Financial metrics card */
-    .financial-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 28px;
-        border-radius: 16px;
-        color: white;
-        box-shadow: 0 12px 40px rgba(102, 126, 234, 0.5), 0 6px 20px rgba(118, 75, 162, 0.3), inset 0 1px 0 rgba(255,255,255,0.2);
-        border: 1px solid rgba(255,255,255,0.1);
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        position: relative;
-        overflow: hidden;
-    }
+        /* Enhanced Financial metrics card */
+        .financial-card {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            padding: 28px;
+            border-radius: 16px;
+            color: white;
+            box-shadow: 0 12px 40px rgba(102, 126, 234, 0.5), 0 6px 20px rgba(118, 75, 162, 0.3), inset 0 1px 0 rgba(255,255,255,0.2);
+            border: 1px solid rgba(255,255,255,0.1);
+            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+            position: relative;
+            overflow: hidden;
+        }
     
-    .financial-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.1), transparent);
-        transition: left 0.6s;
-    }
+        .financial-card::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: -100%;
+            width: 100%;
+            height: 100%;
+            background: linear-gradient(90deg, transparent, rgba(255,255,255,0.1), transparent);
+            transition: left 0.6s;
+        }
     
-    .financial-card:hover::before {
-        left: 100%;
-    }
+        .financial-card:hover::before {
+            left: 100%;
+        }
     
-    .financial-card:hover {
-        transform: translateY(-6px) scale(1.02);
-        box-shadow: 0 16px 56px rgba(102, 126, 234, 0.6), 0 8px 28px rgba(118, 75, 162, 0.4);
-    }
+        .financial-card:hover {
+            transform: translateY(-6px) scale(1.02);
+            box-shadow: 0 16px 56px rgba(102, 126, 234, 0.6), 0 8px 28px rgba(118, 75, 162, 0.4);
+        }
     
-    .financial-value {
-        font-size: 36px;
-        font-weight: 900;
-        color: white;
-        letter-spacing: -1px;
-        text-shadow: 0 2px 8px rgba(0,0,0,0.2);
-    }
+        .financial-value {
+            font-size: 36px;
+            font-weight: 900;
+            color: white;
+            letter-spacing: -1px;
+            text-shadow: 0 2px 8px rgba(0,0,0,0.2);
+        }
     
-    .financial-label {
-        font-size: 14px;
-        color: rgba(255,255,255,0.95);
-        margin-top: 10px;
-        font-weight: 700;
-        letter-spacing: 0.3px;
-    }
+        .financial-label {
+            font-size: 14px;
+            color: rgba(255,255,255,0.95);
+            margin-top: 10px;
+            font-weight: 700;
+            letter-spacing: 0.3px;
+        }
     
-    .financial-subtitle {
-        font-size: 12px;
-        color: rgba(255,255,255,0.75);
-        margin-top: 6px;
-        font-weight: 500;
-    }
+        .financial-subtitle {
+            font-size: 12px;
+            color: rgba(255,255,255,0.75);
+            margin-top: 6px;
+            font-weight: 500;
+        }
     
-    /* Enhanced Data display cards */
-    .data-card {
-        background: white;
-        padding: 18px;
-        border-radius: 12px;
-        border: 1px solid #e5e7eb;
-        margin: 12px 0;
-        box-shadow: 0 2px 12px rgba(0,0,0,0.08), 0 1px 4px rgba(0,0,0,0.04);
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-    }
+        /* Enhanced Data display cards */
+        .data-card {
+            background: white;
+            padding: 18px;
+            border-radius: 12px;
+            border: 1px solid #e5e7eb;
+            margin: 12px 0;
+            box-shadow: 0 2px 12px rgba(0,0,0,0.08), 0 1px 4px rgba(0,0,0,0.04);
+            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+        }
     
-    .data-card:hover {
-        box-shadow: 0 8px 24px rgba(37, 99, 235, 0.2), 0 4px 12px rgba(0,0,0,0.12);
-        border-color: #3b82f6;
-        transform: translateY(-3px);
-        background: linear-gradient(135deg, #ffffff 0%, #f8fbff 100%);
-    }
+        .data-card:hover {
+            box-shadow: 0 8px 24px rgba(37, 99, 235, 0.2), 0 4px 12px rgba(0,0,0,0.12);
+            border-color: #3b82f6;
+            transform: translateY(-3px);
+            background: linear-gradient(135deg, #ffffff 0%, #f8fbff 100%);
+        }
     
-    .data-card-title {
-        font-weight: 700;
-        color: #1f2937;
-        font-size: 14px;
-        margin-bottom: 8px;
-        text-transform: uppercase;
-        letter-spacing: 0.4px;
-        opacity: 0.8;
-    }
+        .data-card-title {
+            font-weight: 700;
+            color: #1f2937;
+            font-size: 14px;
+            margin-bottom: 8px;
+            text-transform: uppercase;
+            letter-spacing: 0.4px;
+            opacity: 0.8;
+        }
     
-    .data-card-value {
-        font-size: 22px;
-        font-weight: 900;
-        color: #2563eb;
-        text-shadow: 0 1px 3px rgba(37, 99, 235, 0.1);
-    }
+        .data-card-value {
+            font-size: 22px;
+            font-weight: 900;
+            color: #2563eb;
+            text-shadow: 0 1px 3px rgba(37, 99, 235, 0.1);
+        }
     
-    /* Dataframe styling */
-    .stDataFrame {
-        border-radius: 12px !important;
-        box-shadow: 0 4px 16px rgba(0,0,0,0.1) !important;
-        overflow: hidden !important;
-    }
+        /* Dataframe styling */
+        .stDataFrame {
+            border-radius: 12px !important;
+            box-shadow: 0 4px 16px rgba(0,0,0,0.1) !important;
+            overflow: hidden !important;
+        }
     
-    /* Button styling */
-    .stButton > button {
-        box-shadow: 0 4px 12px rgba(37, 99, 235, 0.25);
-        font-weight: 700;
-        border: none;
-        transition: all 0.3s ease;
-        letter-spacing: 0.3px;
-    }
+        /* Button styling */
+        .stButton > button {
+            box-shadow: 0 4px 12px rgba(37, 99, 235, 0.25);
+            font-weight: 700;
+            border: none;
+            transition: all 0.3s ease;
+            letter-spacing: 0.3px;
+        }
     
-    .stButton > button:hover {
-        box-shadow: 0 8px 24px rgba(37, 99, 235, 0.4);
-        transform: translateY(-2px);
-    }
+        .stButton > button:hover {
+            box-shadow: 0 8px 24px rgba(37, 99, 235, 0.4);
+            transform: translateY(-2px);
+        }
     
-    </style>
+        </style>
            
             
-""", unsafe_allow_html=True)
-
-# Formatting functions
-def format_number(num, decimals=1):
-    """Format number with commas (international system)"""
-    if isinstance(num, (int, float)):
-        return f"{num:,.{decimals}f}"
-    return str(num)
-
-def format_currency(num, symbol="$"):
-    """Format as currency with commas"""
-    if isinstance(num, (int, float)):
-        return f"{symbol}{num:,.1f}M" if num >= 1 else f"{symbol}{num*1000:,.0f}K"
-    return str(num)
-
-def format_percent(num):
-    """Format as percentage"""
-    if isinstance(num, (int, float)):
-        return f"{num:.1f}%"
-    return str(num)
-
-# Data structures
-class Priority(Enum):
-    HIGH = "High"
-    STRATEGIC = "Strategic"
-    MEDIUM = "Medium"
-    LOW = "Low"
-
-class Phase(Enum):
-    PRE_LAUNCH = "Pre-Launch"
-    FILED = "Filed"
-    PHASE_3 = "Phase 3"
-
-# Pipeline products data
-PIPELINE_PRODUCTS = [
-    {
-        "id": "PRODUCT-001",
-        "name": "Biosimilar Humira (Adalimumab)",
-        "archetype": "Med Benefit High",
-        "phase": "Pre-Launch",
-        "launchDate": "2026-Q2",
-        "territory": "US",
-        "priority": "High",
-        "npv": 245.6,
-        "assumptions": {
-            "uptake": {"y1": 8, "y2": 15, "y3": 22, "y4": 28, "y5": 32},
-            "peakShare": 32,
-            "pricing": {"wac": 850, "asp": 765, "gtn": 45},
-            "access": {"tier1": 60, "tier2": 30, "tier3": 10},
-            "competition": "High (5+ competitors)",
-            "jcode": "Applied - 18mo to launch",
-            "distribution": "Specialty + Limited"
-        },
-        "lastUpdated": "2026-01-28",
-        "updatedBy": "Sarah Chen (US Market Access)"
-    },
-    {
-        "id": "PRODUCT-002",
-        "name": "Biosimilar Enbrel (Etanercept)",
-        "archetype": "Med Benefit Med",
-        "phase": "Filed",
-        "launchDate": "2026-Q4",
-        "territory": "US",
-        "priority": "Medium",
-        "npv": 178.3,
-        "assumptions": {
-            "uptake": {"y1": 6, "y2": 12, "y3": 18, "y4": 24, "y5": 28},
-            "peakShare": 28,
-            "pricing": {"wac": 720, "asp": 648, "gtn": 42},
-            "access": {"tier1": 55, "tier2": 35, "tier3": 10},
-            "competition": "Medium (3-4 competitors)",
-            "jcode": "Pending - 24mo to launch",
-            "distribution": "Specialty"
-        },
-        "lastUpdated": "2026-01-25",
-        "updatedBy": "Michael Torres (Global BD)"
-    },
-    {
-        "id": "PRODUCT-003",
-        "name": "Generic Lyrica (Pregabalin)",
-        "archetype": "Rx Benefit High",
-        "phase": "Pre-Launch",
-        "launchDate": "2026-Q3",
-        "territory": "US",
-        "priority": "High",
-        "npv": 189.4,
-        "assumptions": {
-            "uptake": {"y1": 25, "y2": 38, "y3": 45, "y4": 48, "y5": 50},
-            "peakShare": 50,
-            "pricing": {"wac": 45, "asp": 38, "gtn": 65},
-            "access": {"tier1": 85, "tier2": 12, "tier3": 3},
-            "competition": "High (10+ competitors)",
-            "jcode": "N/A - Retail",
-            "distribution": "Retail + Specialty"
-        },
-        "lastUpdated": "2026-01-27",
-        "updatedBy": "Jennifer Liu (US Market Access)"
-    },
-    {
-        "id": "PRODUCT-004",
-        "name": "Rare Disease Gene Therapy",
-        "archetype": "Rare Disease",
-        "phase": "Phase 3",
-        "launchDate": "2027-Q2",
-        "territory": "US",
-        "priority": "Strategic",
-        "npv": 312.8,
-        "assumptions": {
-            "uptake": {"y1": 3, "y2": 6, "y3": 9, "y4": 12, "y5": 15},
-            "peakShare": 15,
-            "pricing": {"wac": 125000, "asp": 115000, "gtn": 28},
-            "access": {"tier1": 40, "tier2": 35, "tier3": 25},
-            "competition": "Low (1-2 competitors)",
-            "jcode": "To be applied - 36mo to launch",
-            "distribution": "Ultra-Specialty + Hub"
-        },
-        "lastUpdated": "2026-01-20",
-        "updatedBy": "David Park (Global Rare Disease)"
-    }
-]
-
-# Archetype data
-ARCHETYPES = [
-    {"name": "Med Benefit High", "color": "#0066CC", "count": 8},
-    {"name": "Med Benefit Med", "color": "#4A90E2", "count": 6},
-    {"name": "Med Benefit Low", "color": "#7AB8FF", "count": 4},
-    {"name": "Rx Benefit High", "color": "#00A86B", "count": 7},
-    {"name": "Rx Benefit Med", "color": "#52C993", "count": 5},
-    {"name": "Rx Benefit Low", "color": "#8FE5B8", "count": 3},
-    {"name": "Rare Disease", "color": "#9B59B6", "count": 2}
-]
-
-# Version history data
-VERSION_HISTORY = [
-    {
-        "version": "v1.3",
-        "date": "2026-01-28",
-        "user": "Sarah Chen",
-        "changes": ["Updated GTN% from 42% to 45%", "Revised Tier 1 access from 55% to 60%"],
-        "npvImpact": 12.3,
-        "status": "Current"
-    },
-    {
-        "version": "v1.2",
-        "date": "2026-01-15",
-        "user": "Michael Torres",
-        "changes": ["Adjusted Y1 uptake from 6% to 8%", "Updated competition assessment"],
-        "npvImpact": 8.7,
-        "status": "Approved"
-    },
-    {
-        "version": "v1.1",
-        "date": "2025-12-20",
-        "user": "Jennifer Liu",
-        "changes": ["Initial US market assumptions", "Added J-code timeline"],
-        "npvImpact": 15.2,
-        "status": "Approved"
-    },
-    {
-        "version": "v1.0",
-        "date": "2025-12-01",
-        "user": "David Park",
-        "changes": ["Created baseline forecast from Global assumptions"],
-        "npvImpact": 0,
-        "status": "Baseline"
-    }
-]
-
-# Helper functions
-def get_priority_color(priority):
-    colors = {
-        "High": "#E74C3C",
-        "Strategic": "#9B59B6",
-        "Medium": "#F39C12",
-        "Low": "#95A5A6"
-    }
-    return colors.get(priority, "#95A5A6")
-
-def get_archetype_color(archetype):
-    for arch in ARCHETYPES:
-        if arch["name"] == archetype:
-            return arch["color"]
-    return "#95A5A6"
-
-def get_phase_color(phase):
-    colors = {
-        "Pre-Launch": "#3B82F6",
-        "Filed": "#F59E0B",
-        "Phase 3": "#8B5CF6"
-    }
-    return colors.get(phase, "#6B7280")
-
-# Initialize session state
-if "view_mode" not in st.session_state:
-    st.session_state.view_mode = "portfolio"
-if "selected_product" not in st.session_state:
-    st.session_state.selected_product = "PRODUCT-001"
-if "active_tab" not in st.session_state:
-    st.session_state.active_tab = "assumptions"
-
-# Beautiful Header Container with Logo and Title
-header_col1, header_col2, header_col3 = st.columns([0.2, 0.6, 0.2])
-
-with header_col1:
-    st.markdown("<br>", unsafe_allow_html=True)
-    # Handle logo with proper path for cloud deployment
-    logo_path = Path(__file__).parent / "Sandoz.png"
-    if logo_path.exists():
-        st.image(str(logo_path), use_container_width=True)
-    else:
-        st.write("📦")  # Fallback if logo not found
-
-with header_col2:
-    st.markdown("""
-    <div style="text-align: center; padding: 20px 0;">
-        <h1 style="margin: 0; font-size: 48px; font-weight: 900; color: #0055CC; letter-spacing: -1px; text-shadow: 0 1px 4px rgba(0,85,204,0.1);">
-            Pipeline Decision System
-        </h1>
-        <p style="margin: 12px 0 0 0; font-size: 16px; color: #004499; font-weight: 500; letter-spacing: 0.3px;">
-            Centralized Portfolio Management & NPV Tracking
-        </p>
-    </div>
     """, unsafe_allow_html=True)
 
-with header_col3:
-    st.markdown("")
+    # Formatting functions
+    def format_number(num, decimals=1):
+        """Format number with commas (international system)"""
+        if isinstance(num, (int, float)):
+            return f"{num:,.{decimals}f}"
+        return str(num)
 
-# st.markdown("")
+    def format_currency(num, symbol=None):
+        """Format millions as currency with commas, in the reporting currency unless a symbol is given"""
+        symbol = currency_symbol(REPORTING_CURRENCY) if symbol is None else symbol
+        if isinstance(num, (int, float)):
+            return f"{symbol}{num:,.1f}M" if num >= 1 else f"{symbol}{num*1000:,.0f}K"
+        return str(num)
 
-# View mode toggle
+    def format_percent(num):
+        """Format as percentage"""
+        if isinstance(num, (int, float)):
+            return f"{num:.1f}%"
+        return str(num)
 
+    # Data structures
+    class Priority(Enum):
+        HIGH = "High"
+        STRATEGIC = "Strategic"
+        MEDIUM = "Medium"
+        LOW = "Low"
 
-col1, col2, col3 = st.columns([0.3, 0.01, 0.3])
-with col1:
-    if st.button("📦 Single Product View", use_container_width=True, 
-                 key="btn_single",
-                 help="View detailed information for a single product"):
-        st.session_state.view_mode = "single"
-with col3:
-    if st.button("📊 Portfolio View", use_container_width=True,
-                 key="btn_portfolio",
-                 help="View all products in the portfolio"):
-        st.session_state.view_mode = "portfolio"
+    # Portfolio data, parsed from the configured sources once per source version
+    @st.cache_resource(show_spinner=False)
+    def load_portfolio(fingerprint):
+        """Load portfolio datasets and build the product store, shared across sessions"""
+        record_cache("portfolio", hit=False)
+        data = load_portfolio_data()
+        store = ProductStore(data["products"], data["archetypes"])
+        return {
+            "store": store,
+            "archetypes": data["archetypes"],
+            "versions": VersionLog.from_history(store.snapshot(), data["version_history"])
+        }
 
+    def merge_upload(uploaded, data):
+        """Ingest an uploaded file chunk by chunk and merge its valid rows into a copy of the portfolio"""
+        bar = st.progress(0.0, text=f"Reading {uploaded.name}…")
+        result = ingest_products(
+            uploaded, progress=lambda fraction, rows, kept: bar.progress(
+                fraction, text=f"Read {rows:,} rows: {kept:,} kept, {rows - kept:,} rejected"
+            )
+        )
+        bar.empty()
+        base = data["store"]
+        store = ProductStore(base.table.upsert(result["table"]), data["archetypes"])
+        added = len(store) - len(base)
+        note = {
+            "version": "Upload",
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            "user": "Sidebar upload",
+            "changes": [f"Merged {added:,} new and {len(result['table']) - added:,} updated products from {uploaded.name}"],
+            "npvImpact": store.portfolio_totals()["total_npv"] - base.portfolio_totals()["total_npv"],
+            "status": "Uploaded"
+        }
+        merged = {
+            "store": store,
+            "archetypes": data["archetypes"],
+            "versions": VersionLog.from_history(store.snapshot(), [note] + data["versions"].to_records())
+        }
+        return merged, result
 
-# st.markdown("---")
+    def render_upload_panel(data):
+        """Sidebar upload of assumption files, merged into this session's portfolio only"""
+        with st.sidebar.expander("📥 Upload assumptions"):
+            uploaded = st.file_uploader(
+                "CSV, Excel or Parquet",
+                type=[suffix.lstrip(".") for suffix in INGEST_FORMATS],
+                key="assumption_upload",
+                help="One row per product with the same dotted columns as an export; rows are validated before merging"
+            )
+            if uploaded is not None and st.button("Merge into portfolio", key="merge_upload", use_container_width=True):
+                try:
+                    merged, result = merge_upload(uploaded, data)
+                except (ValueError, KeyError, OSError) as exc:
+                    st.error(f"Could not read {uploaded.name}: {exc}")
+                else:
+                    upload = st.session_state.get("portfolio_upload") or {"base": PORTFOLIO_FINGERPRINT, "files": ()}
+                    st.session_state.portfolio_upload = {**upload, "data": merged, "files": upload["files"] + (uploaded.file_id,)}
+                    st.session_state.upload_result = {"name": uploaded.name, **result}
+                    st.rerun()
 
-# PORTFOLIO VIEW
-if st.session_state.view_mode == "portfolio":
-    # Enhanced Portfolio Overview Header
-    st.markdown("""
-    <div style="text-align: center; padding: 12px 0; margin-bottom: 14px;">
-        <h2 style="margin: 0; font-size: 28px; font-weight: 900; color: #0055CC; letter-spacing: -1px;">📈 Portfolio Overview</h2>
-        <p style="margin: 4px 0 0 0; color: #6b7280; font-size: 13px;">Real-time insights across 4 pipeline products</p>
+            result = st.session_state.get("upload_result")
+            if result:
+                report = result["report"]
+                st.caption(f"{result['name']}: {len(result['table']):,} of {result['rows']:,} rows merged "
+                           f"in {result['elapsed']:.1f}s")
+                if len(result["chunks"]) > 1 or not report.ok:
+                    st.dataframe(result["chunks"], hide_index=True, use_container_width=True)
+                if not report.ok:
+                    st.warning(f"{len(report.invalid_rows):,} rows skipped ({len(report):,} violations)")
+                    st.dataframe(report.summary(), hide_index=True, use_container_width=True)
+                    st.download_button(
+                        "⬇️ Violations (CSV)",
+                        data=report.violations.to_csv(index=False),
+                        file_name="upload_violations.csv",
+                        mime="text/csv",
+                        use_container_width=True
+                    )
+            if "portfolio_upload" in st.session_state and st.button("Discard uploads", key="discard_upload", use_container_width=True):
+                for key in ("portfolio_upload", "upload_result", "selected_product"):
+                    st.session_state.pop(key, None)
+                st.rerun()
+
+    PORTFOLIO_FINGERPRINT = portfolio_fingerprint()
+    PORTFOLIO_DATA = tracked_call("portfolio", load_portfolio, PORTFOLIO_FINGERPRINT)
+
+    # The shared portfolio is cached across sessions, so uploads live in a session copy; they are
+    # dropped when a configured source changes, and cached views key on the uploaded files too
+    upload = st.session_state.get("portfolio_upload")
+    if upload is not None and upload["base"] != PORTFOLIO_FINGERPRINT:
+        del st.session_state["portfolio_upload"]
+    elif upload is not None:
+        PORTFOLIO_DATA = upload["data"]
+        PORTFOLIO_FINGERPRINT = PORTFOLIO_FINGERPRINT + (("uploads", upload["files"]),)
+    render_upload_panel(PORTFOLIO_DATA)
+    PRODUCT_STORE = PORTFOLIO_DATA["store"]
+    PIPELINE_PRODUCTS = PRODUCT_STORE.products
+    ARCHETYPES = PORTFOLIO_DATA["archetypes"]
+    VERSION_LOG = PORTFOLIO_DATA["versions"]
+
+    # Portfolio-level figures are shown in a reporting currency; product pages stay in local currency
+    RATE_TABLE = load_rate_table()
+    DISPLAY_CURRENCY = st.sidebar.selectbox(
+        "💱 Reporting currency",
+        RATE_TABLE.currencies,
+        index=RATE_TABLE.currencies.index(REPORTING_CURRENCY),
+        key="reporting_currency"
+    )
+    DISPLAY_RATE = RATE_TABLE.rate(REPORTING_CURRENCY, DISPLAY_CURRENCY)
+    DISPLAY_SYMBOL = currency_symbol(DISPLAY_CURRENCY)
+
+    def product_symbol(product):
+        """Currency symbol of a product's territory"""
+        pos = PRODUCT_STORE.position(product["id"])
+        return currency_symbol(REPORTING_CURRENCY if pos is None else PRODUCT_STORE.arrays["currency"][pos])
+
+    def product_currency(product):
+        """Local currency of a product's territory"""
+        pos = PRODUCT_STORE.position(product["id"])
+        return REPORTING_CURRENCY if pos is None else PRODUCT_STORE.arrays["currency"][pos]
+
+    def product_display_rate(product):
+        """Factor converting a product's local-currency figures into the display currency"""
+        pos = PRODUCT_STORE.position(product["id"])
+        return DISPLAY_RATE * (1.0 if pos is None else float(PRODUCT_STORE.arrays["fx_rate"][pos]))
+
+    # Helper functions
+    def get_priority_color(priority):
+        return PRIORITY_COLORS.get(priority, "#95A5A6")
+
+    def get_archetype_color(archetype):
+        return PRODUCT_STORE.archetype_color(archetype)
+
+    def get_phase_color(phase):
+        return PHASE_COLORS.get(phase, "#6B7280")
+
+    # Portfolio valuation, computed in a single array pass and cached on the store
+    PORTFOLIO_VALUATION = PRODUCT_STORE.valuation()
+
+    # Grouped KPIs (archetype, phase, priority, territory) from one aggregation pass
+    PORTFOLIO_AGGREGATES = PRODUCT_STORE.aggregates()
+
+    # Portfolio table rendering
+    TABLE_SORT_COLUMNS = {
+        "NPV": "npv",
+        "rNPV": "rnpv",
+        "5-Yr Rev": "five_year_revenue",
+        "Peak Rev": "peak_revenue",
+        "Launch": "launchDate",
+        "Priority": "priority",
+        "Product": "name",
+        "Archetype": "archetype"
+    }
+
+    PORTFOLIO_TABLE_HEADER = """
+<div style="display: grid; grid-template-columns: 2fr 1.2fr 1.2fr 1.2fr 1.2fr 1.2fr 1.2fr 1fr; gap: 12px; padding: 16px 12px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px 10px 0 0; margin-bottom: 0;">
+    <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">Product</div>
+    <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">Archetype</div>
+    <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">Launch</div>
+    <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">NPV</div>
+    <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">rNPV</div>
+    <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">5-Yr Rev</div>
+    <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">Peak Rev</div>
+    <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">Priority</div>
+</div>
+"""
+
+    def portfolio_table_html(rows, total, symbol="$"):
+        """Build one HTML document for a page of table rows"""
+        html = [PORTFOLIO_TABLE_HEADER]
+        last = len(rows) - 1
+        for idx, (name, pid, archetype, archetype_color, launch, npv, rnpv, pos, five_year_rev, peak_rev, priority, priority_color) in enumerate(zip(
+            rows["name"], rows["id"], rows["archetype"], rows["archetype_color"], rows["launchDate"],
+            rows["npv"], rows["rnpv"], rows["probability_of_success"], rows["five_year_revenue"], rows["peak_revenue"],
+            rows["priority"], rows["priority_color"]
+        )):
+            # Alternating row colors
+            bg_color = "#ffffff" if idx % 2 == 0 else "#f9fafb"
+            border_bottom = "border-bottom: 1px solid #e5e7eb;" if idx < last else ""
+            html.append(f"""
+<div style="display: grid; grid-template-columns: 2fr 1.2fr 1.2fr 1.2fr 1.2fr 1.2fr 1.2fr 1fr; gap: 12px; padding: 16px 12px; background-color: {bg_color}; {border_bottom}">
+    <div>
+        <div style="font-weight: 700; color: #1f2937; font-size: 14px;">{name}</div>
+        <div style="font-size: 11px; color: #6b7280; margin-top: 4px;">ID: {pid}</div>
     </div>
-    """, unsafe_allow_html=True)
-    
-    # Calculate metrics
-    portfolio_npv = sum(p["npv"] for p in PIPELINE_PRODUCTS)
-    high_priority_count = len([p for p in PIPELINE_PRODUCTS if p["priority"] in ["High", "Strategic"]])
-    products_count = len(PIPELINE_PRODUCTS)
-    launches_this_year = 3
-    
-    # Wrap metrics in enhanced card container with gradient
-    # st.markdown("""
-    # <div class="metrics-overview-card" style="background: linear-gradient(135deg, #f0f9ff 0%, #fafbfc 100%); border: 2px solid #0055CC33; padding: 18px 16px;">
-    # """, unsafe_allow_html=True)
-    
-    # Summary metrics with custom styling
-    metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4, gap="small")
-    
-    with metric_col1:
-        st.markdown(f"""
-        <div style="text-align: center; padding: 16px 12px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px; box-shadow: 0 4px 12px rgba(102, 126, 234, 0.25), 0 2px 6px rgba(0,0,0,0.08); transition: all 0.3s ease;">
-            <div style="font-size: 11px; color: rgba(255,255,255,0.9); font-weight: 600; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">Total Pipeline NPV</div>
-            <div style="font-size: 32px; font-weight: 900; color: white; text-shadow: 0 2px 8px rgba(0,0,0,0.2); letter-spacing: -1px;">${portfolio_npv:.1f}M</div>
-            <div style="font-size: 10px; color: rgba(255,255,255,0.75); margin-top: 4px; font-weight: 500;">Across all products</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with metric_col2:
-        st.markdown(f"""
-        <div style="text-align: center; padding: 16px 12px; background: linear-gradient(135deg, #0ea5e9 0%, #0284c7 100%); border-radius: 10px; box-shadow: 0 4px 12px rgba(14, 165, 233, 0.25), 0 2px 6px rgba(0,0,0,0.08); transition: all 0.3s ease;">
-            <div style="font-size: 11px; color: rgba(255,255,255,0.9); font-weight: 600; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">Products in Pipeline</div>
-            <div style="font-size: 32px; font-weight: 900; color: white; text-shadow: 0 2px 8px rgba(0,0,0,0.2); letter-spacing: -1px;">{products_count}</div>
-            <div style="font-size: 10px; color: rgba(255,255,255,0.75); margin-top: 4px; font-weight: 500;">Active programs</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with metric_col3:
-        st.markdown(f"""
-        <div style="text-align: center; padding: 16px 12px; background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%); border-radius: 10px; box-shadow: 0 4px 12px rgba(245, 158, 11, 0.25), 0 2px 6px rgba(0,0,0,0.08); transition: all 0.3s ease;">
-            <div style="font-size: 11px; color: rgba(255,255,255,0.9); font-weight: 600; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">High Priority Assets</div>
-            <div style="font-size: 32px; font-weight: 900; color: white; text-shadow: 0 2px 8px rgba(0,0,0,0.2); letter-spacing: -1px;">{high_priority_count}</div>
-            <div style="font-size: 10px; color: rgba(255,255,255,0.75); margin-top: 4px; font-weight: 500;">Strategic focus</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with metric_col4:
-        st.markdown(f"""
-        <div style="text-align: center; padding: 16px 12px; background: linear-gradient(135deg, #10b981 0%, #059669 100%); border-radius: 10px; box-shadow: 0 4px 12px rgba(16, 185, 129, 0.25), 0 2px 6px rgba(0,0,0,0.08); transition: all 0.3s ease;">
-            <div style="font-size: 11px; color: rgba(255,255,255,0.9); font-weight: 600; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">Launches This Year</div>
-            <div style="font-size: 32px; font-weight: 900; color: white; text-shadow: 0 2px 8px rgba(0,0,0,0.2); letter-spacing: -1px;">{launches_this_year}</div>
-            <div style="font-size: 10px; color: rgba(255,255,255,0.75); margin-top: 4px; font-weight: 500;">Upcoming events</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    st.markdown("---")
-    
-    # Archetype Distribution with enhanced styling
-    st.markdown("""
-    <div style="text-align: center; padding: 20px 0;">
-        <h3 style="margin: 0; font-size: 28px; font-weight: 800; color: #1f2937; letter-spacing: -0.5px;">🎯 Portfolio by Archetype</h3>
-        <p style="margin: 8px 0 0 0; color: #6b7280; font-size: 14px;">Distribution across 7 product archetypes</p>
+    <div style="display: flex; align-items: center;">
+        <span style="background: {archetype_color}20; color: {archetype_color}; padding: 8px 12px; border-radius: 6px; font-size: 12px; font-weight: 700; border-left: 3px solid {archetype_color};">{archetype}</span>
     </div>
-    """, unsafe_allow_html=True)
-    
-    # st.markdown('<div class="portfolio-card-wrapper" style="padding: 28px; background: linear-gradient(135deg, #fafbfc 0%, #f8f9fa 100%);">', unsafe_allow_html=True)
-    
-    arch_cols = st.columns(7, gap="medium")
-    for idx, archetype in enumerate(ARCHETYPES):
-        with arch_cols[idx]:
-            st.markdown(f"""
-            <div class="archetype-card" style='border-color: {archetype['color']}; background: white; padding: 20px; box-shadow: 0 4px 16px rgba(0,0,0,0.08);'>
-                <div style='width: 70px; height: 70px; border-radius: 50%; background: linear-gradient(135deg, {archetype['color']} 0%, {archetype['color']}dd 100%); 
-                            margin: 0 auto 14px; display: flex; align-items: center; justify-content: center; color: white; font-weight: 900; font-size: 24px; box-shadow: 0 6px 20px {archetype['color']}50; transition: all 0.3s ease;'>
-                    {archetype['count']}
-                </div>
-                <p style='font-size: 13px; margin: 0; font-weight: 700; color: #1f2937; text-align: center; line-height: 1.4;'>{archetype['name']}</p>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    st.markdown("---")
-    
-    # Portfolio Table with enhanced header
-    st.markdown("""
-    <div style="text-align: center; padding: 20px 0;">
-        <h3 style="margin: 0; font-size: 28px; font-weight: 800; color: #1f2937; letter-spacing: -0.5px;">📋 Pipeline Portfolio Overview</h3>
-        <p style="margin: 8px 0 0 0; color: #6b7280; font-size: 14px;">Complete financial and strategic view of all products</p>
+    <div style="display: flex; align-items: center;">
+        <span style="background: #f3f4f6; padding: 6px 10px; border-radius: 6px; font-size: 12px; font-weight: 600; color: #1f2937;">{launch}</span>
     </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown('<div class="portfolio-table-card">', unsafe_allow_html=True)
-    
-    # Table header
-    st.markdown("""
-    <div style="display: grid; grid-template-columns: 2fr 1.2fr 1.2fr 1.2fr 1.2fr 1.2fr 1fr; gap: 12px; padding: 16px 12px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px 10px 0 0; margin-bottom: 0;">
-        <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">Product</div>
-        <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">Archetype</div>
-        <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">Launch</div>
-        <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">NPV</div>
-        <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">5-Yr Rev</div>
-        <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">Peak Rev</div>
-        <div style="color: white; font-weight: 800; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">Priority</div>
+    <div style="display: flex; align-items: center;">
+        <span style="background: linear-gradient(135deg, #ede9fe, #f5f3ff); padding: 8px 12px; border-radius: 6px; font-size: 13px; font-weight: 800; color: #7c3aed; border-left: 3px solid #a78bfa;">{symbol}{format_number(npv, 1)}M</span>
     </div>
-    """, unsafe_allow_html=True)
-    
-    # Table rows
-    for idx, product in enumerate(PIPELINE_PRODUCTS):
-        priority_color = get_priority_color(product['priority'])
-        phase_color = get_phase_color(product['phase'])
-        archetype_color = get_archetype_color(product['archetype'])
-        
-        # Calculate metrics
-        five_year_rev = product['npv'] * 1.8
-        peak_rev = product['npv'] * 0.45
-        
-        # Alternating row colors
-        bg_color = "#ffffff" if idx % 2 == 0 else "#f9fafb"
-        border_bottom = "border-bottom: 1px solid #e5e7eb;" if idx < len(PIPELINE_PRODUCTS) - 1 else ""
-        
-        st.markdown(f"""
-        <div style="display: grid; grid-template-columns: 2fr 1.2fr 1.2fr 1.2fr 1.2fr 1.2fr 1fr; gap: 12px; padding: 16px 12px; background-color: {bg_color}; {border_bottom}">
-            <div>
-                <div style="font-weight: 700; color: #1f2937; font-size: 14px;">{product['name']}</div>
-                <div style="font-size: 11px; color: #6b7280; margin-top: 4px;">ID: {product['id']}</div>
-            </div>
-            <div style="display: flex; align-items: center;">
-                <span style="background: {archetype_color}20; color: {archetype_color}; padding: 8px 12px; border-radius: 6px; font-size: 12px; font-weight: 700; border-left: 3px solid {archetype_color};">{product['archetype']}</span>
-            </div>
-            <div style="display: flex; align-items: center;">
-                <span style="background: #f3f4f6; padding: 6px 10px; border-radius: 6px; font-size: 12px; font-weight: 600; color: #1f2937;">{product['launchDate']}</span>
-            </div>
-            <div style="display: flex; align-items: center;">
-                <span style="background: linear-gradient(135deg, #ede9fe, #f5f3ff); padding: 8px 12px; border-radius: 6px; font-size: 13px; font-weight: 800; color: #7c3aed; border-left: 3px solid #a78bfa;">${format_number(product['npv'], 1)}M</span>
-            </div>
-            <div style="display: flex; align-items: center;">
-                <span style="background: linear-gradient(135deg, #dbeafe, #eff6ff); padding: 8px 12px; border-radius: 6px; font-size: 13px; font-weight: 800; color: #1d4ed8; border-left: 3px solid #3b82f6;">${format_number(five_year_rev, 1)}M</span>
-            </div>
-            <div style="display: flex; align-items: center;">
-                <span style="background: linear-gradient(135deg, #dcfce7, #f0fdf4); padding: 8px 12px; border-radius: 6px; font-size: 13px; font-weight: 800; color: #15803d; border-left: 3px solid #16a34a;">${format_number(peak_rev, 1)}M</span>
-            </div>
-            <div style="display: flex; align-items: center; gap: 6px; flex-wrap: wrap;">
-                <span style="background: {priority_color}30; color: {priority_color}; padding: 4px 8px; border-radius: 4px; font-size: 11px; font-weight: 700; text-transform: uppercase; letter-spacing: 0.3px;">{product['priority']}</span>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Table footer
-    st.markdown("""
-    <div style="background: #f9fafb; padding: 12px; border-radius: 0 0 10px 10px; border-top: 2px solid #e5e7eb; margin-top: 0; font-size: 11px; color: #6b7280;">
-        Last updated: Portfolio data refreshed daily | Total Assets: 4 Products
+    <div>
+        <span style="background: linear-gradient(135deg, #fef3c7, #fffbeb); padding: 8px 12px; border-radius: 6px; font-size: 13px; font-weight: 800; color: #b45309; border-left: 3px solid #f59e0b; display: inline-block;">{symbol}{format_number(rnpv, 1)}M</span>
+        <div style="font-size: 11px; color: #6b7280; margin-top: 4px;">PoS {pos:.0f}%</div>
     </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("---")
-    
-    # Action buttons
-    col1, col2 = st.columns(2)
-    with col1:
-        if st.button("View Single Product Details", use_container_width=True):
-            st.session_state.view_mode = "single"
-            st.rerun()
-    
-    with col2:
-        # Create CSV data
-        df_export = pd.DataFrame([{
-            "Product": p["name"],
-            "ID": p["id"],
-            "Archetype": p["archetype"],
-            "Phase": p["phase"],
-            "Launch Date": p["launchDate"],
-            "Priority": p["priority"],
-            "NPV ($M)": f"{p['npv']:.1f}",
-            "Last Updated": p["lastUpdated"]
-        } for p in PIPELINE_PRODUCTS])
-        
-        st.download_button(
-            label="📥 Export to CSV",
-            data=df_export.to_csv(index=False),
-            file_name="portfolio.csv",
-            mime="text/csv",
-            use_container_width=True
-        )
+    <div style="display: flex; align-items: center;">
+        <span style="background: linear-gradient(135deg, #dbeafe, #eff6ff); padding: 8px 12px; border-radius: 6px; font-size: 13px; font-weight: 800; color: #1d4ed8; border-left: 3px solid #3b82f6;">{symbol}{format_number(five_year_rev, 1)}M</span>
+    </div>
+    <div style="display: flex; align-items: center;">
+        <span style="background: linear-gradient(135deg, #dcfce7, #f0fdf4); padding: 8px 12px; border-radius: 6px; font-size: 13px; font-weight: 800; color: #15803d; border-left: 3px solid #16a34a;">{symbol}{format_number(peak_rev, 1)}M</span>
+    </div>
+    <div style="display: flex; align-items: center; gap: 6px; flex-wrap: wrap;">
+        <span style="background: {priority_color}30; color: {priority_color}; padding: 4px 8px; border-radius: 4px; font-size: 11px; font-weight: 700; text-transform: uppercase; letter-spacing: 0.3px;">{priority}</span>
+    </div>
+</div>""")
+        # Table footer
+        html.append(f"""
+<div style="background: #f9fafb; padding: 12px; border-radius: 0 0 10px 10px; border-top: 2px solid #e5e7eb; margin-top: 0; font-size: 11px; color: #6b7280;">
+    Last updated: Portfolio data refreshed daily | Total Assets: {total} Products
+</div>""")
+        return "".join(html)
 
-# SINGLE PRODUCT VIEW
-else:
-    # Product selector as top bar
-    st.markdown("---")
-    
-    # Product selection dropdown in main area (not sidebar)
-    col_select, col_space = st.columns([0.4, 0.6])
-    
-    with col_select:
-        selected = st.selectbox(
-            "🔍 Select Product",
-            options=[p["id"] for p in PIPELINE_PRODUCTS],
-            format_func=lambda x: next((p["name"] for p in PIPELINE_PRODUCTS if p["id"] == x), x),
-            index=[p["id"] for p in PIPELINE_PRODUCTS].index(st.session_state.selected_product),
-            key="product_selector",
-            on_change=lambda: setattr(st.session_state, 'selected_product', st.session_state.product_selector)
-        )
-    
-    current_product = next((p for p in PIPELINE_PRODUCTS if p["id"] == st.session_state.selected_product), None)
-    
-    if current_product:
-        # Quick actions and summary in top banner
-        col1, col2, col3, col4 = st.columns([0.25, 0.25, 0.25, 0.25])
+    @st.cache_resource(show_spinner=False, max_entries=4)
+    def portfolio_sensitivity(fingerprint):
+        """Driver sensitivity for the whole portfolio, one batched valuation per data version"""
+        record_cache("sensitivity", hit=False)
+        return run_sensitivity(PRODUCT_STORE.arrays)
 
-        with col1:
-            show_version_history = st.checkbox("📜 History", False, key="version_history")
-            show_scenario = st.checkbox("🔀 Scenarios", False, key="scenario_comp")
-        
-        with col2:
-            st.metric("NPV", f"${format_number(current_product['npv'], 1)}M")
-        
-        with col3:
-            st.metric("Phase", current_product['phase'])
-        
-        with col4:
-            st.metric("Launch", current_product['launchDate'])
+    def remove_file(path):
+        if os.path.exists(path):
+            os.remove(path)
 
+    class ExportFile:
+        """A prepared export on disk, deleted once downloaded, when replaced or when its session is dropped"""
 
+        def __init__(self, fmt, path, fingerprint):
+            self.format = fmt
+            self.path = path
+            self.fingerprint = fingerprint
+            self.remove = weakref.finalize(self, remove_file, path)
 
-        st.markdown("---")
-        
+    def discard_export():
+        """Delete the export file once its download has been served"""
+        export_file = st.session_state.pop("export_file", None)
+        if export_file:
+            export_file.remove()
+
+    def prepare_export(fmt):
+        """Stream the portfolio export to a temp file, replacing the previous one"""
+        previous = st.session_state.get("export_file")
+        if previous:
+            previous.remove()
+        handle, path = tempfile.mkstemp(suffix=f".{EXPORT_FORMATS[fmt]['extension']}")
+        os.close(handle)
+        export_to_file(PRODUCT_STORE, fmt, path)
+        return ExportFile(fmt, path, PORTFOLIO_FINGERPRINT)
+
+    @st.cache_data(show_spinner=False, max_entries=256)
+    def build_waterfall_figure(product_id, year, fingerprint, store_version):
+        """Revenue waterfall figure for a product and launch year, cached per data version"""
+        record_cache("waterfall", hit=False)
+        components = PRODUCT_STORE.gross_to_net()
+        pos = PRODUCT_STORE.position(product_id)
+        symbol = currency_symbol(PRODUCT_STORE.arrays["currency"][pos])
+        waterfall_df = pd.DataFrame({
+            "Category": [step["Category"] for step in REVENUE_WATERFALL],
+            "Amount": [components[step["Component"]][pos, year - 1] for step in REVENUE_WATERFALL],
+            "Type": [step["Type"] for step in REVENUE_WATERFALL]
+        })
+
+        fig = go.Figure(go.Waterfall(
+            x=waterfall_df["Category"],
+            y=waterfall_df["Amount"],
+            totals={"marker": {"color": "green"}},
+            measure=waterfall_df["Type"],
+            text=[f"-{symbol}{-amount:.1f}M" if amount < 0 else f"{symbol}{amount:.1f}M" for amount in waterfall_df["Amount"]],
+            textposition="outside"
+        ))
+        fig.update_layout(height=400, showlegend=False)
+        return fig
+
+    @st.cache_data(show_spinner=False, max_entries=256)
+    def build_uptake_figure(product_id, model, fingerprint, store_version):
+        """Fitted monthly uptake curve against the Y1-Y5 assumptions, cached per model and data version"""
+        record_cache("uptake_curve", hit=False)
+        pos = PRODUCT_STORE.position(product_id)
+        times, shares = monthly_uptake(PRODUCT_STORE.uptake_fit(model), pos)
+        fig = go.Figure([
+            go.Scatter(x=times, y=shares[0], mode="lines", name=f"Fitted {model.title()} curve",
+                       line={"color": "#7c3aed", "width": 3}),
+            go.Scatter(x=UPTAKE_TIMES, y=PRODUCT_STORE.arrays["uptake"][pos], mode="markers", name="Uptake Y1-Y5",
+                       marker={"color": "#f59e0b", "size": 11, "line": {"color": "white", "width": 2}}),
+        ])
+        fig.add_hline(y=PRODUCT_STORE.arrays["peak_share"][pos], line_dash="dash", line_color="#6b7280",
+                      annotation_text="Peak share", annotation_position="bottom right")
+        fig.update_layout(height=380, xaxis_title="Years since launch", yaxis_title="Market share (%)",
+                          legend={"orientation": "h", "y": 1.12}, margin={"t": 40})
+        return fig
+
+    @st.cache_data(show_spinner=False, max_entries=256)
+    def build_timeline_html(product_id, fingerprint, store_version):
+        """Timeline HTML document for a product, cached per product and data version"""
+        record_cache("timeline", hit=False)
+        timeline_data = PRODUCT_STORE.calendar.milestones(PRODUCT_STORE.position(product_id))
+
+        status_colors = {
+            "Completed": "#10b981",      # Green
+            "In Progress": "#3b82f6",    # Blue
+            "Upcoming": "#f59e0b"        # Amber
+        }
+
+        status_bg_colors = {
+            "Completed": "#d1fae5",      # Light green
+            "In Progress": "#dbeafe",    # Light blue
+            "Upcoming": "#fef3c7"        # Light amber
+        }
+
+        # Vertical timeline
+        html = ["""
+    <style>
+    .timeline-container {
+        position: relative;
+        padding: 20px 0;
+    }
+    .timeline-item {
+        display: flex;
+        margin-bottom: 30px;
+        position: relative;
+    }
+    .timeline-marker {
+        width: 60px;
+        height: 60px;
+        border-radius: 50%;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        font-size: 28px;
+        font-weight: bold;
+        color: white;
+        border: 3px solid white;
+        box-shadow: 0 0 0 3px;
+        flex-shrink: 0;
+        margin-right: 30px;
+    }
+    .timeline-content {
+        flex: 1;
+        padding: 20px;
+        border-radius: 12px;
+        background-color: white;
+        border: 2px solid #e5e7eb;
+        box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+        transition: transform 0.2s, box-shadow 0.2s;
+    }
+    .timeline-content:hover {
+        transform: translateX(5px);
+        box-shadow: 0 4px 16px rgba(0,0,0,0.12);
+    }
+    .timeline-date {
+        font-size: 18px;
+        font-weight: 700;
+        color: #1f2937;
+        margin-bottom: 8px;
+    }
+    .timeline-stage {
+        font-size: 16px;
+        font-weight: 600;
+        color: #374151;
+        margin-bottom: 4px;
+    }
+    .timeline-status {
+        font-size: 13px;
+        font-weight: 600;
+        padding: 4px 12px;
+        border-radius: 20px;
+        display: inline-block;
+        margin-top: 8px;
+    }
+    .timeline-duration {
+        font-size: 12px;
+        color: #6b7280;
+        margin-top: 6px;
+        font-style: italic;
+    }
+    .timeline-vertical-line {
+        position: absolute;
+        left: 29px;
+        top: 60px;
+        width: 2px;
+        height: calc(100% + 30px);
+        background: #e5e7eb;
+    }
+    .timeline-item:last-child .timeline-vertical-line {
+        display: none;
+    }
+    </style>
+    <div class="timeline-container">
+    """]
+
+        for idx, task in enumerate(timeline_data):
+            status = task["Status"]
+            color = status_colors.get(status, "#9ca3af")
+            bg_color = status_bg_colors.get(status, "#f3f4f6")
+            status_icon = "✅" if status == "Completed" else "🔵" if status == "In Progress" else "⭕"
+
+            timeline_html = f"""
+        <div class="timeline-item">
+            <div class="timeline-vertical-line"></div>
+            <div class="timeline-marker" style="background-color: {color}; box-shadow: 0 0 0 3px {color}, 0 0 0 6px white;">
+                {status_icon}
+            </div>
+            <div class="timeline-content">
+                <div class="timeline-date">{task['Date']}</div>
+                <div class="timeline-stage">{task['Stage']}</div>
+                <div class="timeline-duration">Duration: {task['Duration']}</div>
+                <span class="timeline-status" style="background-color: {bg_color}; color: {color};">
+                    {status}
+                </span>
+            </div>
+        </div>
+        """
+            html.append(timeline_html)
+
+        html.append('</div>')
+        # Dedent each piece so indented HTML is not read as a markdown code block
+        return "\n".join(textwrap.dedent(piece).strip() for piece in html)
+
+    # Single product view sections, each a fragment so an interaction only reruns its own section
+    def render_product_header(product):
+        """Product banner and archetype, priority and phase badges"""
         # Product header - centered and prominent with enhanced styling
         st.markdown(f"""
-        <div style="text-align: center; padding: 28px 24px; background: linear-gradient(135deg, #0055CC 0%, #003d99 100%); border-radius: 16px; margin: 20px 0; box-shadow: 0 8px 32px rgba(0,85,204,0.3), 0 4px 16px rgba(0,0,0,0.1); border: 2px solid rgba(255,255,255,0.2);">
-            <h2 style="margin: 0; color: white; font-size: 36px; font-weight: 900; letter-spacing: -1px; text-shadow: 0 2px 8px rgba(0,0,0,0.2);">{current_product['name']}</h2>
-            <p style="margin: 10px 0 0 0; color: rgba(255,255,255,0.9); font-size: 14px; font-weight: 600; letter-spacing: 0.5px;">ID: {current_product['id']}</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
+    <div style="text-align: center; padding: 28px 24px; background: linear-gradient(135deg, #0055CC 0%, #003d99 100%); border-radius: 16px; margin: 20px 0; box-shadow: 0 8px 32px rgba(0,85,204,0.3), 0 4px 16px rgba(0,0,0,0.1); border: 2px solid rgba(255,255,255,0.2);">
+        <h2 style="margin: 0; color: white; font-size: 36px; font-weight: 900; letter-spacing: -1px; text-shadow: 0 2px 8px rgba(0,0,0,0.2);">{product['name']}</h2>
+        <p style="margin: 10px 0 0 0; color: rgba(255,255,255,0.9); font-size: 14px; font-weight: 600; letter-spacing: 0.5px;">ID: {product['id']}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
         # Product badges in a clean row with enhanced styling
         badge_col1, badge_col2, badge_col3, badge_col_space = st.columns([0.25, 0.25, 0.25, 0.25])
-        
+
         with badge_col1:
             st.markdown(f"""
-            <div style="background: linear-gradient(135deg, #ede9fe 0%, #f3e8ff 100%); padding: 16px 14px; border-radius: 12px; text-align: center; border: 2px solid #c4b5fd; box-shadow: 0 4px 16px rgba(124, 58, 237, 0.15);">
-                <div style="font-size: 11px; color: #6b7280; font-weight: 700; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">Archetype</div>
-                <div style="font-size: 16px; color: #7c3aed; font-weight: 900; letter-spacing: -0.5px;">{current_product['archetype']}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
+        <div style="background: linear-gradient(135deg, #ede9fe 0%, #f3e8ff 100%); padding: 16px 14px; border-radius: 12px; text-align: center; border: 2px solid #c4b5fd; box-shadow: 0 4px 16px rgba(124, 58, 237, 0.15);">
+            <div style="font-size: 11px; color: #6b7280; font-weight: 700; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">Archetype</div>
+            <div style="font-size: 16px; color: #7c3aed; font-weight: 900; letter-spacing: -0.5px;">{product['archetype']}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
         with badge_col2:
-            priority_color = "#10b981" if current_product['priority'] == "High" else "#3b82f6" if current_product['priority'] == "Medium" else "#f59e0b"
-            priority_bg_start = "#d1fae5" if current_product['priority'] == "High" else "#dbeafe" if current_product['priority'] == "Medium" else "#fef3c7"
-            priority_bg_end = "#a7f3d0" if current_product['priority'] == "High" else "#bfdbfe" if current_product['priority'] == "Medium" else "#fde68a"
-            priority_border = "#6ee7b7" if current_product['priority'] == "High" else "#93c5fd" if current_product['priority'] == "Medium" else "#fcd34d"
+            priority_color = "#10b981" if product['priority'] == "High" else "#3b82f6" if product['priority'] == "Medium" else "#f59e0b"
+            priority_bg_start = "#d1fae5" if product['priority'] == "High" else "#dbeafe" if product['priority'] == "Medium" else "#fef3c7"
+            priority_bg_end = "#a7f3d0" if product['priority'] == "High" else "#bfdbfe" if product['priority'] == "Medium" else "#fde68a"
+            priority_border = "#6ee7b7" if product['priority'] == "High" else "#93c5fd" if product['priority'] == "Medium" else "#fcd34d"
             st.markdown(f"""
-            <div style="background: linear-gradient(135deg, {priority_bg_start} 0%, {priority_bg_end} 100%); padding: 16px 14px; border-radius: 12px; text-align: center; border: 2px solid {priority_border}; box-shadow: 0 4px 16px rgba(0,0,0,0.08);">
-                <div style="font-size: 11px; color: #6b7280; font-weight: 700; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">Priority</div>
-                <div style="font-size: 16px; color: {priority_color}; font-weight: 900; letter-spacing: -0.5px;">{current_product['priority']}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
+        <div style="background: linear-gradient(135deg, {priority_bg_start} 0%, {priority_bg_end} 100%); padding: 16px 14px; border-radius: 12px; text-align: center; border: 2px solid {priority_border}; box-shadow: 0 4px 16px rgba(0,0,0,0.08);">
+            <div style="font-size: 11px; color: #6b7280; font-weight: 700; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">Priority</div>
+            <div style="font-size: 16px; color: {priority_color}; font-weight: 900; letter-spacing: -0.5px;">{product['priority']}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
         with badge_col3:
-            phase_color = get_phase_color(current_product['phase'])
+            phase_color = get_phase_color(product['phase'])
             phase_bg_map = {
                 "#3B82F6": "#dbeafe",  # Blue
                 "#F59E0B": "#fef3c7",  # Amber
@@ -803,406 +803,785 @@ else:
             phase_bg = phase_bg_map.get(phase_color, "#f3f4f6")
             phase_border = phase_border_map.get(phase_color, "#d1d5db")
             st.markdown(f"""
-            <div style="background: linear-gradient(135deg, {phase_bg} 0%, rgba(255,255,255,0.8) 100%); padding: 16px 14px; border-radius: 12px; text-align: center; border: 2px solid {phase_border}; box-shadow: 0 4px 16px rgba(0,0,0,0.08);">
-                <div style="font-size: 11px; color: #6b7280; font-weight: 700; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">Phase</div>
-                <div style="font-size: 16px; color: {phase_color}; font-weight: 900; letter-spacing: -0.5px;">{current_product['phase']}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # Enhanced Tabs with styling
-        st.markdown("""
-        <div style="margin-top: 20px; margin-bottom: 10px;">
-            <p style="font-size: 14px; font-weight: 700; color: #1f2937; text-transform: uppercase; letter-spacing: 0.8px; margin: 0 0 12px 0;">Product Details</p>
+        <div style="background: linear-gradient(135deg, {phase_bg} 0%, rgba(255,255,255,0.8) 100%); padding: 16px 14px; border-radius: 12px; text-align: center; border: 2px solid {phase_border}; box-shadow: 0 4px 16px rgba(0,0,0,0.08);">
+            <div style="font-size: 11px; color: #6b7280; font-weight: 700; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">Phase</div>
+            <div style="font-size: 16px; color: {phase_color}; font-weight: 900; letter-spacing: -0.5px;">{product['phase']}</div>
         </div>
         """, unsafe_allow_html=True)
+
+    @st.fragment
+    @PROFILER.wrap("tab:assumptions")
+    def render_assumptions_tab(product):
+        """Assumptions tab: uptake, pricing and access inputs"""
+        symbol = product_symbol(product)
+        # Market Uptake Assumptions Container
+        st.markdown('<div class="uptake-container"><div class="section-title">📈 Market Uptake Assumptions</div></div>', unsafe_allow_html=True)
+
+        uptake_data = product["assumptions"]["uptake"]
+        uptake_df = pd.DataFrame({
+            "Year": [f"Y{k.replace('y', '')}" for k in uptake_data.keys()],
+            "Uptake %": [f"{v}%" for v in uptake_data.values()]
+        })
+
+        col1, col2 = st.columns([0.7, 0.3])
+        with col1:
+            st.dataframe(uptake_df, use_container_width=True, hide_index=True)
+        with col2:
+            st.markdown(f"""
+        <div class="data-card">
+            <div class="data-card-title">Peak Market Share</div>
+            <div class="data-card-value">{product['assumptions']['peakShare']}%</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.markdown("#### Long-Horizon Uptake Curve")
+        model = st.radio("Diffusion model", DIFFUSION_MODELS, format_func=str.title, horizontal=True,
+                         index=DIFFUSION_MODELS.index(DIFFUSION_CONFIG["model"]), key="diffusion_model")
+        st.plotly_chart(
+            tracked_call("uptake_curve", build_uptake_figure, product["id"], model, PORTFOLIO_FINGERPRINT, PRODUCT_STORE.version),
+            use_container_width=True
+        )
+        pos = PRODUCT_STORE.position(product["id"])
+        fit = PRODUCT_STORE.uptake_fit(model)
+        horizon = DIFFUSION_CONFIG["horizon_years"]
+        parameters = ", ".join(f"{name} = {value:.3g}" for name, value in zip(PARAMETER_NAMES[model], fit["params"][pos]))
+        horizon_share = diffusion_share(model, fit["params"][pos:pos + 1], float(horizon))[0, 0]
+        st.caption(
+            f"{model.title()} fit: {parameters} (RMSE {fit['rmse'][pos]:.2f} pts). "
+            f"Uptake grows fastest around year {peak_adoption_year(fit)[pos]:.1f} and reaches "
+            f"{horizon_share:.1f}% by year {horizon}."
+        )
+
+        st.markdown("---")
+
+        # Pricing & GTN Assumptions Container
+        st.markdown('<div class="pricing-container"><div class="section-title">💵 Pricing & GTN Assumptions</div></div>', unsafe_allow_html=True)
+
+        pricing = product["assumptions"]["pricing"]
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.markdown(f"""
+        <div class="data-card">
+            <div class="data-card-title">WAC (List Price)</div>
+            <div class="data-card-value">{symbol}{format_number(pricing['wac'], 0)}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        with col2:
+            st.markdown(f"""
+        <div class="data-card">
+            <div class="data-card-title">ASP (Avg Sales Price)</div>
+            <div class="data-card-value">{symbol}{format_number(pricing['asp'], 0)}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        with col3:
+            st.markdown(f"""
+        <div class="data-card">
+            <div class="data-card-title">Gross-to-Net %</div>
+            <div class="data-card-value">{pricing['gtn']}%</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.markdown("---")
+
+        # Access & Distribution Container
+        st.markdown('<div class="access-container"><div class="section-title">🎯 Access & Distribution</div></div>', unsafe_allow_html=True)
+
+        access = product["assumptions"]["access"]
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("#### Formulary Coverage")
+
+            tier1_pct = access["tier1"]
+            tier2_pct = access["tier2"]
+            tier3_pct = access["tier3"]
+
+            st.markdown(f"""
+        <div class="data-card">
+            <div class="data-card-title">🔷 Tier 1 (Preferred): <b>{tier1_pct}%</b></div>
+        </div>
+        """, unsafe_allow_html=True)
+            st.progress(tier1_pct / 100)
+
+            st.markdown(f"""
+        <div class="data-card">
+            <div class="data-card-title">🔷 Tier 2 (Non-Preferred): <b>{tier2_pct}%</b></div>
+        </div>
+        """, unsafe_allow_html=True)
+            st.progress(tier2_pct / 100)
+
+            st.markdown(f"""
+        <div class="data-card">
+            <div class="data-card-title">🔷 Tier 3 (Specialty): <b>{tier3_pct}%</b></div>
+        </div>
+        """, unsafe_allow_html=True)
+            st.progress(tier3_pct / 100)
+
+        with col2:
+            st.markdown("#### Market Details")
+            st.info(f"**Competition Level:** {product['assumptions']['competition']}")
+            st.info(f"**J-Code Status:** {product['assumptions']['jcode']}")
+            st.info(f"**Distribution:** {product['assumptions']['distribution']}")
+
+    @st.fragment
+    @PROFILER.wrap("tab:financials")
+    def render_financials_tab(product):
+        """Financials tab: valuation metrics and revenue waterfall"""
+        symbol = product_symbol(product)
+        st.markdown("### 💰 Financial Metrics")
+
+        valuation = PORTFOLIO_VALUATION.loc[product['id']]
+        npv = valuation['npv']
+        five_year_revenue = valuation['five_year_revenue']
+        peak_revenue = valuation['peak_revenue']
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.markdown(f"""
+        <div class="financial-card">
+            <div class="financial-label">Net Present Value</div>
+            <div class="financial-value">{symbol}{format_number(npv, 1)}M</div>
+            <div class="financial-subtitle">As of {product['lastUpdated']}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        with col2:
+            st.markdown(f"""
+        <div class="financial-card">
+            <div class="financial-label">5-Year Revenue</div>
+            <div class="financial-value">{symbol}{format_number(five_year_revenue, 1)}M</div>
+            <div class="financial-subtitle">Projected Total</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        with col3:
+            st.markdown(f"""
+        <div class="financial-card">
+            <div class="financial-label">Peak Year Revenue</div>
+            <div class="financial-value">{symbol}{format_number(peak_revenue, 1)}M</div>
+            <div class="financial-subtitle">Year {int(valuation['peak_year'])} Estimate</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.markdown("---")
+        st.markdown("### 🌪️ NPV Sensitivity")
+    
+        sensitivity = tracked_call("sensitivity", portfolio_sensitivity, PORTFOLIO_FINGERPRINT)
+        tornado = tornado_frame(sensitivity, PRODUCT_STORE.position(product['id']))
+        tornado = tornado.iloc[::-1]
+        tornado_fig = go.Figure([
+            go.Bar(y=tornado["Driver"], x=tornado["Low"], orientation="h", name=f"-{sensitivity['step']:.0%}", marker_color="#E74C3C"),
+            go.Bar(y=tornado["Driver"], x=tornado["High"], orientation="h", name=f"+{sensitivity['step']:.0%}", marker_color="#10b981")
+        ])
+        tornado_fig.update_layout(barmode="overlay", height=420, xaxis_title=f"NPV change ({symbol}M)", legend_title="Driver flex")
+        st.plotly_chart(tornado_fig, use_container_width=True)
+    
+        st.markdown("---")
+        waterfall_year = st.select_slider(
+            "Waterfall year",
+            options=list(range(1, VALUATION_CONFIG["horizon_years"] + 1)),
+            value=1,
+            format_func=lambda year: f"Year {year}",
+            key="waterfall_year"
+        )
+        st.markdown(f"### 💸 Revenue Waterfall (Year {waterfall_year})")
+
+        fig = tracked_call("waterfall", build_waterfall_figure, product['id'], waterfall_year, PORTFOLIO_FINGERPRINT, PRODUCT_STORE.version)
+        st.plotly_chart(fig, use_container_width=True)
+
+    @st.fragment
+    @PROFILER.wrap("tab:access")
+    def render_access_tab(product):
+        """Access tab: payer targets and milestones"""
+        st.markdown("### 🎯 Market Access Strategy")
+        st.info(f"Based on **{product['archetype']}** archetype - focus on **{product['assumptions']['distribution']}** channels")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("#### Target Payers")
+            payers = ["UnitedHealthcare", "CVS Caremark", "Humana", "Cigna", "Aetna"]
+            for idx, payer in enumerate(payers):
+                priority = "🔴 High Priority" if idx < 2 else "🟡 Medium Priority"
+                st.markdown(f"- **{payer}** {priority}")
+
+        with col2:
+            st.markdown("#### Key Milestones")
+
+            status_icons = {"Completed": "✅", "In Progress": "🔵", "Upcoming": "⭕"}
+            status_labels = {"Upcoming": "Planned"}
+            schedule = PRODUCT_STORE.calendar.milestones(PRODUCT_STORE.position(product["id"]))
+
+            # Milestones up to and including commercial launch
+            for stage, milestone in zip(MILESTONE_SCHEDULE, schedule):
+                if stage["Offset"] > 0:
+                    continue
+                status = milestone["Status"]
+                st.markdown(f"**{status_icons[status]} {milestone['Stage']}**  \n*{status_labels.get(status, status)} - {milestone['Date']}*")
+
+    @st.fragment
+    @PROFILER.wrap("tab:timeline")
+    def render_timeline_tab(product):
+        """Timeline tab: development stages and key activities"""
+        st.markdown("### 📅 Product Development Timeline")
+
+        st.markdown(tracked_call("timeline", build_timeline_html, product['id'], PORTFOLIO_FINGERPRINT, PRODUCT_STORE.version), unsafe_allow_html=True)
+
+        st.markdown("---")
+        st.markdown("### 🎯 Key Activities by Stage")
+
+        activities = {
+            "FDA Approval": ["Complete clinical data package", "Respond to FDA questions", "Finalize labeling"],
+            "Payer Negotiations": ["Submit dossier to major payers", "Prepare health economic data", "Conduct P&T committee meetings"],
+            "Commercial Launch": ["Initiate marketing campaigns", "Activate sales force", "Establish distribution network"],
+            "Formulary Wins": ["Secure preferred tier placement", "Negotiate rebates", "Launch field teams"],
+            "Market Expansion": ["Expand to secondary indications", "Build market share", "Monitor competition"]
+        }
+
+        for stage, activity_list in activities.items():
+            with st.expander(f"📋 {stage}"):
+                for activity in activity_list:
+                    st.markdown(f"• {activity}")
+
+    @st.fragment
+    @PROFILER.wrap("version_history")
+    def render_version_history(product):
+        """Version history section, rerun on its own when toggled"""
+        if not st.checkbox("📜 History", False, key="version_history"):
+            return
+        st.markdown("### 📜 Version History & Audit Trail")
+
+        for idx, version in enumerate(VERSION_LOG.history(product["id"])):
+            structured = is_structured(version)
+            label = f"Rev {version['version']}" if structured else version["version"]
+            status = version.get("status") or ("Current" if idx == 0 else "Approved")
+            with st.expander(f"{label} - {status}", expanded=(idx == 0)):
+                col1, col2 = st.columns([0.7, 0.3])
+
+                with col1:
+                    st.markdown("**Changes:**")
+                    for change in version["changes"]:
+                        st.markdown(f"• {describe_change(change, product_currency(product)) if structured else change}")
+                    if version.get("note"):
+                        st.caption(version["note"])
+
+                with col2:
+                    st.markdown(f"**User:** {version['user']}")
+                    st.markdown(f"**Date:** {version['date']}")
+                    # Product edits are valued in local currency, portfolio notes in the reporting currency
+                    impact = version["npvImpact"] * (product_display_rate(product) if structured else DISPLAY_RATE)
+                    impact_color = "🟢" if impact > 0 else "🔴" if impact < 0 else "⚪"
+                    sign = "-" if impact < 0 else "+"
+                    st.markdown(f"**NPV Impact:** {impact_color} {sign}{format_currency(abs(impact), DISPLAY_SYMBOL)}")
+
+    @st.fragment
+    @PROFILER.wrap("scenarios")
+    def render_scenario_comparison(product):
+        """Monte Carlo scenario section, rerun on its own when toggled or re-seeded"""
+        if not st.checkbox("🔀 Scenarios", False, key="scenario_comp"):
+            return
+        st.markdown("### 🔀 Scenario Comparison")
+
+        seed_col, draws_col = st.columns(2)
+        with seed_col:
+            scenario_seed = st.number_input("Random seed", min_value=0, value=SIMULATION_CONFIG["seed"], step=1, key="scenario_seed")
+        with draws_col:
+            scenario_draws = st.select_slider("Draws", options=[1000, 10000, 100000], value=SIMULATION_CONFIG["draws"], key="scenario_draws")
+
+        simulation = simulate_portfolio([product], n_draws=scenario_draws, seed=int(scenario_seed))
+        rate = product_display_rate(product)
+        scenario_df = create_scenario_comparison_dataframe(product, simulation, rate, DISPLAY_CURRENCY)
+        st.dataframe(scenario_df, use_container_width=True, hide_index=True)
+
+        counts = simulation["histogram_counts"][0]
+        edges = simulation["histogram_edges"][0] * rate
+        hist_fig = go.Figure(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=edges[1] - edges[0],
+            marker_color="#0055CC"
+        ))
+        for label, value in zip(["P10", "P50", "P90"], simulation["npv_percentiles"][:, 0] * rate):
+            hist_fig.add_vline(x=value, line_dash="dash", annotation_text=f"{label} {format_currency(float(value), DISPLAY_SYMBOL)}")
+        hist_fig.update_layout(height=320, showlegend=False, xaxis_title=f"NPV ({DISPLAY_CURRENCY}M)", yaxis_title="Draws", bargap=0)
+        st.plotly_chart(hist_fig, use_container_width=True)
+
+    PRODUCT_TABS = {
+        "assumptions": ("📋 Assumptions", render_assumptions_tab),
+        "financials": ("💰 Financials", render_financials_tab),
+        "access": ("🎯 Access", render_access_tab),
+        "timeline": ("📅 Timeline", render_timeline_tab)
+    }
+
+    @st.fragment
+    @PROFILER.wrap("single_product_view")
+    def single_product_view():
+        """Single product view; changing the product reruns only this fragment"""
+        # Product selector as top bar
+        st.markdown("---")
+    
+        # Product selection dropdown in main area (not sidebar)
+        col_select, col_space = st.columns([0.4, 0.6])
+    
+        with col_select:
+            st.selectbox(
+                "🔍 Select Product",
+                options=PRODUCT_STORE.ids,
+                format_func=PRODUCT_STORE.name_of,
+                index=PRODUCT_STORE.position(st.session_state.selected_product) or 0,
+                key="product_selector",
+                on_change=lambda: setattr(st.session_state, 'selected_product', st.session_state.product_selector)
+            )
+    
+        product = PRODUCT_STORE.get(st.session_state.selected_product)
+        if not product:
+            return
+    
+        # Summary in top banner
+        col1, col2, col3, col4 = st.columns([0.25, 0.25, 0.25, 0.25])
+    
+        with col1:
+            st.metric("Territory", product['territory'])
+    
+        with col2:
+            st.metric("NPV", f"{product_symbol(product)}{format_number(product['npv'], 1)}M")
+    
+        with col3:
+            st.metric("Phase", product['phase'])
+    
+        with col4:
+            st.metric("Launch", product['launchDate'])
+    
+        st.markdown("---")
+    
+        render_product_header(product)
+    
+        st.markdown("---")
+    
+        # Enhanced Tabs with styling
+        st.markdown("""
+    <div style="margin-top: 20px; margin-bottom: 10px;">
+        <p style="font-size: 14px; font-weight: 700; color: #1f2937; text-transform: uppercase; letter-spacing: 0.8px; margin: 0 0 12px 0;">Product Details</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+        # Tabs: only the active tab is computed and sent to the browser
+        active_tab = st.radio(
+            "Product details tab",
+            options=list(PRODUCT_TABS),
+            format_func=lambda tab: PRODUCT_TABS[tab][0],
+            horizontal=True,
+            key="active_tab",
+            label_visibility="collapsed"
+        )
+        PRODUCT_TABS[active_tab][1](product)
+    
+        st.markdown("---")
+    
+        # Version History
+        render_version_history(product)
+    
+        # Scenario Comparison
+        render_scenario_comparison(product)
+    
+        st.markdown("---")
+    
+        # Footer
+        col1, col2 = st.columns([0.7, 0.3])
+        with col1:
+            st.markdown(f"**Last updated by:** {product['updatedBy']}  \n**Date:** {product['lastUpdated']}")
+        with col2:
+            st.markdown("🟢 **Status:** Single Source of Truth | Version Control Enabled")
+
+        # Back to portfolio button
+        if st.button("⬅️ Back to Portfolio View", use_container_width=True):
+            st.session_state.view_mode = "portfolio"
+            st.rerun()
+
+    @st.cache_data(show_spinner=False, max_entries=32)
+    def portfolio_optimization(fingerprint, version, budget, capacity, max_delay):
+        """Optimized selection and the priority-label baseline for one data version and constraint set"""
+        record_cache("optimizer", hit=False)
+        candidates = launch_candidates(PRODUCT_STORE, max_delay)
+        result = optimize_portfolio(candidates, budget, capacity)
+        baseline = summarize(candidates, priority_ranking(candidates, budget, capacity))
+        return result, baseline, selection_frame(PRODUCT_STORE, candidates, result["delay"])
+
+    @st.fragment
+    @PROFILER.wrap("optimizer")
+    def render_portfolio_optimizer():
+        """Launch selection under a budget and per-quarter capacity, rerun on its own when inputs change"""
+        if not st.checkbox("🧮 Portfolio Optimizer", False, key="optimizer_enabled",
+                           help="Choose products and launch quarters that maximize risk-adjusted NPV"):
+            return
+        opt_col1, opt_col2, opt_col3 = st.columns(3)
+        with opt_col1:
+            budget = st.number_input(f"Launch budget ({DISPLAY_SYMBOL}M)", min_value=0.0,
+                                     value=float(OPTIMIZER_CONFIG["budget"] * DISPLAY_RATE), step=10.0, key="optimizer_budget")
+        with opt_col2:
+            capacity = st.number_input("Launches per quarter", min_value=0,
+                                       value=OPTIMIZER_CONFIG["quarter_capacity"], step=1, key="optimizer_capacity")
+        with opt_col3:
+            max_delay = st.slider("Max launch slip (quarters)", 0, 8, OPTIMIZER_CONFIG["max_delay"], key="optimizer_delay")
+
+        result, baseline, selection = tracked_call(
+            "optimizer", portfolio_optimization, PORTFOLIO_FINGERPRINT, PRODUCT_STORE.version,
+            budget / DISPLAY_RATE, int(capacity), max_delay
+        )
+        solver = "Exact (branch & bound)" if result["method"] == "branch_and_bound" else "Greedy heuristic"
+        kpi_col1, kpi_col2, kpi_col3, kpi_col4 = st.columns(4)
+        kpi_col1.metric("Products selected", f"{result['selected']} of {len(PRODUCT_STORE)}")
+        kpi_col2.metric("Risk-adjusted NPV", f"{DISPLAY_SYMBOL}{result['value'] * DISPLAY_RATE:,.1f}M",
+                        f"{(result['value'] - baseline['value']) * DISPLAY_RATE:+,.1f}M vs priority ranking")
+        kpi_col3.metric("Launch budget used", f"{DISPLAY_SYMBOL}{result['cost'] * DISPLAY_RATE:,.1f}M")
+        kpi_col4.metric("Solver", solver, f"{result['elapsed'] * 1000:,.1f} ms", delta_color="off")
+        if result["method"] == "branch_and_bound" and not result["optimal"]:
+            st.caption(f"Node limit reached after {result['nodes']:,} nodes; showing the best selection found")
+
+        selection[["risk_adjusted_npv", "launch_cost"]] *= DISPLAY_RATE
+        st.dataframe(
+            selection,
+            column_config={
+                "id": st.column_config.TextColumn("ID"),
+                "name": st.column_config.TextColumn("Product"),
+                "phase": st.column_config.TextColumn("Phase"),
+                "priority": st.column_config.TextColumn("Priority"),
+                "planned_launch": st.column_config.TextColumn("Planned"),
+                "launch": st.column_config.TextColumn("Launch"),
+                "delay_quarters": st.column_config.NumberColumn("Slip (qtrs)"),
+                "risk_adjusted_npv": st.column_config.NumberColumn("Risk-adj. NPV", format=f"{DISPLAY_SYMBOL}%.1fM"),
+                "launch_cost": st.column_config.NumberColumn("Launch cost", format=f"{DISPLAY_SYMBOL}%.1fM")
+            },
+            hide_index=True,
+            use_container_width=True,
+            height=min(400, 38 + 35 * len(selection))
+        )
+
+    def render_profiling_panel(profiler):
+        """Sidebar panel with per-section timings, rerun history and trace export"""
+        run = profiler.last_run()
+        if run is None:
+            return
+        with st.sidebar:
+            st.markdown("### 🛠️ Rerun Profile")
+            st.metric("Script run", f"{run['duration'] * 1000:,.1f} ms")
+            st.dataframe(pd.DataFrame([{
+                "Section": "  " * span["depth"] + span["name"],
+                "Wall (ms)": round(span["duration"] * 1000, 2),
+                "Δ Alloc blocks": span["alloc_blocks"],
+                "Cache hits": span["cache_hits"],
+                "Cache misses": span["cache_misses"]
+            } for span in sorted(run["spans"], key=lambda s: s["start"])]), hide_index=True, use_container_width=True)
         
-        # Tabs
-        tab1, tab2, tab3, tab4 = st.tabs(["📋 Assumptions", "💰 Financials", "🎯 Access", "📅 Timeline"])
-        
-        with tab1:
-            # Market Uptake Assumptions Container
-            st.markdown('<div class="uptake-container"><div class="section-title">📈 Market Uptake Assumptions</div></div>', unsafe_allow_html=True)
-            
-            uptake_data = current_product["assumptions"]["uptake"]
-            uptake_df = pd.DataFrame({
-                "Year": [f"Y{k.replace('y', '')}" for k in uptake_data.keys()],
-                "Uptake %": [f"{v}%" for v in uptake_data.values()]
-            })
-            
-            col1, col2 = st.columns([0.7, 0.3])
-            with col1:
-                st.dataframe(uptake_df, use_container_width=True, hide_index=True)
-            with col2:
-                st.markdown(f"""
-                <div class="data-card">
-                    <div class="data-card-title">Peak Market Share</div>
-                    <div class="data-card-value">{current_product['assumptions']['peakShare']}%</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-            
-            # Pricing & GTN Assumptions Container
-            st.markdown('<div class="pricing-container"><div class="section-title">💵 Pricing & GTN Assumptions</div></div>', unsafe_allow_html=True)
-            
-            pricing = current_product["assumptions"]["pricing"]
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                wac_formatted = format_currency(pricing['wac'])
-                st.markdown(f"""
-                <div class="data-card">
-                    <div class="data-card-title">WAC (List Price)</div>
-                    <div class="data-card-value">${format_number(pricing['wac'], 0)}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div class="data-card">
-                    <div class="data-card-title">ASP (Avg Sales Price)</div>
-                    <div class="data-card-value">${format_number(pricing['asp'], 0)}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col3:
-                st.markdown(f"""
-                <div class="data-card">
-                    <div class="data-card-title">Gross-to-Net %</div>
-                    <div class="data-card-value">{pricing['gtn']}%</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-            
-            # Access & Distribution Container
-            st.markdown('<div class="access-container"><div class="section-title">🎯 Access & Distribution</div></div>', unsafe_allow_html=True)
-            
-            access = current_product["assumptions"]["access"]
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("#### Formulary Coverage")
-                
-                tier1_pct = access["tier1"]
-                tier2_pct = access["tier2"]
-                tier3_pct = access["tier3"]
-                
-                st.markdown(f"""
-                <div class="data-card">
-                    <div class="data-card-title">🔷 Tier 1 (Preferred): <b>{tier1_pct}%</b></div>
-                </div>
-                """, unsafe_allow_html=True)
-                st.progress(tier1_pct / 100)
-                
-                st.markdown(f"""
-                <div class="data-card">
-                    <div class="data-card-title">🔷 Tier 2 (Non-Preferred): <b>{tier2_pct}%</b></div>
-                </div>
-                """, unsafe_allow_html=True)
-                st.progress(tier2_pct / 100)
-                
-                st.markdown(f"""
-                <div class="data-card">
-                    <div class="data-card-title">🔷 Tier 3 (Specialty): <b>{tier3_pct}%</b></div>
-                </div>
-                """, unsafe_allow_html=True)
-                st.progress(tier3_pct / 100)
-            
-            with col2:
-                st.markdown("#### Market Details")
-                st.info(f"**Competition Level:** {current_product['assumptions']['competition']}")
-                st.info(f"**J-Code Status:** {current_product['assumptions']['jcode']}")
-                st.info(f"**Distribution:** {current_product['assumptions']['distribution']}")
-        
-        with tab2:
-            st.markdown("### 💰 Financial Metrics")
-            
-            npv = current_product['npv']
-            five_year_revenue = npv * 1.8
-            peak_revenue = npv * 0.45
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
+            history = list(profiler.history)
+            st.markdown("**Rerun history (ms)**")
+            st.line_chart(pd.DataFrame({
+                "Total": [r["duration"] * 1000 for r in history]
+            }), height=160)
+        
+            st.download_button(
+                "⬇️ Export Chrome trace",
+                data=chrome_trace(history),
+                file_name="sandoz_pipeline_trace.json",
+                mime="application/json",
+                use_container_width=True
+            )
+
+    # Initialize session state
+    if "view_mode" not in st.session_state:
+        st.session_state.view_mode = "portfolio"
+    if "selected_product" not in st.session_state:
+        st.session_state.selected_product = PRODUCT_STORE.ids[0] if len(PRODUCT_STORE) else None
+    if "active_tab" not in st.session_state:
+        st.session_state.active_tab = "assumptions"
+
+    # Beautiful Header Container with Logo and Title
+    header_col1, header_col2, header_col3 = st.columns([0.2, 0.6, 0.2])
+
+    with header_col1:
+        st.markdown("<br>", unsafe_allow_html=True)
+        # Handle logo with proper path for cloud deployment
+        logo_path = Path(__file__).parent / "Sandoz.png"
+        if logo_path.exists():
+            st.image(str(logo_path), use_container_width=True)
+        else:
+            st.write("📦")  # Fallback if logo not found
+
+    with header_col2:
+        st.markdown("""
+    <div style="text-align: center; padding: 20px 0;">
+        <h1 style="margin: 0; font-size: 48px; font-weight: 900; color: #0055CC; letter-spacing: -1px; text-shadow: 0 1px 4px rgba(0,85,204,0.1);">
+            Pipeline Decision System
+        </h1>
+        <p style="margin: 12px 0 0 0; font-size: 16px; color: #004499; font-weight: 500; letter-spacing: 0.3px;">
+            Centralized Portfolio Management & NPV Tracking
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    with header_col3:
+        st.markdown("")
+
+    # st.markdown("")
+
+    # View mode toggle
+
+
+    col1, col2, col3 = st.columns([0.3, 0.01, 0.3])
+    with col1:
+        if st.button("📦 Single Product View", use_container_width=True, 
+                     key="btn_single",
+                     help="View detailed information for a single product"):
+            st.session_state.view_mode = "single"
+    with col3:
+        if st.button("📊 Portfolio View", use_container_width=True,
+                     key="btn_portfolio",
+                     help="View all products in the portfolio"):
+            st.session_state.view_mode = "portfolio"
+
+
+    # st.markdown("---")
+
+    # PORTFOLIO VIEW
+    if st.session_state.view_mode == "portfolio":
+        # Enhanced Portfolio Overview Header
+        st.markdown(f"""
+    <div style="text-align: center; padding: 12px 0; margin-bottom: 14px;">
+        <h2 style="margin: 0; font-size: 28px; font-weight: 900; color: #0055CC; letter-spacing: -1px;">📈 Portfolio Overview</h2>
+        <p style="margin: 4px 0 0 0; color: #6b7280; font-size: 13px;">Real-time insights across {len(PRODUCT_STORE)} pipeline products</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+        with PROFILER.section("metric_cards"):
+            # Calculate metrics
+            totals = PRODUCT_STORE.portfolio_totals()
+            portfolio_npv = totals["total_npv"] * DISPLAY_RATE
+            portfolio_rnpv = PORTFOLIO_AGGREGATES.totals()["rnpv"] * DISPLAY_RATE
+            high_priority_count = totals["high_priority_count"]
+            products_count = totals["total_products"]
+            launches_this_year = PORTFOLIO_AGGREGATES.totals()["launches_this_year"]
+            launches_next_year = len(PRODUCT_STORE.calendar.next_quarters(4))
+    
+            # Wrap metrics in enhanced card container with gradient
+            # st.markdown("""
+            # <div class="metrics-overview-card" style="background: linear-gradient(135deg, #f0f9ff 0%, #fafbfc 100%); border: 2px solid #0055CC33; padding: 18px 16px;">
+            # """, unsafe_allow_html=True)
+    
+            # Summary metrics with custom styling
+            metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4, gap="small")
+    
+            with metric_col1:
                 st.markdown(f"""
-                <div class="financial-card">
-                    <div class="financial-label">Net Present Value</div>
-                    <div class="financial-value">${format_number(npv, 1)}M</div>
-                    <div class="financial-subtitle">As of {current_product['lastUpdated']}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
+            <div style="text-align: center; padding: 16px 12px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px; box-shadow: 0 4px 12px rgba(102, 126, 234, 0.25), 0 2px 6px rgba(0,0,0,0.08); transition: all 0.3s ease;">
+                <div style="font-size: 11px; color: rgba(255,255,255,0.9); font-weight: 600; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">Total Pipeline NPV</div>
+                <div style="font-size: 32px; font-weight: 900; color: white; text-shadow: 0 2px 8px rgba(0,0,0,0.2); letter-spacing: -1px;">{DISPLAY_SYMBOL}{portfolio_npv:,.1f}M</div>
+                <div style="font-size: 10px; color: rgba(255,255,255,0.75); margin-top: 4px; font-weight: 500;">Risk-adjusted (rNPV): {DISPLAY_SYMBOL}{portfolio_rnpv:,.1f}M</div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+            with metric_col2:
                 st.markdown(f"""
-                <div class="financial-card">
-                    <div class="financial-label">5-Year Revenue</div>
-                    <div class="financial-value">${format_number(five_year_revenue, 1)}M</div>
-                    <div class="financial-subtitle">Projected Total</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col3:
+            <div style="text-align: center; padding: 16px 12px; background: linear-gradient(135deg, #0ea5e9 0%, #0284c7 100%); border-radius: 10px; box-shadow: 0 4px 12px rgba(14, 165, 233, 0.25), 0 2px 6px rgba(0,0,0,0.08); transition: all 0.3s ease;">
+                <div style="font-size: 11px; color: rgba(255,255,255,0.9); font-weight: 600; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">Products in Pipeline</div>
+                <div style="font-size: 32px; font-weight: 900; color: white; text-shadow: 0 2px 8px rgba(0,0,0,0.2); letter-spacing: -1px;">{products_count}</div>
+                <div style="font-size: 10px; color: rgba(255,255,255,0.75); margin-top: 4px; font-weight: 500;">Active programs</div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+            with metric_col3:
                 st.markdown(f"""
-                <div class="financial-card">
-                    <div class="financial-label">Peak Year Revenue</div>
-                    <div class="financial-value">${format_number(peak_revenue, 1)}M</div>
-                    <div class="financial-subtitle">Year 4-5 Estimate</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-            st.markdown("### 💸 Revenue Waterfall (Year 1)")
-            
-            waterfall_data = {
-                "Category": ["Gross Revenue\n(WAC)", "Rebates &\nDiscounts", "Chargebacks", "Admin Fees", "Net Revenue"],
-                "Amount": [125.0, -42.5, -8.2, -6.8, 67.5]
-            }
-            
-            waterfall_df = pd.DataFrame(waterfall_data)
-            
-            fig = go.Figure(go.Waterfall(
-                x=waterfall_df["Category"],
-                y=waterfall_df["Amount"],
-                totals={"marker": {"color": "green"}},
-                measure=["relative", "relative", "relative", "relative", "total"],
-                text=["$125.0M", "-$42.5M", "-$8.2M", "-$6.8M", "$67.5M"],
-                textposition="outside"
-            ))
-            fig.update_layout(height=400, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with tab3:
-            st.markdown("### 🎯 Market Access Strategy")
-            st.info(f"Based on **{current_product['archetype']}** archetype - focus on **{current_product['assumptions']['distribution']}** channels")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("#### Target Payers")
-                payers = ["UnitedHealthcare", "CVS Caremark", "Humana", "Cigna", "Aetna"]
-                for idx, payer in enumerate(payers):
-                    priority = "🔴 High Priority" if idx < 2 else "🟡 Medium Priority"
-                    st.markdown(f"- **{payer}** {priority}")
-            
-            with col2:
-                st.markdown("#### Key Milestones")
-                
-                milestones = [
-                    ("✅ FDA Approval", "Completed - 2025-Q4"),
-                    ("🔵 Payer Negotiations", "In Progress - 2026-Q1"),
-                    ("⭕ Commercial Launch", "Planned - 2026-Q2")
-                ]
-                
-                for milestone, status in milestones:
-                    st.markdown(f"**{milestone}**  \n*{status}*")
-        
-        with tab4:
-            st.markdown("### 📅 Product Development Timeline")
-            
-            timeline_data = [
-                {"Stage": "FDA Approval", "Date": "2025-Q4", "Status": "Completed", "Duration": "6 months"},
-                {"Stage": "Payer Negotiations", "Date": "2026-Q1", "Status": "In Progress", "Duration": "3 months"},
-                {"Stage": "Commercial Launch", "Date": "2026-Q2", "Status": "Upcoming", "Duration": "Ongoing"},
-                {"Stage": "Formulary Wins", "Date": "2026-Q3", "Status": "Upcoming", "Duration": "6 months"},
-                {"Stage": "Market Expansion", "Date": "2026-Q4", "Status": "Upcoming", "Duration": "Ongoing"}
-            ]
-            
-            status_colors = {
-                "Completed": "#10b981",      # Green
-                "In Progress": "#3b82f6",    # Blue
-                "Upcoming": "#f59e0b"        # Amber
-            }
-            
-            status_bg_colors = {
-                "Completed": "#d1fae5",      # Light green
-                "In Progress": "#dbeafe",    # Light blue
-                "Upcoming": "#fef3c7"        # Light amber
-            }
-            
-            # Vertical timeline
-            st.markdown("""
-            <style>
-            .timeline-container {
-                position: relative;
-                padding: 20px 0;
-            }
-            .timeline-item {
-                display: flex;
-                margin-bottom: 30px;
-                position: relative;
-            }
-            .timeline-marker {
-                width: 60px;
-                height: 60px;
-                border-radius: 50%;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-size: 28px;
-                font-weight: bold;
-                color: white;
-                border: 3px solid white;
-                box-shadow: 0 0 0 3px;
-                flex-shrink: 0;
-                margin-right: 30px;
-            }
-            .timeline-content {
-                flex: 1;
-                padding: 20px;
-                border-radius: 12px;
-                background-color: white;
-                border: 2px solid #e5e7eb;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-                transition: transform 0.2s, box-shadow 0.2s;
-            }
-            .timeline-content:hover {
-                transform: translateX(5px);
-                box-shadow: 0 4px 16px rgba(0,0,0,0.12);
-            }
-            .timeline-date {
-                font-size: 18px;
-                font-weight: 700;
-                color: #1f2937;
-                margin-bottom: 8px;
-            }
-            .timeline-stage {
-                font-size: 16px;
-                font-weight: 600;
-                color: #374151;
-                margin-bottom: 4px;
-            }
-            .timeline-status {
-                font-size: 13px;
-                font-weight: 600;
-                padding: 4px 12px;
-                border-radius: 20px;
-                display: inline-block;
-                margin-top: 8px;
-            }
-            .timeline-duration {
-                font-size: 12px;
-                color: #6b7280;
-                margin-top: 6px;
-                font-style: italic;
-            }
-            .timeline-vertical-line {
-                position: absolute;
-                left: 29px;
-                top: 60px;
-                width: 2px;
-                height: calc(100% + 30px);
-                background: #e5e7eb;
-            }
-            .timeline-item:last-child .timeline-vertical-line {
-                display: none;
-            }
-            </style>
+            <div style="text-align: center; padding: 16px 12px; background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%); border-radius: 10px; box-shadow: 0 4px 12px rgba(245, 158, 11, 0.25), 0 2px 6px rgba(0,0,0,0.08); transition: all 0.3s ease;">
+                <div style="font-size: 11px; color: rgba(255,255,255,0.9); font-weight: 600; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">High Priority Assets</div>
+                <div style="font-size: 32px; font-weight: 900; color: white; text-shadow: 0 2px 8px rgba(0,0,0,0.2); letter-spacing: -1px;">{high_priority_count}</div>
+                <div style="font-size: 10px; color: rgba(255,255,255,0.75); margin-top: 4px; font-weight: 500;">Strategic focus</div>
+            </div>
             """, unsafe_allow_html=True)
-            
-            st.markdown('<div class="timeline-container">', unsafe_allow_html=True)
-            
-            for idx, task in enumerate(timeline_data):
-                status = task["Status"]
-                color = status_colors.get(status, "#9ca3af")
-                bg_color = status_bg_colors.get(status, "#f3f4f6")
-                status_icon = "✅" if status == "Completed" else "🔵" if status == "In Progress" else "⭕"
-                
-                timeline_html = f"""
-                <div class="timeline-item">
-                    <div class="timeline-vertical-line"></div>
-                    <div class="timeline-marker" style="background-color: {color}; box-shadow: 0 0 0 3px {color}, 0 0 0 6px white;">
-                        {status_icon}
-                    </div>
-                    <div class="timeline-content">
-                        <div class="timeline-date">{task['Date']}</div>
-                        <div class="timeline-stage">{task['Stage']}</div>
-                        <div class="timeline-duration">Duration: {task['Duration']}</div>
-                        <span class="timeline-status" style="background-color: {bg_color}; color: {color};">
-                            {status}
-                        </span>
+    
+            with metric_col4:
+                st.markdown(f"""
+            <div style="text-align: center; padding: 16px 12px; background: linear-gradient(135deg, #10b981 0%, #059669 100%); border-radius: 10px; box-shadow: 0 4px 12px rgba(16, 185, 129, 0.25), 0 2px 6px rgba(0,0,0,0.08); transition: all 0.3s ease;">
+                <div style="font-size: 11px; color: rgba(255,255,255,0.9); font-weight: 600; text-transform: uppercase; letter-spacing: 0.8px; margin-bottom: 8px;">Launches This Year</div>
+                <div style="font-size: 32px; font-weight: 900; color: white; text-shadow: 0 2px 8px rgba(0,0,0,0.2); letter-spacing: -1px;">{launches_this_year}</div>
+                <div style="font-size: 10px; color: rgba(255,255,255,0.75); margin-top: 4px; font-weight: 500;">{launches_next_year} in the next 4 quarters</div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+            st.markdown('</div>', unsafe_allow_html=True)
+    
+        st.markdown("---")
+    
+        with PROFILER.section("archetype_cards"):
+            # Archetype Distribution with enhanced styling
+            st.markdown(f"""
+        <div style="text-align: center; padding: 20px 0;">
+            <h3 style="margin: 0; font-size: 28px; font-weight: 800; color: #1f2937; letter-spacing: -0.5px;">🎯 Portfolio by Archetype</h3>
+            <p style="margin: 8px 0 0 0; color: #6b7280; font-size: 14px;">Distribution across {len(ARCHETYPES)} product archetypes</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+            # st.markdown('<div class="portfolio-card-wrapper" style="padding: 28px; background: linear-gradient(135deg, #fafbfc 0%, #f8f9fa 100%);">', unsafe_allow_html=True)
+    
+            archetype_counts = PORTFOLIO_AGGREGATES.counts("archetype", [a["name"] for a in ARCHETYPES])
+            arch_cols = st.columns(len(ARCHETYPES), gap="medium")
+            for idx, archetype in enumerate(ARCHETYPES):
+                with arch_cols[idx]:
+                    st.markdown(f"""
+                <div class="archetype-card" style='border-color: {archetype['color']}; background: white; padding: 20px; box-shadow: 0 4px 16px rgba(0,0,0,0.08);'>
+                    <div style='width: 70px; height: 70px; border-radius: 50%; background: linear-gradient(135deg, {archetype['color']} 0%, {archetype['color']}dd 100%); 
+                                margin: 0 auto 14px; display: flex; align-items: center; justify-content: center; color: white; font-weight: 900; font-size: 24px; box-shadow: 0 6px 20px {archetype['color']}50; transition: all 0.3s ease;'>
+                        {archetype_counts[archetype['name']]}
                     </div>
+                    <p style='font-size: 13px; margin: 0; font-weight: 700; color: #1f2937; text-align: center; line-height: 1.4;'>{archetype['name']}</p>
                 </div>
-                """
-                st.markdown(timeline_html, unsafe_allow_html=True)
-            
+                """, unsafe_allow_html=True)
+    
             st.markdown('</div>', unsafe_allow_html=True)
-            
-            st.markdown("---")
-            st.markdown("### 🎯 Key Activities by Stage")
-            
-            activities = {
-                "FDA Approval": ["Complete clinical data package", "Respond to FDA questions", "Finalize labeling"],
-                "Payer Negotiations": ["Submit dossier to major payers", "Prepare health economic data", "Conduct P&T committee meetings"],
-                "Commercial Launch": ["Initiate marketing campaigns", "Activate sales force", "Establish distribution network"],
-                "Formulary Wins": ["Secure preferred tier placement", "Negotiate rebates", "Launch field teams"],
-                "Market Expansion": ["Expand to secondary indications", "Build market share", "Monitor competition"]
-            }
-            
-            for stage, activity_list in activities.items():
-                with st.expander(f"📋 {stage}"):
-                    for activity in activity_list:
-                        st.markdown(f"• {activity}")
-        
+    
         st.markdown("---")
+    
+        # Portfolio-wide value drivers from the batched sensitivity run
+        with PROFILER.section("driver_ranking"):
+            st.markdown("""
+        <div style="text-align: center; padding: 20px 0;">
+            <h3 style="margin: 0; font-size: 28px; font-weight: 800; color: #1f2937; letter-spacing: -0.5px;">🌪️ Portfolio Value Drivers</h3>
+            <p style="margin: 8px 0 0 0; color: #6b7280; font-size: 14px;">Total NPV swing when each assumption is flexed across every product</p>
+        </div>
+        """, unsafe_allow_html=True)
         
-        # Version History
-        if show_version_history:
-            st.markdown("### 📜 Version History & Audit Trail")
-            
-            for idx, version in enumerate(VERSION_HISTORY):
-                with st.expander(f"{version['version']} - {version['status']}", expanded=(idx == 0)):
-                    col1, col2 = st.columns([0.7, 0.3])
-                    
-                    with col1:
-                        st.markdown("**Changes:**")
-                        for change in version["changes"]:
-                            st.markdown(f"• {change}")
-                    
-                    with col2:
-                        st.markdown(f"**User:** {version['user']}")
-                        st.markdown(f"**Date:** {version['date']}")
-                        impact_color = "🟢" if version["npvImpact"] > 0 else "🔴" if version["npvImpact"] < 0 else "⚪"
-                        st.markdown(f"**NPV Impact:** {impact_color} {version['npvImpact']:+.1f}M")
-        
-        # Scenario Comparison
-        if show_scenario:
-            st.markdown("### 🔀 Scenario Comparison")
-            
-            scenario_data = {
-                "Metric": ["NPV", "Peak Share", "GTN %"],
-                "Base Case": [
-                    f"${current_product['npv']}M",
-                    f"{current_product['assumptions']['peakShare']}%",
-                    f"{current_product['assumptions']['pricing']['gtn']}%"
-                ],
-                "Optimistic": [
-                    f"${current_product['npv'] * 1.25:.1f}M",
-                    f"{current_product['assumptions']['peakShare'] + 8}%",
-                    f"{current_product['assumptions']['pricing']['gtn'] - 5}%"
-                ],
-                "Conservative": [
-                    f"${current_product['npv'] * 0.75:.1f}M",
-                    f"{current_product['assumptions']['peakShare'] - 8}%",
-                    f"{current_product['assumptions']['pricing']['gtn'] + 5}%"
-                ]
-            }
-            
-            scenario_df = pd.DataFrame(scenario_data)
-            st.dataframe(scenario_df, use_container_width=True, hide_index=True)
-        
+            ranking = driver_ranking(tracked_call("sensitivity", portfolio_sensitivity, PORTFOLIO_FINGERPRINT),
+                                     DISPLAY_CURRENCY, RATE_TABLE)
+            money_columns = [f"{label} ({DISPLAY_CURRENCY}M)" for label in ("Upside", "Downside", "Swing")]
+            swing_column = money_columns[-1]
+            driver_col1, driver_col2 = st.columns([0.55, 0.45])
+            with driver_col1:
+                ranking_fig = go.Figure(go.Bar(
+                    y=ranking["Driver"][::-1],
+                    x=ranking[swing_column][::-1],
+                    orientation="h",
+                    marker_color="#0055CC"
+                ))
+                ranking_fig.update_layout(height=400, xaxis_title=f"Total NPV swing ({DISPLAY_CURRENCY}M)", margin=dict(t=10))
+                st.plotly_chart(ranking_fig, use_container_width=True)
+            with driver_col2:
+                st.dataframe(
+                    ranking,
+                    column_config={
+                        **{c: st.column_config.NumberColumn(format=f"{DISPLAY_SYMBOL}%.1fM") for c in money_columns},
+                        "Swing (% of NPV)": st.column_config.NumberColumn(format="%.1f%%")
+                    },
+                    hide_index=True,
+                    use_container_width=True
+                )
+    
         st.markdown("---")
-        
-        # Footer
-        col1, col2 = st.columns([0.7, 0.3])
+    
+        render_portfolio_optimizer()
+    
+        st.markdown("---")
+    
+        with PROFILER.section("portfolio_table"):
+            # Portfolio Table with enhanced header
+            st.markdown("""
+        <div style="text-align: center; padding: 20px 0;">
+            <h3 style="margin: 0; font-size: 28px; font-weight: 800; color: #1f2937; letter-spacing: -0.5px;">📋 Pipeline Portfolio Overview</h3>
+            <p style="margin: 8px 0 0 0; color: #6b7280; font-size: 14px;">Complete financial and strategic view of all products</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+            # Table controls: sorting and paging run server-side so only one page is rendered
+            ctrl_col1, ctrl_col2, ctrl_col3, ctrl_col4 = st.columns([0.25, 0.25, 0.25, 0.25])
+            with ctrl_col1:
+                table_mode = st.radio("Table mode", ["Cards", "Grid"], horizontal=True, key="table_mode",
+                                      help="Cards render one page of rows; Grid scrolls the full portfolio virtually")
+            with ctrl_col2:
+                sort_label = st.selectbox("Sort by", list(TABLE_SORT_COLUMNS), key="table_sort")
+            with ctrl_col3:
+                sort_descending = st.toggle("Descending", value=True, key="table_sort_desc")
+            with ctrl_col4:
+                page_size = st.selectbox("Rows per page", [25, 50, 100], key="table_page_size")
+    
+            portfolio_table = create_portfolio_table(PRODUCT_STORE)
+            portfolio_table[["npv", "rnpv", "five_year_revenue", "peak_revenue"]] *= DISPLAY_RATE
+            portfolio_table = sort_portfolio_table(
+                portfolio_table, TABLE_SORT_COLUMNS[sort_label], ascending=not sort_descending
+            )
+    
+            if table_mode == "Grid":
+                st.dataframe(
+                    portfolio_table[["name", "id", "archetype", "phase", "launchDate", "npv", "rnpv", "probability_of_success",
+                                     "five_year_revenue", "peak_revenue", "priority"]],
+                    column_config={
+                        "name": st.column_config.TextColumn("Product"),
+                        "id": st.column_config.TextColumn("ID"),
+                        "archetype": st.column_config.TextColumn("Archetype"),
+                        "phase": st.column_config.TextColumn("Phase"),
+                        "launchDate": st.column_config.TextColumn("Launch"),
+                        "npv": st.column_config.NumberColumn("NPV", format=f"{DISPLAY_SYMBOL}%.1fM"),
+                        "rnpv": st.column_config.NumberColumn("rNPV", format=f"{DISPLAY_SYMBOL}%.1fM",
+                                                              help="NPV weighted by phase probability of success"),
+                        "probability_of_success": st.column_config.NumberColumn("PoS", format="%.0f%%"),
+                        "five_year_revenue": st.column_config.NumberColumn("5-Yr Rev", format=f"{DISPLAY_SYMBOL}%.1fM"),
+                        "peak_revenue": st.column_config.NumberColumn("Peak Rev", format=f"{DISPLAY_SYMBOL}%.1fM"),
+                        "priority": st.column_config.TextColumn("Priority")
+                    },
+                    hide_index=True,
+                    use_container_width=True,
+                    height=min(600, 38 + 35 * len(portfolio_table))
+                )
+            else:
+                n_pages = max(1, -(-len(portfolio_table) // page_size))
+                page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1, key="table_page")
+                page_rows, n_pages = paginate(portfolio_table, int(page), page_size)
+                st.markdown(portfolio_table_html(page_rows, len(portfolio_table), DISPLAY_SYMBOL), unsafe_allow_html=True)
+    
+        st.markdown("---")
+    
+        # Action buttons
+        col1, col2 = st.columns(2)
         with col1:
-            st.markdown(f"**Last updated by:** {current_product['updatedBy']}  \n**Date:** {current_product['lastUpdated']}")
+            if st.button("View Single Product Details", use_container_width=True):
+                st.session_state.view_mode = "single"
+                st.rerun()
+    
         with col2:
-            st.markdown("🟢 **Status:** Single Source of Truth | Version Control Enabled")
+            # Exports are streamed to a temp file only when requested, never on plain reruns
+            export_format = st.selectbox(
+                "Export format",
+                options=list(EXPORT_FORMATS),
+                format_func=lambda fmt: EXPORT_FORMATS[fmt]["label"],
+                key="export_format"
+            )
+            if st.button("📦 Prepare Export", use_container_width=True):
+                with st.spinner("Generating export..."):
+                    st.session_state.export_file = prepare_export(export_format)
         
-        # Back to portfolio button
-        if st.button("⬅️ Back to Portfolio View", use_container_width=True):
-            st.session_state.view_mode = "portfolio"
-            st.rerun()
+            export_file = st.session_state.get("export_file")
+            if (export_file and export_file.format == export_format
+                    and export_file.fingerprint == PORTFOLIO_FINGERPRINT
+                    and os.path.exists(export_file.path)):
+                spec = EXPORT_FORMATS[export_format]
+                with open(export_file.path, "rb") as handle:
+                    st.download_button(
+                        label=f"📥 Download {spec['label']}",
+                        data=handle,
+                        file_name=f"portfolio.{spec['extension']}",
+                        mime=spec["mime"],
+                        on_click=discard_export,
+                        use_container_width=True
+                    )
+
+    # SINGLE PRODUCT VIEW
+    else:
+        single_product_view()
+
+    # Profiling panel for the run that just finished
+    if PROFILER.enabled:
+        PROFILER.end_run()
+        render_profiling_panel(PROFILER)
+finally:
+    # A run cut short by st.rerun(), st.stop() or an error is still closed and kept in the history
+    PROFILER.end_run()
@@ -0,0 +1,62 @@
+"""
+Batch valuation scaling benchmark for Sandoz Pipeline Application
+
+Values a synthetic portfolio under random assumption variants with an
+increasing number of worker processes and reports throughput, speed-up and
+parallel efficiency against one worker, for sizing the batch host.
+
+Run from the streamlit_app directory:
+
+    python -m benchmarks.batch_scaling
+    python -m benchmarks.batch_scaling --products 5000 --variants 20000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+
+def scaling_workers(limit):
+    """1, 2, 4, ... up to and including limit"""
+    counts = [1]
+    while counts[-1] * 2 < limit:
+        counts.append(counts[-1] * 2)
+    return counts + ([limit] if limit > 1 else [])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--variants", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=scaling_workers(os.cpu_count() or 1))
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    from benchmarks.synthetic import synthetic_portfolio
+    from sandoz_pipeline.batch import value_variants
+    from sandoz_pipeline.store import ProductStore
+
+    arrays = ProductStore(synthetic_portfolio(args.products, seed=args.seed)).arrays
+    rng = np.random.default_rng(args.seed)
+    variants = {
+        "uptake": rng.uniform(0.8, 1.2, args.variants),
+        "gtn": rng.uniform(0.9, 1.1, args.variants),
+        "access": rng.uniform(0.9, 1.1, args.variants),
+    }
+
+    print(f"{args.variants:,} variants x {args.products:,} products on {os.cpu_count()} cores")
+    print(f"{'workers':>7}  {'seconds':>8}  {'variants/s':>11}  {'valuations/s':>13}  {'speed-up':>8}  {'efficiency':>10}")
+    single = None
+    for workers in args.workers:
+        result = value_variants(arrays, variants, workers=workers)
+        if single is None and result["workers"] == 1:
+            single = result["elapsed"]
+        speedup = single / result["elapsed"] if single else float("nan")
+        print(f"{result['workers']:>7}  {result['elapsed']:>8.2f}  {result['variants_per_second']:>11,.1f}  "
+              f"{result['valuations_per_second']:>13,.0f}  {speedup:>7.2f}x  {speedup / result['workers']:>9.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,48 @@
+"""
+Uptake diffusion fit benchmark for Sandoz Pipeline Application
+
+Fits each diffusion model to the uptake of synthetic portfolios in one
+batched solve and reports run time, solver iterations, convergence and fit
+error, then the cost of a single-product uptake edit, which refits only that
+product.
+
+Run from the streamlit_app directory:
+
+    python -m benchmarks.diffusion
+    python -m benchmarks.diffusion --products 1000 10000 50000 --models bass
+"""
+
+import argparse
+import time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--models", nargs="+", choices=("bass", "logistic"), default=["bass", "logistic"])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    import numpy as np
+    from benchmarks.synthetic import synthetic_portfolio
+    from sandoz_pipeline.store import ProductStore
+
+    print(f"{'model':>8}  {'products':>8}  {'fit ms':>9}  {'iters':>5}  {'converged':>9}  "
+          f"{'rmse p50':>8}  {'rmse p95':>8}  {'edit ms':>8}")
+    for n_products in args.products:
+        store = ProductStore(synthetic_portfolio(n_products, seed=args.seed))
+        for model in args.models:
+            fit = store.uptake_fit(model)
+            product = store.products[0]
+            uptake = dict(product["assumptions"]["uptake"], y5=product["assumptions"]["uptake"]["y5"] + 1)
+            start = time.perf_counter()
+            store.update_product(product["id"], {"assumptions": {"uptake": uptake}})
+            edit = time.perf_counter() - start
+            p50, p95 = np.percentile(fit["rmse"], [50, 95])
+            print(f"{model:>8}  {n_products:>8}  {fit['elapsed'] * 1000:>9.1f}  {fit['iterations']:>5}  "
+                  f"{fit['converged'].mean():>9.2%}  {p50:>8.2f}  {p95:>8.2f}  {edit * 1000:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""
+Import-time benchmark for the headless core
+
+Imports every sandoz_pipeline module in a fresh interpreter under
+``python -X importtime``, reports the total and the slowest top-level
+dependencies, and fails if the core pulled in the UI stack.
+
+Run from the streamlit_app directory:
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --max-ms 800
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+CORE_MODULES = (
+    "aggregation", "batch", "cli", "config", "dependencies", "diffusion", "export", "fx", "ingest",
+    "launch_calendar", "loaders", "model", "optimizer", "phases", "profiling", "sensitivity",
+    "simulation", "store", "validation", "valuation", "versioning",
+)
+FORBIDDEN = ("streamlit", "plotly")
+
+
+def measure(modules=CORE_MODULES):
+    """Cumulative import time in microseconds per top-level package, and the modules loaded"""
+    imports = ", ".join(f"sandoz_pipeline.{name}" for name in modules)
+    script = f"import sys, {imports}; print('\\n'.join(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=APP_DIR, capture_output=True, text=True, check=True,
+    )
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Top-level imports are indented by exactly one space
+        if not cumulative.strip().isdigit() or name[1:2] == " ":
+            continue
+        packages[name.strip()] = packages.get(name.strip(), 0) + int(cumulative)
+    return packages, result.stdout.split()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-ms", type=float, help="fail if the total import time exceeds this budget")
+    parser.add_argument("--top", type=int, default=8, help="slowest top-level imports to list")
+    args = parser.parse_args(argv)
+
+    packages, loaded = measure()
+    total_ms = sum(packages.values()) / 1000
+    for name, micros in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{micros / 1000:9.1f} ms  {name}")
+    print(f"{total_ms:9.1f} ms  total")
+
+    status = 0
+    leaked = sorted({m.split(".")[0] for m in loaded if m.split(".")[0] in FORBIDDEN})
+    if leaked:
+        print(f"Core imports the UI stack: {', '.join(leaked)}", file=sys.stderr)
+        status = 1
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"Import time {total_ms:.1f} ms exceeds the {args.max_ms:.1f} ms budget", file=sys.stderr)
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
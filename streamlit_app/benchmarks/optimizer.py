@@ -0,0 +1,50 @@
+"""
+Portfolio optimizer benchmark for Sandoz Pipeline Application
+
+Runs the exact branch-and-bound solver and the greedy heuristic on
+synthetic portfolios, reporting run time, nodes explored and the
+heuristic's gap to the optimum where the exact solver is feasible, then
+the heuristic alone on large candidate sets.
+
+Run from the streamlit_app directory:
+
+    python -m benchmarks.optimizer
+    python -m benchmarks.optimizer --exact 10 20 30 --heuristic 1000 10000 50000
+"""
+
+import argparse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--exact", type=int, nargs="+", default=[10, 16, 24])
+    parser.add_argument("--heuristic", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--budget-share", type=float, default=0.3,
+                        help="budget as a share of the total launch cost")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    from benchmarks.synthetic import synthetic_portfolio
+    from sandoz_pipeline.optimizer import launch_candidates, optimize_portfolio
+    from sandoz_pipeline.store import ProductStore
+
+    def run(n_products, method):
+        candidates = launch_candidates(ProductStore(synthetic_portfolio(n_products, seed=args.seed)))
+        budget = candidates["costs"].sum() * args.budget_share
+        capacity = max(1, n_products // 40)
+        return optimize_portfolio(candidates, budget, capacity, method=method)
+
+    print(f"{'products':>8}  {'exact ms':>9}  {'nodes':>9}  {'optimal':>7}  {'greedy ms':>9}  {'gap':>6}")
+    for n_products in args.exact:
+        exact, heuristic = run(n_products, "branch_and_bound"), run(n_products, "greedy")
+        gap = 1 - heuristic["value"] / exact["value"] if exact["value"] else 0.0
+        print(f"{n_products:>8}  {exact['elapsed'] * 1000:>9.1f}  {exact['nodes']:>9,}  {str(exact['optimal']):>7}  "
+              f"{heuristic['elapsed'] * 1000:>9.1f}  {gap:>6.2%}")
+    for n_products in args.heuristic:
+        heuristic = run(n_products, "greedy")
+        print(f"{n_products:>8}  {'-':>9}  {'-':>9}  {'-':>7}  {heuristic['elapsed'] * 1000:>9.1f}  {'-':>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+"""
+Rendering benchmarks for Sandoz Pipeline Application
+
+Drives app.py headlessly through Streamlit's AppTest for each view mode and
+synthetic portfolio size, records run time, element count, payload bytes and
+peak memory, and compares the results with a JSON baseline.
+
+Run from the streamlit_app directory:
+
+    python -m benchmarks.run_benchmarks                    # compare with baseline
+    python -m benchmarks.run_benchmarks --update-baseline  # record a new baseline
+
+The baseline (benchmarks/baseline.json) is committed. Comparing without one
+is an error, a case missing from it fails the comparison, and updating
+merges the measured cases into it, keeping the others.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+APP_PATH = APP_DIR / "app.py"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+SIZES = (4, 100, 1000, 10000)
+VIEWS = ("portfolio", "single")
+
+# Allowed growth over baseline before a metric counts as a regression
+TOLERANCES = {
+    "warm_run_s": 1.25,
+    "cold_run_s": 1.25,
+    "elements": 1.10,
+    "payload_bytes": 1.10,
+    "peak_memory_mb": 1.20,
+}
+
+
+def count_elements(node):
+    """Number of elements and blocks below a node in the AppTest tree"""
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return 1 + sum(count_elements(child) for child in children.values())
+
+
+def payload_bytes(node):
+    """Serialized protobuf size of every element below a node"""
+    proto = getattr(node, "proto", None)
+    size = proto.ByteSize() if proto is not None else 0
+    children = getattr(node, "children", None) or {}
+    return size + sum(payload_bytes(child) for child in children.values())
+
+
+def run_case(view, repeats):
+    """Run app.py in this process for one view and return its metrics"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=600)
+    at.session_state.view_mode = view
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    at.run()
+    cold = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if at.exception:
+        raise RuntimeError(f"app.py raised during the {view} run: {at.exception[0].value}")
+
+    warm = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        at.run()
+        warm.append(time.perf_counter() - start)
+
+    return {
+        "cold_run_s": round(cold, 4),
+        "warm_run_s": round(statistics.median(warm), 4) if warm else round(cold, 4),
+        "elements": count_elements(at._tree),
+        "payload_bytes": payload_bytes(at._tree),
+        "peak_memory_mb": round(peak / 2 ** 20, 2),
+    }
+
+
+def spawn_case(size, view, repeats, workdir):
+    """Benchmark one case in a fresh interpreter pointed at a synthetic data file"""
+    from benchmarks.synthetic import synthetic_portfolio
+    from sandoz_pipeline.loaders import save_dataset
+
+    source = Path(workdir) / f"products_{size}.parquet"
+    if not source.exists():
+        save_dataset(synthetic_portfolio(size), str(source), "products")
+
+    env = dict(os.environ, SANDOZ_PRODUCTS_SOURCE=str(source))
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run_benchmarks", "--worker",
+         "--view", view, "--repeats", str(repeats)],
+        cwd=APP_DIR, env=env, capture_output=True, text=True, check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark {view}/{size} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline):
+    """List metrics that grew beyond tolerance relative to the baseline, and cases it lacks"""
+    regressions = []
+    for case, metrics in results.items():
+        reference = baseline.get(case)
+        if not reference:
+            regressions.append(f"{case}: not in the baseline (record it with --update-baseline)")
+            continue
+        for metric, limit in TOLERANCES.items():
+            old, new = reference.get(metric), metrics.get(metric)
+            if old and new and new > old * limit:
+                regressions.append(f"{case} {metric}: {old} -> {new} ({new / old:.2f}x, limit {limit:.2f}x)")
+    return regressions
+
+
+def case_order(item):
+    """Sort key for baseline cases: view, then portfolio size"""
+    view, size = item[0].split("/")
+    return view, int(size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--views", nargs="+", choices=VIEWS, default=list(VIEWS))
+    parser.add_argument("--repeats", type=int, default=3, help="warm reruns per case")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--view", choices=VIEWS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_case(args.view, args.repeats)))
+        return 0
+    if not args.update_baseline and not args.baseline.exists():
+        parser.error(f"no baseline at {args.baseline}; record one with --update-baseline")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            for view in args.views:
+                case = f"{view}/{size}"
+                results[case] = spawn_case(size, view, args.repeats, workdir)
+                print(f"{case:>16}  " + "  ".join(f"{k}={v}" for k, v in results[case].items()))
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(dict(sorted(baseline.items(), key=case_order)), indent=2) + "\n")
+        print(f"Baseline updated with {len(results)} cases in {args.baseline}")
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text()))
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print("No regressions against baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Synthetic portfolio generator for Sandoz Pipeline benchmarks
+"""
+
+import numpy as np
+from sandoz_pipeline.config import ARCHETYPES, PHASE_COLORS, PRIORITY_COLORS, PIPELINE_PRODUCTS
+
+TERRITORIES = ["US", "EU", "UK", "JP", "CA", "AU", "BR", "CN"]
+
+
+def synthetic_portfolio(n_products, seed=0):
+    """Build n_products plausible product records, seeded for repeatability"""
+    rng = np.random.default_rng(seed)
+    archetypes = [a["name"] for a in ARCHETYPES]
+    phases = list(PHASE_COLORS)
+    priorities = list(PRIORITY_COLORS)
+
+    peak = rng.uniform(5, 60, n_products)
+    # Monotone ramps: cumulative random increments scaled to reach peak share in Y5
+    steps = rng.uniform(0.5, 1.5, (n_products, 5)).cumsum(axis=1)
+    uptake = np.round(steps / steps[:, -1:] * peak[:, None], 1)
+    wac = np.round(rng.lognormal(6.0, 1.5, n_products), 2)
+    asp = np.round(wac * rng.uniform(0.85, 0.95, n_products), 2)
+    gtn = np.round(rng.uniform(20, 70, n_products), 1)
+    tier1 = rng.integers(30, 90, n_products)
+    tier2 = (rng.uniform(0.4, 0.9, n_products) * (100 - tier1)).astype(int)
+    years = rng.integers(2026, 2031, n_products)
+    quarters = rng.integers(1, 5, n_products)
+    npv = np.round(rng.lognormal(4.8, 0.8, n_products), 1)
+
+    products = []
+    for i in range(n_products):
+        template = PIPELINE_PRODUCTS[i % len(PIPELINE_PRODUCTS)]
+        products.append({
+            "id": f"SYN-{i + 1:06d}",
+            "name": f"{template['name']} #{i + 1}",
+            "archetype": archetypes[rng.integers(len(archetypes))],
+            "phase": phases[rng.integers(len(phases))],
+            "launchDate": f"{years[i]}-Q{quarters[i]}",
+            "territory": TERRITORIES[rng.integers(len(TERRITORIES))],
+            "priority": priorities[rng.integers(len(priorities))],
+            "npv": float(npv[i]),
+            "assumptions": {
+                "uptake": {f"y{y + 1}": float(uptake[i, y]) for y in range(5)},
+                "peakShare": float(uptake[i, -1]),
+                "pricing": {"wac": float(wac[i]), "asp": float(asp[i]), "gtn": float(gtn[i])},
+                "access": {
+                    "tier1": int(tier1[i]),
+                    "tier2": int(tier2[i]),
+                    "tier3": int(100 - tier1[i] - tier2[i])
+                },
+                "competition": template["assumptions"]["competition"],
+                "jcode": template["assumptions"]["jcode"],
+                "distribution": template["assumptions"]["distribution"]
+            },
+            "lastUpdated": template["lastUpdated"],
+            "updatedBy": template["updatedBy"]
+        })
+    return products
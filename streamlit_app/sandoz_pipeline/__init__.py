@@ -0,0 +1,63 @@
+"""
+Headless core of the Sandoz Pipeline Application
+
+Valuation, aggregation, versioning and export logic with no Streamlit or
+Plotly dependency, usable from the dashboard, batch jobs and notebooks:
+
+    from sandoz_pipeline import ProductStore, load_dataset
+    store = ProductStore(load_dataset("products", "portfolio.parquet"))
+
+Public names are resolved lazily, so ``import sandoz_pipeline`` costs only
+the modules a caller actually touches. Batch entry point:
+
+    python -m sandoz_pipeline recompute --input portfolio.parquet --out results.parquet
+"""
+
+import importlib
+
+# Public name -> defining submodule
+_EXPORTS = {
+    "ProductStore": "store",
+    "PortfolioAggregates": "aggregation",
+    "aggregate_portfolio": "aggregation",
+    "VersionLog": "versioning",
+    "LaunchCalendar": "launch_calendar",
+    "RateTable": "fx",
+    "load_rate_table": "fx",
+    "build_assumption_arrays": "valuation",
+    "value_arrays": "valuation",
+    "value_portfolio": "valuation",
+    "value_variants": "batch",
+    "ingest_products": "ingest",
+    "launch_candidates": "optimizer",
+    "optimize_portfolio": "optimizer",
+    "Phase": "phases",
+    "risk_adjust": "phases",
+    "fit_uptake": "diffusion",
+    "monthly_uptake": "diffusion",
+    "validate_products": "validation",
+    "ValidationReport": "validation",
+    "simulate_portfolio": "simulation",
+    "run_sensitivity": "sensitivity",
+    "load_dataset": "loaders",
+    "load_portfolio_data": "loaders",
+    "save_dataset": "loaders",
+    "write_export": "export",
+    "export_to_file": "export",
+    "EXPORT_FORMATS": "export",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,126 @@
+"""
+Portfolio aggregation engine for Sandoz Pipeline Application
+
+KPIs are summed once per (archetype, phase, priority, territory) cell in a
+single grouped pass over the product columns; totals and per-dimension
+breakdowns are rolled up from that small cell table on demand. Money
+columns are converted to the reporting currency before grouping.
+
+The cell sums are a GroupedSum, so an edit moves only the edited rows
+between cells and every portfolio KPI reads from this one object.
+"""
+
+import numpy as np
+import pandas as pd
+from .config import VALUATION_CONFIG
+from .dependencies import GroupedSum
+from .launch_calendar import parse_quarters, quarter_number
+from .phases import risk_adjust
+
+GROUP_COLUMNS = ("archetype", "phase", "priority", "territory")
+HIGH_PRIORITIES = ("High", "Strategic")
+
+# Per-product columns summed into each cell, alongside the product count
+KPI_COLUMNS = ("npv", "rnpv", "five_year_revenue", "peak_revenue", "high_priority", "launches_this_year")
+COUNT_COLUMNS = ("count", "high_priority", "launches_this_year")
+
+
+def cell_keys(frame):
+    """(archetype, phase, priority, territory) cell of every row"""
+    return pd.MultiIndex.from_arrays([frame[col].to_numpy(object) for col in GROUP_COLUMNS]).to_numpy()
+
+
+def kpi_columns(frame, valuation, fx_rate, launch_years, reference_year, rnpv):
+    """Per-product KPI columns (money in the reporting currency) for rows of a store frame"""
+    return {
+        "npv": frame["npv"].to_numpy(float) * fx_rate,
+        "rnpv": np.asarray(rnpv, dtype=float) * fx_rate,
+        "five_year_revenue": valuation["five_year_revenue"].to_numpy(float) * fx_rate,
+        "peak_revenue": valuation["peak_revenue"].to_numpy(float) * fx_rate,
+        "high_priority": frame["priority"].isin(HIGH_PRIORITIES).to_numpy(float),
+        "launches_this_year": (np.asarray(launch_years) == reference_year).astype(float),
+    }
+
+
+class PortfolioAggregates:
+    """Grouped portfolio KPIs with totals and per-dimension rollups, updated in place by edits"""
+
+    def __init__(self, keys, columns, reference_year):
+        self.sums = GroupedSum(keys, columns)
+        self.reference_year = reference_year
+        self._cells = None
+        self._rollups = {}
+
+    def update(self, positions, keys, columns):
+        """Move the given rows to their new cells and KPI values in O(len(positions))"""
+        self.sums.update(positions, keys, columns)
+        self._cells = None
+        self._rollups = {}
+
+    @property
+    def cells(self):
+        """One row per non-empty cell: the group columns, product count and KPI sums"""
+        if self._cells is None:
+            groups = {key: row for key, row in self.sums.groups.items() if row["count"] > 0}
+            cells = pd.DataFrame(list(groups.values()), columns=["count", *KPI_COLUMNS])
+            for i, col in enumerate(GROUP_COLUMNS):
+                cells.insert(i, col, pd.Series([key[i] for key in groups], dtype=object))
+            self._cells = cells.astype({name: np.int64 for name in COUNT_COLUMNS})
+        return self._cells
+
+    def totals(self):
+        """Portfolio-wide KPIs"""
+        npv = self.sums.values["npv"]
+        if self.cells.empty:
+            return {"count": 0, "npv": 0.0, "npv_min": 0.0, "npv_max": 0.0, "npv_mean": 0.0, "rnpv": 0.0,
+                    "five_year_revenue": 0.0, "peak_revenue": 0.0, "high_priority": 0,
+                    "launches_this_year": 0}
+        totals = self.cells[["count", *KPI_COLUMNS]].sum().to_dict()
+        for name in COUNT_COLUMNS:
+            totals[name] = int(totals[name])
+        for name in KPI_COLUMNS:
+            if name not in COUNT_COLUMNS:
+                totals[name] = float(totals[name])
+        totals["npv_min"], totals["npv_max"] = float(npv.min()), float(npv.max())
+        totals["npv_mean"] = totals["npv"] / totals["count"]
+        return totals
+
+    def by(self, column):
+        """KPIs per value of one group column, with each group's share of products and NPV"""
+        if column not in GROUP_COLUMNS:
+            raise ValueError(f"Cannot group by {column}; expected one of {', '.join(GROUP_COLUMNS)}")
+        if column not in self._rollups:
+            rollup = self.cells.groupby(column, sort=False)[["count", *KPI_COLUMNS]].sum()
+            rollup["npv_mean"] = rollup["npv"] / rollup["count"]
+            total_count = rollup["count"].sum()
+            total_npv = rollup["npv"].sum()
+            rollup["percentage"] = rollup["count"] / total_count * 100 if total_count else 0.0
+            rollup["npv_share"] = rollup["npv"] / total_npv * 100 if total_npv else 0.0
+            rollup.index = rollup.index.astype(object)
+            self._rollups[column] = rollup
+        return self._rollups[column]
+
+    def counts(self, column, keys=()):
+        """Product count per group value, listing the given keys first (zero if absent)"""
+        counts = {key: 0 for key in keys}
+        counts.update(self.by(column)["count"].astype(int).to_dict())
+        return counts
+
+
+def aggregate_portfolio(frame, valuation, fx_rate=1.0, launch_years=None, reference_year=None,
+                        config=VALUATION_CONFIG, rnpv=None):
+    """Aggregate a store frame and its valuation into PortfolioAggregates in one grouped pass
+
+    ``fx_rate`` converts each product's local currency into the reporting
+    currency; ``launch_years`` reuses already-parsed launch years and
+    ``rnpv`` already risk-adjusted NPVs (local currency).
+    """
+    if reference_year is None:
+        reference_year = quarter_number(config["valuation_date"]) // 4
+    if launch_years is None:
+        launch_years = parse_quarters(frame["launchDate"].to_numpy()) // 4
+    if rnpv is None:
+        rnpv = risk_adjust(frame["npv"].to_numpy(float), frame["phase"],
+                           parse_quarters(frame["launchDate"].to_numpy()), config["discount_rate"], config)["rnpv"]
+    columns = kpi_columns(frame, valuation, fx_rate, launch_years, reference_year, rnpv)
+    return PortfolioAggregates(cell_keys(frame), columns, reference_year)
@@ -0,0 +1,192 @@
+"""
+Multi-process batch valuation for Sandoz Pipeline Application
+
+Revalues the portfolio under many assumption variants. A variant is a set
+of multipliers on valuation drivers, either one per variant (applied to
+every product) or one per variant and product. The base assumption
+arrays, the variant multipliers and the result arrays are placed in shared
+memory once; worker processes attach to them when the pool starts, so a
+task is just a (start, stop) range of variants and nothing else is pickled.
+Each task values its variants in blocks of about ``block_rows`` product
+rows per engine call and writes NPVs straight into the shared results.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from .config import BATCH_CONFIG, VALUATION_CONFIG
+from .sensitivity import DRIVERS, VALUATION_INPUTS
+from .valuation import value_arrays
+
+# Driver key -> (input array, column within that array or None for the whole array)
+VARIANT_DRIVERS = {
+    **{key: (name, column) for key, name, column in DRIVERS},
+    "uptake": ("uptake", None),
+    "access": ("access", None),
+    "market_units": ("market_units", None),
+    "discount_rate": ("discount_rate", None),
+    "operating_margin": ("operating_margin", None),
+}
+
+# Worker-process state, set once by the pool initializer
+_worker = {}
+
+
+class SharedArrays:
+    """NumPy arrays backed by named shared-memory blocks owned by this process"""
+
+    def __init__(self, arrays):
+        self.blocks = {}
+        self.arrays = {}
+        try:
+            for name, values in arrays.items():
+                values = np.ascontiguousarray(values)
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                self.blocks[name] = block
+                self.arrays[name] = np.ndarray(values.shape, values.dtype, buffer=block.buf)
+                self.arrays[name][...] = values
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def layout(self):
+        """Picklable (block name, shape, dtype) per array, for attach()"""
+        return {
+            name: (self.blocks[name].name, values.shape, values.dtype.str)
+            for name, values in self.arrays.items()
+        }
+
+    def close(self):
+        """Release and unlink every block"""
+        self.arrays = {}
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach(layout):
+    """Open shared blocks described by SharedArrays.layout, returns (blocks, arrays)"""
+    blocks, arrays = {}, {}
+    for name, (block_name, shape, dtype) in layout.items():
+        blocks[name] = shared_memory.SharedMemory(name=block_name)
+        arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=blocks[name].buf)
+    return blocks, arrays
+
+
+def variant_arrays(variants, n_products):
+    """Validate variant multipliers into float arrays shaped (variants,) or (variants, products)"""
+    if not variants:
+        raise ValueError("No variant drivers given")
+    unknown = sorted(set(variants) - set(VARIANT_DRIVERS))
+    if unknown:
+        raise ValueError(f"Unknown variant drivers: {', '.join(unknown)}")
+    columns = {key: np.asarray(values, dtype=float) for key, values in variants.items()}
+    counts = {values.shape[0] if values.ndim else 0 for values in columns.values()}
+    if len(counts) != 1:
+        raise ValueError("Every variant driver needs the same number of variants")
+    for key, values in columns.items():
+        if values.ndim not in (1, 2) or (values.ndim == 2 and values.shape[1] != n_products):
+            raise ValueError(f"Variant driver {key} must be shaped (variants,) or (variants, {n_products})")
+    return columns
+
+
+def _value_range(inputs, variants, results, start, stop, block_rows, config):
+    """Value variants [start, stop) in blocks, writing NPVs into the result arrays"""
+    n_products = len(inputs["market_units"])
+    block = max(1, block_rows // max(n_products, 1))
+    for lo in range(start, stop, block):
+        hi = min(lo + block, stop)
+        n = hi - lo
+        stacked = {key: np.tile(inputs[key], (n,) + (1,) * (inputs[key].ndim - 1)) for key in VALUATION_INPUTS}
+        for key, multipliers in variants.items():
+            name, column = VARIANT_DRIVERS[key]
+            view = stacked[name].reshape((n, n_products) + stacked[name].shape[1:])
+            factor = multipliers[lo:hi].reshape(n, -1)
+            if column is not None:
+                view[:, :, column] *= factor
+            else:
+                view *= factor.reshape(factor.shape + (1,) * (view.ndim - 2))
+        npv = value_arrays(stacked, config)["npv"].reshape(n, n_products)
+        results["portfolio_npv"][lo:hi] = npv @ inputs["fx_rate"]
+        if "npv" in results:
+            results["npv"][lo:hi] = npv
+    return stop - start
+
+
+def _init_worker(layout, block_rows, config):
+    blocks, arrays = attach(layout)
+    _worker.update(blocks=blocks, arrays=arrays, block_rows=block_rows, config=config)
+
+
+def _split(arrays):
+    """Shared arrays grouped by their input. / variant. / result. prefix"""
+    groups = {"input": {}, "variant": {}, "result": {}}
+    for key, values in arrays.items():
+        prefix, _, name = key.partition(".")
+        groups[prefix][name] = values
+    return groups["input"], groups["variant"], groups["result"]
+
+
+def _run_task(start, stop):
+    inputs, variants, results = _split(_worker["arrays"])
+    return _value_range(inputs, variants, results, start, stop, _worker["block_rows"], _worker["config"])
+
+
+def value_variants(arrays, variants, workers=None, keep_products=False,
+                   config=VALUATION_CONFIG, batch_config=BATCH_CONFIG):
+    """Revalue the portfolio under every variant across a process pool
+
+    ``arrays`` are stacked assumption arrays (e.g. ``ProductStore.arrays``)
+    and ``variants`` maps VARIANT_DRIVERS keys to multipliers. Returns
+    portfolio NPV per variant in the reporting currency, per-product NPVs
+    shaped (variants, products) when ``keep_products`` is set, and the
+    elapsed time with throughput in variants and product valuations per
+    second.
+    """
+    n_products = len(arrays["market_units"])
+    columns = variant_arrays(variants, n_products)
+    n_variants = next(iter(columns.values())).shape[0]
+    workers = max(1, min(workers or batch_config["workers"] or os.cpu_count() or 1, n_variants or 1))
+    block_rows = batch_config["block_rows"]
+
+    shared = {f"input.{key}": np.asarray(arrays[key], dtype=float) for key in (*VALUATION_INPUTS, "fx_rate")}
+    shared.update({f"variant.{key}": values for key, values in columns.items()})
+    shared["result.portfolio_npv"] = np.zeros(n_variants)
+    if keep_products:
+        shared["result.npv"] = np.zeros((n_variants, n_products))
+
+    start_time = time.perf_counter()
+    with SharedArrays(shared) as memory:
+        if workers == 1:
+            _value_range(*_split(memory.arrays), 0, n_variants, block_rows, config)
+        else:
+            n_tasks = min(n_variants, workers * batch_config["tasks_per_worker"])
+            bounds = np.linspace(0, n_variants, n_tasks + 1).astype(int)
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(memory.layout, block_rows, config)) as pool:
+                done = sum(pool.map(_run_task, bounds[:-1], bounds[1:]))
+            if done != n_variants:
+                raise RuntimeError(f"Batch valued {done} of {n_variants} variants")
+        output = {key: values.copy() for key, values in _split(memory.arrays)[2].items()}
+    elapsed = time.perf_counter() - start_time
+
+    output.update({
+        "ids": arrays["id"],
+        "variants": n_variants,
+        "workers": workers,
+        "elapsed": elapsed,
+        "variants_per_second": n_variants / elapsed if elapsed else float("inf"),
+        "valuations_per_second": n_variants * n_products / elapsed if elapsed else float("inf"),
+    })
+    return output
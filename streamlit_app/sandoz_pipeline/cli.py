@@ -0,0 +1,222 @@
+"""
+Batch command line for Sandoz Pipeline Application
+
+    python -m sandoz_pipeline recompute --input portfolio.parquet --out results.parquet
+    python -m sandoz_pipeline summary --input portfolio.parquet --by phase
+    python -m sandoz_pipeline batch --input portfolio.parquet --variants variants.csv --out npv.csv
+    python -m sandoz_pipeline validate --input assumptions.csv --report violations.csv
+    python -m sandoz_pipeline optimize --input portfolio.parquet --budget 500 --capacity 3 --out selection.csv
+    python -m sandoz_pipeline uptake --input portfolio.parquet --model bass --out fits.csv --curves monthly.csv
+
+Inputs are product datasets in any format the loaders read (CSV, Parquet,
+SQLite); the output format follows the --out suffix unless --format is
+given. Heavy modules are imported inside each command so --help stays fast.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Mirrors export.EXPORT_FORMATS; kept here so parsing arguments imports nothing
+OUTPUT_FORMATS = ("csv", "parquet", "arrow", "xlsx")
+SUMMARY_DIMENSIONS = ("archetype", "phase", "priority", "territory")
+
+
+def output_format(path, fmt=None):
+    """Export format from an explicit choice or the output file suffix"""
+    if fmt:
+        return fmt
+    suffix = os.path.splitext(str(path))[1].lower().lstrip(".")
+    fmt = {"pq": "parquet", "feather": "arrow", "ipc": "arrow"}.get(suffix, suffix)
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Cannot infer export format from {path}; pass --format")
+    return fmt
+
+
+def load_store(path):
+    """ProductStore over a products file, or the configured source when path is None"""
+    from .loaders import load_dataset
+    from .store import ProductStore
+
+    return ProductStore(load_dataset("products", path))
+
+
+def recompute(args):
+    """Revalue every product and stream the valuation export to a file"""
+    from .export import export_to_file
+
+    fmt = output_format(args.out, args.format)
+    start = time.perf_counter()
+    store = load_store(args.input)
+    export_to_file(store, fmt, args.out, chunk_size=args.chunk_size)
+    totals = store.portfolio_totals()
+    elapsed = time.perf_counter() - start
+    print(f"Recomputed {totals['total_products']} products in {elapsed:.2f}s "
+          f"(total NPV {totals['total_npv']:,.1f}M) -> {args.out}")
+    return 0
+
+
+def summary(args):
+    """Print portfolio totals, optionally broken down by one dimension"""
+    store = load_store(args.input)
+    aggregates = store.aggregates()
+    for name, value in aggregates.totals().items():
+        print(f"{name}: {value:,.1f}" if isinstance(value, float) else f"{name}: {value}")
+    if args.by:
+        print()
+        print(aggregates.by(args.by)[["count", "npv", "rnpv", "npv_share"]].round(1).to_string())
+    return 0
+
+
+def batch(args):
+    """Revalue the portfolio under every row of a variants file across worker processes"""
+    from .batch import VARIANT_DRIVERS, value_variants
+    from .config import REPORTING_CURRENCY
+    from .loaders import read_table
+
+    fmt = output_format(args.out, args.format)
+    if fmt not in ("csv", "parquet"):
+        raise ValueError("Batch results are written as csv or parquet")
+    frame = read_table(args.variants, "variants")
+    drivers = [col for col in frame.columns if col in VARIANT_DRIVERS]
+    store = load_store(args.input)
+    result = value_variants(store.arrays, {col: frame[col].to_numpy(float) for col in drivers},
+                            workers=args.workers)
+    output = frame.assign(**{f"Portfolio NPV ({REPORTING_CURRENCY}M)": result["portfolio_npv"]})
+    if fmt == "csv":
+        output.to_csv(args.out, index=False)
+    else:
+        output.to_parquet(args.out, index=False)
+    print(f"Valued {result['variants']:,} variants x {len(store):,} products on {result['workers']} "
+          f"workers in {result['elapsed']:.2f}s: {result['variants_per_second']:,.1f} variants/s, "
+          f"{result['valuations_per_second']:,.0f} product valuations/s -> {args.out}")
+    return 0
+
+
+def validate(args):
+    """Check a products file without loading it, exit code 1 when any row is invalid"""
+    from .loaders import read_table
+    from .validation import validate_products
+
+    start = time.perf_counter()
+    report = validate_products(read_table(args.input, "products"))
+    elapsed = time.perf_counter() - start
+    print(f"Validated {report.n_rows:,} rows in {elapsed:.2f}s: {len(report):,} violations "
+          f"in {len(report.invalid_rows):,} rows")
+    if not report.ok:
+        print()
+        print(report.summary().to_string(index=False))
+        for line in report.messages(limit=args.show):
+            print(line)
+    if args.report:
+        report.violations.to_csv(args.report, index=False)
+    return 0 if report.ok else 1
+
+
+def optimize(args):
+    """Select products and launch quarters under a launch budget and per-quarter capacity"""
+    from .config import REPORTING_CURRENCY
+    from .optimizer import launch_candidates, optimize_portfolio, priority_ranking, selection_frame, summarize
+
+    store = load_store(args.input)
+    candidates = launch_candidates(store, args.max_delay)
+    result = optimize_portfolio(candidates, args.budget, args.capacity, method=args.method)
+    baseline = summarize(candidates, priority_ranking(candidates, result["budget"], result["capacity"]))
+    proof = "optimal" if result["optimal"] else "heuristic"
+    print(f"Selected {result['selected']:,} of {len(store):,} products with {result['method']} ({proof}, "
+          f"{result['nodes']:,} nodes) in {result['elapsed'] * 1000:,.1f} ms")
+    print(f"Risk-adjusted NPV {result['value']:,.1f}M {REPORTING_CURRENCY} for {result['cost']:,.1f}M launch cost "
+          f"(priority ranking: {baseline['value']:,.1f}M from {baseline['selected']:,} products)")
+    selection = selection_frame(store, candidates, result["delay"])
+    if args.out:
+        selection.to_csv(args.out, index=False)
+    else:
+        print()
+        print(selection.head(20).round(1).to_string(index=False))
+    return 0
+
+
+def uptake(args):
+    """Fit diffusion curves to every product's uptake Y1-Y5 and write parameters and monthly curves"""
+    import pandas as pd
+    from .diffusion import fit_frame, monthly_uptake
+
+    store = load_store(args.input)
+    fit = store.uptake_fit(args.model)
+    frame = fit_frame(store.frame["id"].to_numpy(), fit, args.years)
+    print(f"Fitted {fit['model']} curves to {len(store):,} products in {fit['elapsed'] * 1000:,.1f} ms "
+          f"({fit['iterations']} iterations, {int(frame['converged'].sum()):,} converged, "
+          f"median RMSE {frame['rmse'].median():.2f} pts)")
+    if args.out:
+        frame.to_csv(args.out, index=False)
+    else:
+        print()
+        print(frame.head(20).round(3).to_string(index=False))
+    if args.curves:
+        times, shares = monthly_uptake(fit, years=args.years)
+        curves = pd.DataFrame(shares, columns=[f"M{month}" for month in range(1, len(times) + 1)])
+        curves.insert(0, "id", frame["id"])
+        curves.to_csv(args.curves, index=False)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m sandoz_pipeline", description="Headless Sandoz pipeline batch jobs"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("recompute", help="revalue the portfolio and export the results")
+    run.add_argument("--input", help="products file (default: configured products source)")
+    run.add_argument("--out", required=True, help="output file")
+    run.add_argument("--format", choices=OUTPUT_FORMATS, help="output format (default: from --out suffix)")
+    run.add_argument("--chunk-size", type=int, default=10000, help="rows per export chunk")
+    run.set_defaults(handler=recompute)
+
+    report = commands.add_parser("summary", help="print portfolio KPIs")
+    report.add_argument("--input", help="products file (default: configured products source)")
+    report.add_argument("--by", choices=SUMMARY_DIMENSIONS, help="break KPIs down by a dimension")
+    report.set_defaults(handler=summary)
+
+    variants = commands.add_parser("batch", help="revalue the portfolio under assumption variants")
+    variants.add_argument("--input", help="products file (default: configured products source)")
+    variants.add_argument("--variants", required=True,
+                          help="one row per variant; driver columns hold multipliers, others pass through")
+    variants.add_argument("--out", required=True, help="output file (csv or parquet)")
+    variants.add_argument("--format", choices=("csv", "parquet"), help="output format (default: from --out suffix)")
+    variants.add_argument("--workers", type=int, help="worker processes (default: every core)")
+    variants.set_defaults(handler=batch)
+
+    check = commands.add_parser("validate", help="check a products file and report every violation")
+    check.add_argument("--input", required=True, help="products file")
+    check.add_argument("--report", help="write every violation (row, id, field, rule, value) to this CSV")
+    check.add_argument("--show", type=int, default=20, help="violations to print")
+    check.set_defaults(handler=validate)
+
+    select = commands.add_parser("optimize", help="choose launches that maximize risk-adjusted NPV")
+    select.add_argument("--input", help="products file (default: configured products source)")
+    select.add_argument("--budget", type=float, help="launch-cost budget in the reporting currency, millions")
+    select.add_argument("--capacity", type=int, help="launches allowed per quarter")
+    select.add_argument("--max-delay", type=int, help="quarters a launch may slip")
+    select.add_argument("--method", choices=("auto", "branch_and_bound", "greedy"), default="auto")
+    select.add_argument("--out", help="write the selection to this CSV")
+    select.set_defaults(handler=optimize)
+
+    curves = commands.add_parser("uptake", help="fit diffusion curves to uptake and extrapolate them monthly")
+    curves.add_argument("--input", help="products file (default: configured products source)")
+    curves.add_argument("--model", choices=("bass", "logistic"), help="diffusion model (default: configured)")
+    curves.add_argument("--years", type=int, help="extrapolation horizon in years (default: configured)")
+    curves.add_argument("--out", help="write fitted parameters per product to this CSV")
+    curves.add_argument("--curves", help="write monthly uptake share per product to this CSV")
+    curves.set_defaults(handler=uptake)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (ValueError, KeyError, OSError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
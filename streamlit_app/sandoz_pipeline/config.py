@@ -0,0 +1,332 @@
+"""
+Configuration and constants for Sandoz Pipeline Application
+"""
+
+import os
+
+# Product Data
+PIPELINE_PRODUCTS = [
+    {
+        "id": "PRODUCT-001",
+        "name": "Biosimilar Humira (Adalimumab)",
+        "archetype": "Med Benefit High",
+        "phase": "Pre-Launch",
+        "launchDate": "2026-Q2",
+        "territory": "US",
+        "priority": "High",
+        "npv": 245.6,
+        "assumptions": {
+            "uptake": {"y1": 8, "y2": 15, "y3": 22, "y4": 28, "y5": 32},
+            "peakShare": 32,
+            "pricing": {"wac": 850, "asp": 765, "gtn": 45},
+            "access": {"tier1": 60, "tier2": 30, "tier3": 10},
+            "competition": "High (5+ competitors)",
+            "jcode": "Applied - 18mo to launch",
+            "distribution": "Specialty + Limited"
+        },
+        "lastUpdated": "2026-01-28",
+        "updatedBy": "Sarah Chen (US Market Access)"
+    },
+    {
+        "id": "PRODUCT-002",
+        "name": "Biosimilar Enbrel (Etanercept)",
+        "archetype": "Med Benefit Med",
+        "phase": "Filed",
+        "launchDate": "2026-Q4",
+        "territory": "US",
+        "priority": "Medium",
+        "npv": 178.3,
+        "assumptions": {
+            "uptake": {"y1": 6, "y2": 12, "y3": 18, "y4": 24, "y5": 28},
+            "peakShare": 28,
+            "pricing": {"wac": 720, "asp": 648, "gtn": 42},
+            "access": {"tier1": 55, "tier2": 35, "tier3": 10},
+            "competition": "Medium (3-4 competitors)",
+            "jcode": "Pending - 24mo to launch",
+            "distribution": "Specialty"
+        },
+        "lastUpdated": "2026-01-25",
+        "updatedBy": "Michael Torres (Global BD)"
+    },
+    {
+        "id": "PRODUCT-003",
+        "name": "Generic Lyrica (Pregabalin)",
+        "archetype": "Rx Benefit High",
+        "phase": "Pre-Launch",
+        "launchDate": "2026-Q3",
+        "territory": "US",
+        "priority": "High",
+        "npv": 189.4,
+        "assumptions": {
+            "uptake": {"y1": 25, "y2": 38, "y3": 45, "y4": 48, "y5": 50},
+            "peakShare": 50,
+            "pricing": {"wac": 45, "asp": 38, "gtn": 65},
+            "access": {"tier1": 85, "tier2": 12, "tier3": 3},
+            "competition": "High (10+ competitors)",
+            "jcode": "N/A - Retail",
+            "distribution": "Retail + Specialty"
+        },
+        "lastUpdated": "2026-01-27",
+        "updatedBy": "Jennifer Liu (US Market Access)"
+    },
+    {
+        "id": "PRODUCT-004",
+        "name": "Rare Disease Gene Therapy",
+        "archetype": "Rare Disease",
+        "phase": "Phase 3",
+        "launchDate": "2027-Q2",
+        "territory": "US",
+        "priority": "Strategic",
+        "npv": 312.8,
+        "assumptions": {
+            "uptake": {"y1": 3, "y2": 6, "y3": 9, "y4": 12, "y5": 15},
+            "peakShare": 15,
+            "pricing": {"wac": 125000, "asp": 115000, "gtn": 28},
+            "access": {"tier1": 40, "tier2": 35, "tier3": 25},
+            "competition": "Low (1-2 competitors)",
+            "jcode": "To be applied - 36mo to launch",
+            "distribution": "Ultra-Specialty + Hub"
+        },
+        "lastUpdated": "2026-01-20",
+        "updatedBy": "David Park (Global Rare Disease)"
+    }
+]
+
+# Archetype Configuration
+ARCHETYPES = [
+    {"name": "Med Benefit High", "color": "#0066CC", "count": 8},
+    {"name": "Med Benefit Med", "color": "#4A90E2", "count": 6},
+    {"name": "Med Benefit Low", "color": "#7AB8FF", "count": 4},
+    {"name": "Rx Benefit High", "color": "#00A86B", "count": 7},
+    {"name": "Rx Benefit Med", "color": "#52C993", "count": 5},
+    {"name": "Rx Benefit Low", "color": "#8FE5B8", "count": 3},
+    {"name": "Rare Disease", "color": "#9B59B6", "count": 2}
+]
+
+# Version History
+VERSION_HISTORY = [
+    {
+        "version": "v1.3",
+        "date": "2026-01-28",
+        "user": "Sarah Chen",
+        "changes": ["Updated GTN% from 42% to 45%", "Revised Tier 1 access from 55% to 60%"],
+        "npvImpact": 12.3,
+        "status": "Current"
+    },
+    {
+        "version": "v1.2",
+        "date": "2026-01-15",
+        "user": "Michael Torres",
+        "changes": ["Adjusted Y1 uptake from 6% to 8%", "Updated competition assessment"],
+        "npvImpact": 8.7,
+        "status": "Approved"
+    },
+    {
+        "version": "v1.1",
+        "date": "2025-12-20",
+        "user": "Jennifer Liu",
+        "changes": ["Initial US market assumptions", "Added J-code timeline"],
+        "npvImpact": 15.2,
+        "status": "Approved"
+    },
+    {
+        "version": "v1.0",
+        "date": "2025-12-01",
+        "user": "David Park",
+        "changes": ["Created baseline forecast from Global assumptions"],
+        "npvImpact": 0,
+        "status": "Baseline"
+    }
+]
+
+# Color Schemes
+PRIORITY_COLORS = {
+    "High": "#E74C3C",
+    "Strategic": "#9B59B6",
+    "Medium": "#F39C12",
+    "Low": "#95A5A6"
+}
+
+# Development phase model: display color, probability of success (reaching launch) and the
+# typical quarters from the valuation date to launch for a product in that phase
+PHASE_MODEL = {
+    "Pre-Launch": {"color": "#3B82F6", "probability_of_success": 0.95, "quarters_to_launch": 2},
+    "Filed": {"color": "#F59E0B", "probability_of_success": 0.85, "quarters_to_launch": 4},
+    "Phase 3": {"color": "#8B5CF6", "probability_of_success": 0.60, "quarters_to_launch": 10}
+}
+
+PHASE_COLORS = {phase: spec["color"] for phase, spec in PHASE_MODEL.items()}
+
+# Milestone Schedule: stage dates in quarters relative to each product's launch quarter
+MILESTONE_SCHEDULE = [
+    {"Stage": "FDA Approval", "Offset": -2, "Duration": "6 months"},
+    {"Stage": "Payer Negotiations", "Offset": -1, "Duration": "3 months"},
+    {"Stage": "Commercial Launch", "Offset": 0, "Duration": "Ongoing"},
+    {"Stage": "Formulary Wins", "Offset": 1, "Duration": "6 months"},
+    {"Stage": "Market Expansion", "Offset": 2, "Duration": "Ongoing"}
+]
+
+# App Configuration
+APP_CONFIG = {
+    "title": "Pipeline Decision System",
+    "subtitle": "Centralized Portfolio Management & NPV Tracking",
+    "company": "SANDOZ",
+    "version": "1.0.0",
+    "last_updated": "2026-02-04"
+}
+
+# External Data Sources (CSV, Parquet or SQLite); unset datasets use the literals above
+DATA_SOURCES = {
+    "products": os.environ.get("SANDOZ_PRODUCTS_SOURCE") or os.environ.get("SANDOZ_DATA_SOURCE"),
+    "archetypes": os.environ.get("SANDOZ_ARCHETYPES_SOURCE") or os.environ.get("SANDOZ_DATA_SOURCE"),
+    "version_history": os.environ.get("SANDOZ_VERSION_HISTORY_SOURCE") or os.environ.get("SANDOZ_DATA_SOURCE"),
+    "fx_rates": os.environ.get("SANDOZ_FX_RATES_SOURCE") or os.environ.get("SANDOZ_DATA_SOURCE")
+}
+
+# Valuation Engine Settings
+VALUATION_CONFIG = {
+    "valuation_date": "2026-Q1",
+    "discount_rate": 0.10,
+    "horizon_years": 10,
+    "operating_margin": 0.35,
+    "access_tier_weights": {"tier1": 1.0, "tier2": 0.6, "tier3": 0.25},
+    "admin_fee_rate": 0.02
+}
+
+# Monte Carlo Scenario Distributions (per-product overrides via assumptions.uncertainty)
+SCENARIO_DISTRIBUTIONS = {
+    "uptake": {"low": 0.70, "mode": 1.0, "high": 1.25},
+    "gtn": {"sd": 3.0},
+    "access": {"low": 0.85, "mode": 1.0, "high": 1.10},
+    "launch_delay": {"quarters": [0, 1, 2, 4], "probabilities": [0.60, 0.20, 0.12, 0.08]}
+}
+
+SIMULATION_CONFIG = {
+    "draws": 10000,
+    "seed": 42,
+    "bins": 40,
+    "chunk_size": 65536
+}
+
+# Sensitivity Analysis: each driver is flexed up and down by this relative step
+SENSITIVITY_CONFIG = {
+    "relative_step": 0.10
+}
+
+# Batch Valuation: variant blocks are sized to about block_rows product rows per engine call,
+# and each worker receives tasks_per_worker variant ranges (workers=None uses every core)
+BATCH_CONFIG = {
+    "workers": None,
+    "block_rows": 65536,
+    "tasks_per_worker": 4
+}
+
+# Bulk validation bounds; percentages are 0-100 and access tiers must sum to access_total
+VALIDATION_CONFIG = {
+    "percent_range": (0, 100),
+    "gtn_range": (0, 100),
+    "access_total": 100,
+    "access_tolerance": 0.5
+}
+
+# Upload ingestion: files are parsed, validated and packed this many rows at a time
+INGEST_CONFIG = {
+    "chunk_rows": 50000
+}
+
+# Uptake diffusion fit: model ("bass" or "logistic") fitted to uptake Y1-Y5 and extrapolated monthly
+# to horizon_years. Market potential is bounded by the highest observed uptake and
+# max_potential_multiple x peak share (at most 100%). Fits left unconverged or with an RMSE above
+# restart_rmse (percentage points) are solved again from up to `restarts` next-best grid shapes,
+# until a restart converges to the same cost
+DIFFUSION_CONFIG = {
+    "model": "bass",
+    "horizon_years": 15,
+    "steps_per_year": 12,
+    "max_potential_multiple": 1.5,
+    "grid_size": 24,
+    "max_iterations": 500,
+    "tolerance": 1e-8,
+    "gradient_tolerance": 1e-6,
+    "restarts": 6,
+    "restart_rmse": 0.01,
+    "block_rows": 4096
+}
+
+# Portfolio optimizer: launch costs in the reporting currency (millions) by archetype, overridable
+# per product with assumptions.launchCost. Launches may slip up to max_delay quarters; the exact
+# solver runs up to exact_max_products
+OPTIMIZER_CONFIG = {
+    "launch_costs": {
+        "Med Benefit High": 60.0,
+        "Med Benefit Med": 45.0,
+        "Med Benefit Low": 30.0,
+        "Rx Benefit High": 40.0,
+        "Rx Benefit Med": 30.0,
+        "Rx Benefit Low": 20.0,
+        "Rare Disease": 80.0
+    },
+    "default_launch_cost": 40.0,
+    "budget": 150.0,
+    "quarter_capacity": 2,
+    "max_delay": 4,
+    "exact_max_products": 24,
+    "node_limit": 2000000
+}
+
+# Version history: a full portfolio checkpoint is kept every N edits
+VERSIONING_CONFIG = {
+    "checkpoint_every": 100
+}
+
+# Reporting currency for portfolio totals; product values stay in their territory's currency
+REPORTING_CURRENCY = "USD"
+
+CURRENCY_SYMBOLS = {
+    "USD": "$", "EUR": "€", "GBP": "£", "JPY": "¥",
+    "CAD": "C$", "AUD": "A$", "BRL": "R$", "CNY": "CN¥"
+}
+
+# FX Rates: US dollars per unit of each currency
+FX_RATES = [
+    {"currency": "USD", "usd_per_unit": 1.0},
+    {"currency": "EUR", "usd_per_unit": 1.08},
+    {"currency": "GBP", "usd_per_unit": 1.27},
+    {"currency": "JPY", "usd_per_unit": 0.0067},
+    {"currency": "CAD", "usd_per_unit": 0.73},
+    {"currency": "AUD", "usd_per_unit": 0.66},
+    {"currency": "BRL", "usd_per_unit": 0.18},
+    {"currency": "CNY", "usd_per_unit": 0.14}
+]
+
+# Territory Assumption Sets: currency plus overrides of VALUATION_CONFIG per territory
+TERRITORY_ASSUMPTIONS = {
+    "US": {"currency": "USD"},
+    "EU": {"currency": "EUR", "discount_rate": 0.09, "operating_margin": 0.30,
+           "access_tier_weights": {"tier1": 1.0, "tier2": 0.7, "tier3": 0.35}},
+    "UK": {"currency": "GBP", "discount_rate": 0.09, "operating_margin": 0.30,
+           "access_tier_weights": {"tier1": 1.0, "tier2": 0.7, "tier3": 0.35}},
+    "JP": {"currency": "JPY", "discount_rate": 0.07, "operating_margin": 0.32},
+    "CA": {"currency": "CAD", "operating_margin": 0.30},
+    "AU": {"currency": "AUD", "operating_margin": 0.30},
+    "BR": {"currency": "BRL", "discount_rate": 0.14, "operating_margin": 0.25},
+    "CN": {"currency": "CNY", "discount_rate": 0.12, "operating_margin": 0.25}
+}
+
+# Payers List
+TARGET_PAYERS = [
+    ("UnitedHealthcare", "high"),
+    ("CVS Caremark", "high"),
+    ("Humana", "medium"),
+    ("Cigna", "medium"),
+    ("Aetna", "medium")
+]
+
+# Revenue Waterfall Components (amounts come from valuation.gross_to_net)
+REVENUE_WATERFALL = [
+    {"Category": "Gross Revenue\n(WAC)", "Component": "wac_revenue", "Type": "relative"},
+    {"Category": "Rebates &\nDiscounts", "Component": "rebates", "Type": "relative"},
+    {"Category": "Chargebacks", "Component": "chargebacks", "Type": "relative"},
+    {"Category": "Admin Fees", "Component": "admin_fees", "Type": "relative"},
+    {"Category": "Net Revenue", "Component": "net_revenue", "Type": "total"}
+]
@@ -0,0 +1,267 @@
+"""
+Uptake diffusion fitting for Sandoz Pipeline Application
+
+Uptake assumptions stop at launch year 5. A Bass diffusion (or logistic)
+curve fitted to each product's five uptake points extends the ramp to a
+monthly curve over ``DIFFUSION_CONFIG["horizon_years"]``:
+
+    Bass:     share(t) = m * (1 - e^-(p+q)t) / (1 + (q/p) e^-(p+q)t)
+    Logistic: share(t) = m / (1 + e^-k(t - t0))
+
+with t in years since launch and year k's uptake read as the share reached
+by the end of year k (t = k). The market potential m lies between the
+highest observed uptake and ``max_potential_multiple`` x peak share,
+capped at 100%.
+
+The whole portfolio is fitted at once by a batched Levenberg-Marquardt
+solver: every product's parameters, residuals and 3x3 normal equations sit
+in stacked arrays, so an iteration is a few array operations over all
+products instead of one optimizer call per product. Each product starts
+from the best shape on a coarse grid, scored for the whole portfolio with
+one matrix product per block of products. A fit has converged once its
+gradient vanishes, with parameters pressed against a bound held fixed.
+Rows that stop short of that, or settle with a poor fit, are solved again
+from the next-best grid shapes until a restart lands on the same minimum,
+and keep their best result.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from .config import DIFFUSION_CONFIG
+from .model import UPTAKE_YEARS
+
+DIFFUSION_MODELS = ("bass", "logistic")
+
+# Fitted parameters per model, market potential last
+PARAMETER_NAMES = {"bass": ("p", "q", "m"), "logistic": ("k", "t0", "m")}
+
+# Times of the uptake assumptions, in years since launch
+UPTAKE_TIMES = np.arange(1, len(UPTAKE_YEARS) + 1, dtype=float)
+
+# Starting grid over the first two solver parameters (log p and log q, or log k and t0)
+START_GRID = {"bass": ((-7.0, 0.5), (-5.0, 1.0)), "logistic": ((-2.5, 1.6), (-2.0, 10.0))}
+
+# The solver works on unbounded parameters: log p, log q (log k, t0) and a logit for m
+LOG_PARAMETERS = {"bass": (True, True), "logistic": (True, False)}
+SOLVER_BOUNDS = {"bass": ([-15, -15, -30], [5, 5, 30]), "logistic": ([-15, -20, -30], [5, 40, 30])}
+
+
+def diffusion_share(model, params, t):
+    """Uptake share (%) at times t (years since launch) for every parameter row"""
+    params = np.asarray(params, dtype=float)
+    first, second, potential = (params[:, i, None] for i in range(3))
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        if model == "bass":
+            decay = np.exp(-(first + second) * t)
+            return potential * (1 - decay) / (1 + second / first * decay)
+        if model == "logistic":
+            return potential / (1 + np.exp(-first * (t - second)))
+    raise ValueError(f"Unknown diffusion model: {model}")
+
+
+def potential_bounds(uptake, peak_share, config=DIFFUSION_CONFIG):
+    """Lower and upper bound on each product's market potential m"""
+    low = np.maximum(np.nanmax(uptake, axis=1), 0.0)
+    high = np.minimum(np.asarray(peak_share, dtype=float) * config["max_potential_multiple"], 100.0)
+    return low, np.maximum(high, low)
+
+
+def _natural(model, theta, low, high):
+    params = theta.copy()
+    logs = np.flatnonzero(LOG_PARAMETERS[model])
+    params[:, logs] = np.exp(theta[:, logs])
+    params[:, 2] = low + (high - low) / (1 + np.exp(-theta[:, 2]))
+    return params
+
+
+def _share_jacobian(model, theta, low, high, t=UPTAKE_TIMES):
+    """Shares at t and their derivatives with respect to each solver parameter, all (rows, times)"""
+    first, second, logit = (theta[:, i, None] for i in range(3))
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        weight = 1 / (1 + np.exp(-logit))
+        potential = low[:, None] + (high - low)[:, None] * weight
+        if model == "bass":
+            p, q = np.exp(first), np.exp(second)
+            decay = np.exp(-(p + q) * t)
+            ratio = q / p
+            denominator = 1 + ratio * decay
+            curve = (1 - decay) / denominator
+            # d curve / dp and dq, scaled by p and q for the log parameters
+            slope = t * decay / denominator
+            d_first = p * (slope + curve * (ratio / p) * decay * (1 + p * t) / denominator)
+            d_second = q * (slope - curve * decay * (1 - q * t) / (p * denominator))
+        else:
+            k = np.exp(first)
+            curve = 1 / (1 + np.exp(-k * (t - second)))
+            spread = curve * (1 - curve)
+            d_first = k * spread * (t - second)
+            d_second = -k * spread
+    d_potential = (high - low)[:, None] * weight * (1 - weight)
+    return potential * curve, (potential * d_first, potential * d_second, d_potential * curve)
+
+
+def _solve_symmetric(normal, gradient):
+    """Solve stacked symmetric 3x3 systems given their six distinct entries, by the adjugate"""
+    a, b, c, d, e, f = normal
+    g0, g1, g2 = gradient
+    c00, c01, c02 = d * f - e * e, c * e - b * f, b * e - c * d
+    c11, c12, c22 = a * f - c * c, b * c - a * e, a * d - b * b
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = 1 / (a * c00 + b * c01 + c * c02)
+    return np.column_stack([
+        (c00 * g0 + c01 * g1 + c02 * g2) * scale,
+        (c01 * g0 + c11 * g1 + c12 * g2) * scale,
+        (c02 * g0 + c12 * g1 + c22 * g2) * scale,
+    ])
+
+
+def _grid_starts(model, uptake, low, high, config):
+    """Solver starts per product: the best grid shapes with their least-squares market potentials
+
+    For a fixed curve shape the share is linear in m, so every grid shape
+    is scored for every product by one matrix product. Returns
+    ``config["restarts"] + 1`` starts per product, best first.
+    """
+    (first_low, first_high), (second_low, second_high) = START_GRID[model]
+    size = config["grid_size"]
+    first, second = np.meshgrid(np.linspace(first_low, first_high, size), np.linspace(second_low, second_high, size))
+    shapes = np.column_stack([first.ravel(), second.ravel(), np.zeros(size * size)])
+    logs = np.flatnonzero(LOG_PARAMETERS[model])
+    shapes[:, logs] = np.exp(shapes[:, logs])
+    shapes[:, 2] = 1.0
+    curves = diffusion_share(model, shapes, UPTAKE_TIMES)
+    overlap = uptake @ curves.T
+    potential = np.clip(overlap / (curves ** 2).sum(axis=1), low[:, None], high[:, None])
+    cost = potential * (potential * (curves ** 2).sum(axis=1) - 2 * overlap)
+    ranked = np.argsort(cost, axis=1)[:, :config["restarts"] + 1]
+    weight = (np.take_along_axis(potential, ranked, axis=1) - low[:, None]) / np.maximum(high - low, 1e-12)[:, None]
+    weight = np.clip(weight, 1e-6, 1 - 1e-6)
+    starts = np.stack([first.ravel()[ranked], second.ravel()[ranked], np.log(weight / (1 - weight))], axis=-1)
+    return starts.transpose(1, 0, 2)
+
+
+def _levenberg_marquardt(model, theta, uptake, low, high, config):
+    """Minimize squared uptake residuals for every row at once, returns (theta, cost, converged, iterations)"""
+    lower, upper = (np.asarray(bound, dtype=float) for bound in SOLVER_BOUNDS[model])
+    share, jacobian = _share_jacobian(model, theta, low, high)
+    residual = share - uptake
+    cost = (residual ** 2).sum(axis=1)
+    damping = np.full(len(theta), 1e-3)
+    active = np.isfinite(cost)
+    converged = np.zeros(len(theta), dtype=bool)
+    tolerance = config["tolerance"]
+    iterations = 0
+    while active.any() and iterations < config["max_iterations"]:
+        iterations += 1
+        rows = np.flatnonzero(active)
+        current, r, lam = theta[rows], residual[rows], damping[rows]
+        gradient = np.column_stack([(column[rows] * r).sum(axis=1) for column in jacobian])
+        # Parameters held at a bound by the gradient are fixed for this step
+        free = ~(((current <= lower) & (gradient > 0)) | ((current >= upper) & (gradient < 0)))
+        gradient *= free
+        j0, j1, j2 = (column[rows] * free[:, [k]] for k, column in enumerate(jacobian))
+        # Converged: the free gradient vanishes or the fit is exact
+        settled = np.abs(gradient).max(axis=1) <= config["gradient_tolerance"] * (1 + np.sqrt(cost[rows]))
+        settled |= cost[rows] <= tolerance
+        # Normal equations J'J + lambda diag(J'J), kept as six distinct entries per row
+        a, d, f = ((column * column).sum(axis=1) for column in (j0, j1, j2))
+        normal = (a * (1 + lam) + 1e-12, (j0 * j1).sum(axis=1), (j0 * j2).sum(axis=1),
+                  d * (1 + lam) + 1e-12, (j1 * j2).sum(axis=1), f * (1 + lam) + 1e-12)
+        step = -_solve_symmetric(normal, gradient.T)
+        trial = np.clip(current + step, lower, upper)
+        trial_share, trial_jacobian = _share_jacobian(model, trial, low[rows], high[rows])
+        trial_residual = trial_share - uptake[rows]
+        trial_cost = (trial_residual ** 2).sum(axis=1)
+
+        better = trial_cost < cost[rows]
+        accepted = rows[better]
+        theta[accepted], residual[accepted], cost[accepted] = trial[better], trial_residual[better], trial_cost[better]
+        for column, trial_column in zip(jacobian, trial_jacobian):
+            column[accepted] = trial_column[better]
+        damping[rows] = np.where(better, lam / 3, lam * 4)
+        converged[rows[settled]] = True
+        # Rows with no step downhill left stop unconverged
+        active[rows[settled | (damping[rows] > 1e12)]] = False
+    return theta, cost, converged, iterations
+
+
+def fit_uptake(uptake, peak_share, model=None, config=DIFFUSION_CONFIG):
+    """Fit a diffusion curve to every product's uptake Y1-Y5
+
+    ``uptake`` is (products, 5) in percent. Returns the model, natural
+    parameters per product (columns as ``PARAMETER_NAMES[model]``), fit
+    RMSE in percentage points, a converged flag, solver iterations and
+    elapsed time.
+    """
+    model = model or config["model"]
+    if model not in DIFFUSION_MODELS:
+        raise ValueError(f"Unknown diffusion model: {model}")
+    start = time.perf_counter()
+    uptake = np.asarray(uptake, dtype=float).reshape(-1, len(UPTAKE_YEARS))
+    low, high = potential_bounds(uptake, peak_share, config)
+    starts = np.empty((config["restarts"] + 1, len(uptake), 3))
+    # Blocks bound the (products x grid shapes) scoring matrix
+    for lo in range(0, len(uptake), config["block_rows"]):
+        rows = slice(lo, lo + config["block_rows"])
+        starts[:, rows] = _grid_starts(model, uptake[rows], low[rows], high[rows], config)
+    theta, cost, converged, iterations = _levenberg_marquardt(model, starts[0].copy(), uptake, low, high, config)
+    # A poor fit is retried until a restart converges back to the same cost, confirming its minimum
+    confirmed = np.zeros(len(uptake), dtype=bool)
+    for restart in starts[1:]:
+        poor = ~converged | (np.sqrt(cost / len(UPTAKE_YEARS)) > config["restart_rmse"])
+        retry = np.flatnonzero(poor & ~confirmed)
+        if not len(retry):
+            break
+        refit, refit_cost, refit_converged, refit_iterations = _levenberg_marquardt(
+            model, restart[retry], uptake[retry], low[retry], high[retry], config)
+        confirmed[retry] = converged[retry] & refit_converged & np.isclose(refit_cost, cost[retry], rtol=1e-6)
+        better = refit_cost < cost[retry]
+        rows = retry[better]
+        theta[rows], cost[rows], converged[rows] = refit[better], refit_cost[better], refit_converged[better]
+        iterations += refit_iterations
+    params = _natural(model, theta, low, high)
+    rmse = np.sqrt(cost / len(UPTAKE_YEARS))
+    return {
+        "model": model,
+        "params": params,
+        "rmse": rmse,
+        "converged": converged,
+        "iterations": iterations,
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def monthly_uptake(fit, rows=None, years=None, config=DIFFUSION_CONFIG):
+    """Fitted uptake share (%) per month since launch, returns (mid-month times in years, shares)"""
+    years = years or config["horizon_years"]
+    steps = config["steps_per_year"]
+    times = (np.arange(years * steps) + 0.5) / steps
+    params = fit["params"] if rows is None else fit["params"][np.atleast_1d(rows)]
+    return times, diffusion_share(fit["model"], params, times)
+
+
+def peak_adoption_year(fit):
+    """Years since launch at which uptake grows fastest (the curve's inflection point)"""
+    first, second = fit["params"][:, 0], fit["params"][:, 1]
+    if fit["model"] == "bass":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inflection = np.log(second / first) / (first + second)
+    else:
+        inflection = second
+    return np.maximum(np.nan_to_num(inflection), 0.0)
+
+
+def fit_frame(ids, fit, years=None, config=DIFFUSION_CONFIG):
+    """One row per product: fitted parameters, RMSE, inflection year and share at the horizon"""
+    years = years or config["horizon_years"]
+    horizon = diffusion_share(fit["model"], fit["params"], np.array([float(years)]))[:, 0]
+    return pd.DataFrame({
+        "id": np.asarray(ids, dtype=object),
+        **{name: fit["params"][:, i] for i, name in enumerate(PARAMETER_NAMES[fit["model"]])},
+        "rmse": fit["rmse"],
+        "converged": fit["converged"],
+        "peak_adoption_year": peak_adoption_year(fit),
+        f"share_y{years}": horizon,
+    })
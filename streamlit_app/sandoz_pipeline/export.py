@@ -0,0 +1,132 @@
+"""
+Streaming portfolio export for Sandoz Pipeline Application
+
+Rows are produced in fixed-size chunks that combine product fields,
+flattened assumptions and computed financial columns, and each writer
+appends chunk by chunk so memory stays bounded by the chunk size.
+"""
+
+import io
+
+import pandas as pd
+from .config import REPORTING_CURRENCY
+from .valuation import UPTAKE_YEARS, ACCESS_TIERS
+
+EXPORT_FORMATS = {
+    "csv": {"label": "CSV", "extension": "csv", "mime": "text/csv"},
+    "parquet": {"label": "Parquet", "extension": "parquet", "mime": "application/vnd.apache.parquet"},
+    "arrow": {"label": "Arrow IPC", "extension": "arrow", "mime": "application/vnd.apache.arrow.file"},
+    "xlsx": {"label": "Excel (XLSX)", "extension": "xlsx",
+             "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"},
+}
+
+EXPORT_CHUNK_SIZE = 10000
+
+PRODUCT_COLUMNS = {
+    "name": "Product",
+    "id": "ID",
+    "archetype": "Archetype",
+    "phase": "Phase",
+    "launchDate": "Launch Date",
+    "territory": "Territory",
+    "priority": "Priority",
+    "lastUpdated": "Last Updated",
+    "updatedBy": "Updated By",
+}
+
+# Financial columns are in each product's local currency
+FINANCIAL_COLUMNS = {
+    "npv": "NPV (M)",
+    "five_year_revenue": "5-Year Revenue (M)",
+    "peak_revenue": "Peak Year Revenue (M)",
+    "peak_year": "Peak Year",
+}
+
+
+def iter_export_chunks(store, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield export rows in DataFrame chunks of at most chunk_size products"""
+    arrays = store.arrays
+    valuation = store.valuation()
+    for start in range(0, len(store), chunk_size):
+        stop = min(start + chunk_size, len(store))
+        rows = store.frame.iloc[start:stop]
+        # Missing text (e.g. no lastUpdated) is written empty, not as "None" or "nan"
+        chunk = {label: rows[col].astype(object).where(rows[col].notna(), "").to_numpy()
+                 for col, label in PRODUCT_COLUMNS.items()}
+        chunk["Currency"] = arrays["currency"][start:stop].astype(str)
+        for col, label in FINANCIAL_COLUMNS.items():
+            chunk[label] = valuation[col].to_numpy()[start:stop]
+        chunk[f"NPV ({REPORTING_CURRENCY}M)"] = valuation["npv"].to_numpy()[start:stop] * arrays["fx_rate"][start:stop]
+        for i, year in enumerate(UPTAKE_YEARS):
+            chunk[f"Uptake {year.upper()} (%)"] = arrays["uptake"][start:stop, i]
+        chunk["Peak Share (%)"] = arrays["peak_share"][start:stop]
+        chunk["WAC"] = arrays["wac"][start:stop]
+        chunk["ASP"] = arrays["asp"][start:stop]
+        chunk["GTN (%)"] = arrays["gtn"][start:stop]
+        for i, tier in enumerate(ACCESS_TIERS):
+            chunk[f"Access {tier.title().replace('Tier', 'Tier ')} (%)"] = arrays["access"][start:stop, i]
+        yield pd.DataFrame(chunk)
+
+
+def _write_csv(chunks, sink):
+    text = io.TextIOWrapper(sink, encoding="utf-8", newline="", write_through=True)
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(text, header=(i == 0), index=False)
+    text.detach()
+
+
+def _write_arrow(chunks, sink, fmt):
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    writer = None
+    schema = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = (pa.parquet.ParquetWriter(sink, schema) if fmt == "parquet"
+                          else pa.ipc.new_file(sink, schema))
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_xlsx(chunks, sink):
+    try:
+        from openpyxl import Workbook
+    except ImportError as exc:
+        raise ImportError("XLSX export requires openpyxl (pip install openpyxl)") from exc
+
+    # Write-only workbooks stream rows to disk instead of holding cell objects
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Portfolio")
+    for i, chunk in enumerate(chunks):
+        if i == 0:
+            sheet.append(list(chunk.columns))
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append([v.item() if hasattr(v, "item") else v for v in row])
+    workbook.save(sink)
+
+
+def write_export(store, fmt, sink, chunk_size=EXPORT_CHUNK_SIZE):
+    """Stream the portfolio export in the given format to a binary file object"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    chunks = iter_export_chunks(store, chunk_size)
+    if fmt == "csv":
+        _write_csv(chunks, sink)
+    elif fmt in ("parquet", "arrow"):
+        _write_arrow(chunks, sink, fmt)
+    else:
+        _write_xlsx(chunks, sink)
+
+
+def export_to_file(store, fmt, path, chunk_size=EXPORT_CHUNK_SIZE):
+    """Stream the portfolio export to a file path"""
+    with open(path, "wb") as sink:
+        write_export(store, fmt, sink, chunk_size)
+    return path
@@ -0,0 +1,62 @@
+"""
+FX conversion for Sandoz Pipeline Application
+
+Rates are held in one array indexed by currency code, so converting a whole
+portfolio of per-territory amounts into a reporting currency is a single
+gather and multiply rather than a per-row lookup.
+"""
+
+import numpy as np
+import pandas as pd
+from .config import CURRENCY_SYMBOLS, REPORTING_CURRENCY
+from .loaders import load_dataset
+
+_tables = {}
+
+
+class RateTable:
+    """Currency conversion rates against US dollars, vectorized over currency arrays"""
+
+    def __init__(self, records):
+        self.currencies = [r["currency"] for r in records]
+        self.usd_per_unit = np.array([r["usd_per_unit"] for r in records], dtype=float)
+        self.index = {currency: i for i, currency in enumerate(self.currencies)}
+
+    def codes(self, currencies):
+        """Row index of each currency in the table"""
+        currencies = np.asarray(currencies, dtype=object)
+        codes = pd.Index(self.currencies).get_indexer(currencies)
+        if (codes < 0).any():
+            unknown = sorted(set(currencies[codes < 0]))
+            raise ValueError(f"No FX rate for currency: {', '.join(map(str, unknown))}")
+        return codes
+
+    def rate(self, source, target=REPORTING_CURRENCY):
+        """Units of target per unit of source"""
+        return self.usd_per_unit[self.codes([source])[0]] / self.usd_per_unit[self.codes([target])[0]]
+
+    def factors(self, currencies, target=REPORTING_CURRENCY):
+        """Units of target per unit of each currency in an array"""
+        return self.usd_per_unit[self.codes(currencies)] / self.usd_per_unit[self.codes([target])[0]]
+
+    def convert(self, amounts, currencies, target=REPORTING_CURRENCY):
+        """Convert amounts whose leading axis matches currencies into the target currency"""
+        amounts = np.asarray(amounts, dtype=float)
+        factors = self.factors(currencies, target)
+        return amounts * factors.reshape(factors.shape + (1,) * (amounts.ndim - 1))
+
+
+def load_rate_table(path=None):
+    """Rate table for the configured FX source, rebuilt only when the source changes"""
+    records = load_dataset("fx_rates", path)
+    cached = _tables.get(id(records))
+    if cached is None or cached[0] is not records:
+        cached = (records, RateTable(records))
+        _tables.clear()
+        _tables[id(records)] = cached
+    return cached[1]
+
+
+def currency_symbol(currency):
+    """Display symbol for a currency code, falling back to the code itself"""
+    return CURRENCY_SYMBOLS.get(currency, f"{currency} ")
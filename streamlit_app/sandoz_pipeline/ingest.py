@@ -0,0 +1,145 @@
+"""
+Chunked ingestion of product assumption files for Sandoz Pipeline Application
+
+Large CSV, Excel and Parquet uploads are never parsed in one go: each
+format is read ``INGEST_CONFIG["chunk_rows"]`` rows at a time (pandas
+chunked CSV reads, openpyxl read-only row streaming, Parquet record
+batches). Every chunk is validated, its valid rows are packed into a
+compact model.ProductTable and the chunk's DataFrame is dropped, so peak
+memory is one chunk plus the packed tables rather than a whole workbook.
+Only rows with a violation are rejected; the rest of their chunk is kept.
+
+    result = ingest_products("assumptions.xlsx", progress=print)
+    merged = store.table.upsert(result["table"])
+"""
+
+import os
+import time
+from datetime import date, datetime
+
+import pandas as pd
+from .config import INGEST_CONFIG
+from .model import ProductTable
+from .validation import ValidationReport, validate_products
+
+# File suffix -> ingest format
+INGEST_FORMATS = {".csv": "csv", ".xlsx": "xlsx", ".parquet": "parquet", ".pq": "parquet"}
+
+# Sheet read from workbooks when present, otherwise the first sheet
+EXCEL_SHEET = "products"
+
+CHUNK_COLUMNS = ["chunk", "first_row", "rows", "kept", "rejected"]
+
+
+def ingest_format(name):
+    """Ingest format for a file name"""
+    fmt = INGEST_FORMATS.get(os.path.splitext(str(name))[1].lower())
+    if fmt is None:
+        raise ValueError(f"Unsupported upload format: {name} (expected {', '.join(sorted(INGEST_FORMATS))})")
+    return fmt
+
+
+def _size(handle):
+    position = handle.tell()
+    size = handle.seek(0, os.SEEK_END)
+    handle.seek(position)
+    return size or 1
+
+
+def _csv_chunks(handle, chunk_rows):
+    size = _size(handle)
+    for frame in pd.read_csv(handle, chunksize=chunk_rows):
+        yield frame, handle.tell() / size
+
+
+def _parquet_chunks(handle, chunk_rows):
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(handle)
+    total, done = max(parquet.metadata.num_rows, 1), 0
+    for batch in parquet.iter_batches(batch_size=chunk_rows):
+        done += batch.num_rows
+        yield batch.to_pandas(), done / total
+
+
+def _excel_frame(rows, header):
+    frame = pd.DataFrame.from_records(rows, columns=header).infer_objects()
+    # Date cells (e.g. lastUpdated) come back as datetimes; records keep ISO dates
+    for col in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[col]):
+            frame[col] = frame[col].dt.strftime("%Y-%m-%d")
+        elif frame[col].dtype == object and frame[col].map(lambda v: isinstance(v, (date, datetime))).any():
+            frame[col] = frame[col].map(lambda v: v.strftime("%Y-%m-%d") if isinstance(v, (date, datetime)) else v)
+    return frame
+
+
+def _excel_chunks(handle, chunk_rows):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(handle, read_only=True, data_only=True)
+    try:
+        sheet = workbook[EXCEL_SHEET] if EXCEL_SHEET in workbook.sheetnames else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(col) for col in next(rows, ())]
+        total, done, chunk = max((sheet.max_row or 1) - 1, 1), 0, []
+        for row in rows:
+            if any(value is not None for value in row):
+                chunk.append(row)
+            if len(chunk) == chunk_rows:
+                done += len(chunk)
+                yield _excel_frame(chunk, header), done / total
+                chunk = []
+        if chunk:
+            yield _excel_frame(chunk, header), 1.0
+    finally:
+        workbook.close()
+
+
+CHUNK_READERS = {"csv": _csv_chunks, "xlsx": _excel_chunks, "parquet": _parquet_chunks}
+
+
+def read_chunks(source, fmt=None, chunk_rows=None):
+    """Yield (DataFrame, fraction of the file read) chunks from a path or binary file object"""
+    fmt = fmt or ingest_format(getattr(source, "name", source))
+    chunk_rows = chunk_rows or INGEST_CONFIG["chunk_rows"]
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as handle:
+            yield from CHUNK_READERS[fmt](handle, chunk_rows)
+    else:
+        source.seek(0)
+        yield from CHUNK_READERS[fmt](source, chunk_rows)
+
+
+def ingest_products(source, fmt=None, chunk_rows=None, progress=None):
+    """Parse, validate and pack a products file chunk by chunk
+
+    ``progress(fraction, rows_read, rows_kept)`` is called after every
+    chunk. Returns the valid rows as a ProductTable, a ValidationReport
+    over every row read (row positions count from the first data row of
+    the file), kept and rejected row counts per chunk, the number of rows
+    read and the elapsed time. Rows with a violation are left out of the
+    table; an ID repeated from an earlier row is reported as ``unique``
+    and only its first valid occurrence is kept.
+    """
+    start = time.perf_counter()
+    tables, reports, chunks, seen, rows_read, rows_kept = [], [], [], set(), 0, 0
+    for frame, fraction in read_chunks(source, fmt, chunk_rows):
+        frame = frame.reset_index(drop=True)
+        report = validate_products(frame, existing_ids=seen)
+        valid = frame[report.valid_mask()]
+        if len(valid):
+            tables.append(ProductTable.from_frame(valid.reset_index(drop=True)))
+            seen.update(valid["id"])
+        reports.append(report)
+        chunks.append((len(chunks) + 1, rows_read, len(frame), len(valid), len(frame) - len(valid)))
+        rows_read += len(frame)
+        rows_kept += len(valid)
+        if progress is not None:
+            progress(min(fraction, 1.0), rows_read, rows_kept)
+    return {
+        "table": ProductTable.concat(tables),
+        "report": ValidationReport.concat(reports),
+        "chunks": pd.DataFrame(chunks, columns=CHUNK_COLUMNS),
+        "rows": rows_read,
+        "elapsed": time.perf_counter() - start,
+    }
@@ -0,0 +1,141 @@
+"""
+Launch calendar index for Sandoz Pipeline Application
+
+Launch dates ("YYYY-Qn") are parsed once into quarter numbers
+(year * 4 + quarter - 1) and kept sorted alongside store row positions, so
+range queries such as "launches in 2026" or "launches in the next four
+quarters" are two binary searches and a slice. Milestone dates are fixed
+quarter offsets from launch, so the whole portfolio's schedule is one
+broadcast addition.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+from .config import MILESTONE_SCHEDULE, VALUATION_CONFIG
+
+QUARTER_PATTERN = r"^(\d{4})-Q([1-4])$"
+_QUARTER_RE = re.compile(QUARTER_PATTERN)
+
+# Below this many labels a per-label regex beats the vectorized pandas pass
+SMALL_BATCH = 32
+
+
+def quarter_number(label):
+    """Quarter number for a 'YYYY-Qn' label; integers pass through"""
+    if isinstance(label, (int, np.integer)):
+        return int(label)
+    year, quarter = str(label).split("-Q")
+    return int(year) * 4 + int(quarter) - 1
+
+
+def quarter_label(number):
+    """'YYYY-Qn' label for a quarter number"""
+    return f"{number // 4}-Q{number % 4 + 1}"
+
+
+def parse_quarters(labels):
+    """Quarter numbers for an array of 'YYYY-Qn' labels, parsed in one vectorized pass"""
+    if len(labels) <= SMALL_BATCH:
+        matches = [_QUARTER_RE.match(str(label)) for label in labels]
+        if all(matches):
+            return np.array([int(m[1]) * 4 + int(m[2]) - 1 for m in matches], dtype=np.int64)
+    parts = pd.Series(labels, dtype=object).astype(str).str.extract(QUARTER_PATTERN)
+    invalid = parts.isna().any(axis=1).to_numpy()
+    if invalid.any():
+        bad = sorted(set(np.asarray(labels, dtype=object)[invalid].astype(str)))
+        raise ValueError(f"Invalid launch quarter (expected YYYY-Qn): {', '.join(bad)}")
+    return parts[0].astype(np.int64).to_numpy() * 4 + parts[1].astype(np.int64).to_numpy() - 1
+
+
+def milestone_status(quarter, as_of):
+    """Completed / In Progress / Upcoming for a milestone quarter relative to as_of"""
+    if quarter < as_of:
+        return "Completed"
+    return "In Progress" if quarter == as_of else "Upcoming"
+
+
+class LaunchCalendar:
+    """Sorted launch-quarter index over store row positions"""
+
+    def __init__(self, launch_dates, schedule=MILESTONE_SCHEDULE, as_of=None):
+        self.quarters = parse_quarters(launch_dates)
+        self.schedule = schedule
+        self.offsets = np.array([stage["Offset"] for stage in schedule], dtype=np.int64)
+        self.as_of = quarter_number(as_of or VALUATION_CONFIG["valuation_date"])
+        self._sort()
+
+    def _sort(self):
+        self.order = np.argsort(self.quarters, kind="stable")
+        self.sorted_quarters = self.quarters[self.order]
+
+    def __len__(self):
+        return len(self.quarters)
+
+    @property
+    def years(self):
+        """Launch year per store position"""
+        return self.quarters // 4
+
+    def between(self, start, end):
+        """Store positions launching in [start, end] (labels or quarter numbers), in launch order"""
+        lo = np.searchsorted(self.sorted_quarters, quarter_number(start), side="left")
+        hi = np.searchsorted(self.sorted_quarters, quarter_number(end), side="right")
+        return self.order[lo:hi]
+
+    def in_year(self, year):
+        """Store positions launching in a calendar year"""
+        return self.between(int(year) * 4, int(year) * 4 + 3)
+
+    def next_quarters(self, n_quarters, start=None):
+        """Store positions launching in the n quarters from start (default: the as-of quarter)"""
+        start = self.as_of if start is None else quarter_number(start)
+        return self.between(start, start + n_quarters - 1)
+
+    def next_launch(self, start=None):
+        """Store position of the first launch on or after start, or None"""
+        start = self.as_of if start is None else quarter_number(start)
+        index = np.searchsorted(self.sorted_quarters, start, side="left")
+        return int(self.order[index]) if index < len(self.order) else None
+
+    def count_by_quarter(self, start, end):
+        """Launch counts per quarter label in [start, end], including empty quarters"""
+        first, last = quarter_number(start), quarter_number(end)
+        lo = np.searchsorted(self.sorted_quarters, first, side="left")
+        hi = np.searchsorted(self.sorted_quarters, last, side="right")
+        counts = np.bincount(self.sorted_quarters[lo:hi] - first, minlength=max(last - first + 1, 0))
+        return pd.Series(counts, index=[quarter_label(q) for q in range(first, last + 1)], name="launches")
+
+    def milestone_quarters(self):
+        """Milestone quarter numbers for every product, shape (products, stages)"""
+        return self.quarters[:, None] + self.offsets
+
+    def milestones(self, position):
+        """Milestone schedule for one product with dates and status as of the calendar date"""
+        rows = []
+        for stage, offset in zip(self.schedule, self.offsets):
+            quarter = int(self.quarters[position] + offset)
+            rows.append({
+                "Stage": stage["Stage"],
+                "Date": quarter_label(quarter),
+                "Status": milestone_status(quarter, self.as_of),
+                "Duration": stage.get("Duration", ""),
+            })
+        return rows
+
+    def move(self, position, launch_date):
+        """Re-index one product after its launch date changes"""
+        quarter = quarter_number(launch_date)
+        old = self.quarters[position]
+        if quarter == old:
+            return
+        lo = np.searchsorted(self.sorted_quarters, old, side="left")
+        hi = np.searchsorted(self.sorted_quarters, old, side="right")
+        index = lo + int(np.flatnonzero(self.order[lo:hi] == position)[0])
+        order = np.delete(self.order, index)
+        sorted_quarters = np.delete(self.sorted_quarters, index)
+        insert = np.searchsorted(sorted_quarters, quarter, side="right")
+        self.order = np.insert(order, insert, position)
+        self.sorted_quarters = np.insert(sorted_quarters, insert, quarter)
+        self.quarters[position] = quarter
@@ -0,0 +1,180 @@
+"""
+Data source loaders for Sandoz Pipeline Application
+
+Reads products, archetypes, version history and FX rates from CSV, Parquet or SQLite
+in the same nested structure as the literals in ``config.py``; products are
+parsed straight into a compact model.ProductTable. Parsed data
+is cached per process, so it survives reruns and sessions, and is only
+re-read when the source file's modification time and content hash change.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+import pandas as pd
+from .config import ARCHETYPES, DATA_SOURCES, FX_RATES, PIPELINE_PRODUCTS, VERSION_HISTORY
+from .profiling import record_cache
+from .model import ProductTable
+
+DEFAULT_DATASETS = {
+    "products": PIPELINE_PRODUCTS,
+    "archetypes": ARCHETYPES,
+    "version_history": VERSION_HISTORY,
+    "fx_rates": FX_RATES,
+}
+
+# Datasets parsed from flat columns into something other than nested records
+DATASET_PARSERS = {"products": ProductTable.from_frame}
+
+# Flat formats store lists as JSON text in these columns
+LIST_COLUMNS = {"changes"}
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+_cache = {}
+_fingerprints = {}
+_lock = threading.Lock()
+
+
+def source_format(path):
+    """Detect the storage format from a file suffix"""
+    suffix = os.path.splitext(str(path))[1].lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in PARQUET_SUFFIXES:
+        return "parquet"
+    if suffix in SQLITE_SUFFIXES:
+        return "sqlite"
+    raise ValueError(f"Unsupported data source format: {path}")
+
+
+def _content_hash(path, block_size=1 << 20):
+    """SHA-1 of a file, read in blocks"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path):
+    """Content hash of a source file, re-hashed only when its mtime or size moves"""
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    marker = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _fingerprints.get(key)
+        if cached and cached[0] == marker:
+            return cached[1]
+    digest = _content_hash(path)
+    with _lock:
+        _fingerprints[key] = (marker, digest)
+    return digest
+
+
+def read_table(path, dataset):
+    """Read one dataset from a source file into a DataFrame"""
+    fmt = source_format(path)
+    if fmt == "csv":
+        return pd.read_csv(path)
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as conn:
+        return pd.read_sql_query(f'SELECT * FROM "{dataset}"', conn)
+
+
+def _decode(column, value):
+    """Convert a flat cell back to its nested value"""
+    if column in LIST_COLUMNS and isinstance(value, str):
+        return json.loads(value)
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def unflatten_records(frame):
+    """Rebuild nested records from dotted column names, dropping empty cells"""
+    columns = [(col, col.split(".")) for col in frame.columns]
+    records = []
+    for row in frame.itertuples(index=False, name=None):
+        record = {}
+        for (col, parts), value in zip(columns, row):
+            if value is None or (isinstance(value, float) and value != value):
+                continue
+            target = record
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = _decode(parts[-1], value)
+        records.append(record)
+    return records
+
+
+def flatten_records(records):
+    """Flatten nested records (or a ProductTable) to dotted columns, encoding lists as JSON"""
+    frame = records.to_frame() if isinstance(records, ProductTable) else pd.json_normalize(records, sep=".")
+    for col in frame.columns:
+        if col.split(".")[-1] in LIST_COLUMNS:
+            frame[col] = frame[col].map(json.dumps)
+    return frame
+
+
+def load_dataset(dataset, path=None):
+    """Load a dataset from its source, using the cached parse when unchanged"""
+    path = path or DATA_SOURCES.get(dataset)
+    if not path:
+        return DEFAULT_DATASETS[dataset]
+
+    fingerprint = source_fingerprint(path)
+    key = (os.path.abspath(path), dataset)
+    with _lock:
+        cached = _cache.get(key)
+    if cached and cached[0] == fingerprint:
+        record_cache("loaders", hit=True)
+        return cached[1]
+
+    record_cache("loaders", hit=False)
+    records = DATASET_PARSERS.get(dataset, unflatten_records)(read_table(path, dataset))
+    with _lock:
+        _cache[key] = (fingerprint, records)
+    return records
+
+
+def portfolio_fingerprint(sources=None):
+    """Combined fingerprint of every configured source, for downstream cache keys"""
+    sources = sources or DATA_SOURCES
+    return tuple(
+        (dataset, source_fingerprint(path) if path else "builtin")
+        for dataset, path in sorted(sources.items())
+    )
+
+
+def load_portfolio_data(sources=None):
+    """Load products, archetypes, version history and FX rates from configured sources"""
+    sources = sources or DATA_SOURCES
+    return {dataset: load_dataset(dataset, sources.get(dataset)) for dataset in DEFAULT_DATASETS}
+
+
+def save_dataset(records, path, dataset):
+    """Write nested records to CSV, Parquet or a SQLite table"""
+    frame = flatten_records(records)
+    fmt = source_format(path)
+    if fmt == "csv":
+        frame.to_csv(path, index=False)
+    elif fmt == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        with closing(sqlite3.connect(path)) as conn:
+            frame.to_sql(dataset, conn, if_exists="replace", index=False)
+            conn.commit()
+
+
+def clear_cache():
+    """Drop every cached parse and fingerprint"""
+    with _lock:
+        _cache.clear()
+        _fingerprints.clear()
@@ -0,0 +1,606 @@
+"""
+Typed product model for Sandoz Pipeline Application
+
+Product records are nested dicts (``assumptions.uptake.y1``, ``pricing``,
+``access``), which suits display and JSON but is heavy in bulk: every
+field is a boxed Python object behind a string key. The same data has two
+compact forms here:
+
+- ``Product`` and its parts are ``__slots__`` dataclasses for single-product
+  access by attribute.
+- ``ProductTable`` holds a portfolio in one NumPy structured array. Repeated
+  strings are codes into per-column pools, launch dates are quarter numbers,
+  numeric assumptions are float64 with a bit mask remembering which were
+  ints, and record fields the model does not name live in a sparse
+  per-row side table.
+
+Records, dataclasses and table rows convert into each other losslessly.
+"""
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from .launch_calendar import parse_quarters, quarter_label
+
+UPTAKE_YEARS = ("y1", "y2", "y3", "y4", "y5")
+ACCESS_TIERS = ("tier1", "tier2", "tier3")
+PRICING_FIELDS = ("wac", "asp", "gtn")
+
+# Record layout covered by the model; anything else is carried as extra
+RECORD_SCHEMA = {
+    "id": None, "name": None, "archetype": None, "phase": None, "launchDate": None,
+    "territory": None, "priority": None, "npv": None,
+    "assumptions": {
+        "uptake": dict.fromkeys(UPTAKE_YEARS),
+        "peakShare": None,
+        "pricing": dict.fromkeys(PRICING_FIELDS),
+        "access": dict.fromkeys(ACCESS_TIERS),
+        "competition": None, "jcode": None, "distribution": None, "marketUnits": None,
+    },
+    "lastUpdated": None, "updatedBy": None,
+}
+
+# Table column -> flat record column, for strings stored as codes into a pool (-1 = absent)
+CATEGORY_COLUMNS = {
+    "archetype": "archetype",
+    "phase": "phase",
+    "territory": "territory",
+    "priority": "priority",
+    "last_updated": "lastUpdated",
+    "updated_by": "updatedBy",
+    "competition": "assumptions.competition",
+    "jcode": "assumptions.jcode",
+    "distribution": "assumptions.distribution",
+}
+REQUIRED_CATEGORIES = ("archetype", "phase", "territory", "priority")
+TEXT_COLUMNS = {"id": "id", "name": "name"}
+
+# Numeric slots in integral-mask bit order: (table column, sub-index, flat record column)
+NUMBER_SLOTS = (
+    [("npv", None, "npv")]
+    + [("uptake", i, f"assumptions.uptake.{year}") for i, year in enumerate(UPTAKE_YEARS)]
+    + [("peak_share", None, "assumptions.peakShare")]
+    + [(name, None, f"assumptions.pricing.{name}") for name in PRICING_FIELDS]
+    + [("access", i, f"assumptions.access.{tier}") for i, tier in enumerate(ACCESS_TIERS)]
+    + [("market_units", None, "assumptions.marketUnits")]
+)
+OPTIONAL_NUMBERS = ("market_units",)
+BIT_WEIGHTS = 1 << np.arange(len(NUMBER_SLOTS), dtype=np.uint32)
+
+# Flat record column -> key, for the scalar columns a store frame is built from
+SCALAR_KEYS = {
+    "id": "id", "name": "name", "archetype": "archetype", "phase": "phase",
+    "launchDate": "launch_quarter", "territory": "territory", "priority": "priority",
+    "npv": "npv", "lastUpdated": "last_updated", "updatedBy": "updated_by",
+}
+
+
+@dataclass(slots=True)
+class Pricing:
+    wac: float
+    asp: float
+    gtn: float
+
+
+@dataclass(slots=True)
+class Access:
+    tier1: float
+    tier2: float
+    tier3: float
+
+
+@dataclass(slots=True)
+class Assumptions:
+    uptake: tuple
+    peak_share: float
+    pricing: Pricing
+    access: Access
+    competition: str | None = None
+    jcode: str | None = None
+    distribution: str | None = None
+    market_units: float | None = None
+
+
+@dataclass(slots=True)
+class Product:
+    """One product; ``extra`` holds record fields outside the model (e.g. assumptions.uncertainty)"""
+
+    id: str
+    name: str
+    archetype: str
+    phase: str
+    launch_date: str
+    territory: str
+    priority: str
+    npv: float
+    assumptions: Assumptions
+    last_updated: str | None = None
+    updated_by: str | None = None
+    extra: dict | None = None
+
+    @classmethod
+    def from_record(cls, record):
+        """Product from a nested record dict"""
+        a = record["assumptions"]
+        return cls(
+            id=record["id"],
+            name=record["name"],
+            archetype=record["archetype"],
+            phase=record["phase"],
+            launch_date=record["launchDate"],
+            territory=record["territory"],
+            priority=record["priority"],
+            npv=record["npv"],
+            assumptions=Assumptions(
+                uptake=tuple(a["uptake"][year] for year in UPTAKE_YEARS),
+                peak_share=a["peakShare"],
+                pricing=Pricing(*(a["pricing"][name] for name in PRICING_FIELDS)),
+                access=Access(*(a["access"][tier] for tier in ACCESS_TIERS)),
+                competition=a.get("competition"),
+                jcode=a.get("jcode"),
+                distribution=a.get("distribution"),
+                market_units=a.get("marketUnits"),
+            ),
+            last_updated=record.get("lastUpdated"),
+            updated_by=record.get("updatedBy"),
+            extra=_unmodelled(record, RECORD_SCHEMA) or None,
+        )
+
+    def to_record(self):
+        """Nested record dict in the layout of config.PIPELINE_PRODUCTS"""
+        a = self.assumptions
+        assumptions = {
+            "uptake": dict(zip(UPTAKE_YEARS, a.uptake)),
+            "peakShare": a.peak_share,
+            "pricing": {"wac": a.pricing.wac, "asp": a.pricing.asp, "gtn": a.pricing.gtn},
+            "access": {"tier1": a.access.tier1, "tier2": a.access.tier2, "tier3": a.access.tier3},
+        }
+        for key, value in (("competition", a.competition), ("jcode", a.jcode),
+                           ("distribution", a.distribution), ("marketUnits", a.market_units)):
+            if value is not None:
+                assumptions[key] = value
+        record = {
+            "id": self.id, "name": self.name, "archetype": self.archetype, "phase": self.phase,
+            "launchDate": self.launch_date, "territory": self.territory, "priority": self.priority,
+            "npv": self.npv, "assumptions": assumptions,
+        }
+        if self.last_updated is not None:
+            record["lastUpdated"] = self.last_updated
+        if self.updated_by is not None:
+            record["updatedBy"] = self.updated_by
+        return _merge_extra(record, self.extra) if self.extra else record
+
+    def numbers(self):
+        """Numeric fields in NUMBER_SLOTS order"""
+        a = self.assumptions
+        return (self.npv, *a.uptake, a.peak_share, a.pricing.wac, a.pricing.asp, a.pricing.gtn,
+                a.access.tier1, a.access.tier2, a.access.tier3, a.market_units)
+
+
+def _unmodelled(record, schema):
+    """Nested dict of the parts of a record not covered by a schema"""
+    extra = {}
+    for key, value in record.items():
+        if key not in schema:
+            extra[key] = value
+        elif isinstance(schema[key], dict) and isinstance(value, dict):
+            nested = _unmodelled(value, schema[key])
+            if nested:
+                extra[key] = nested
+    return extra
+
+
+def _merge_extra(record, extra):
+    for key, value in extra.items():
+        if isinstance(value, dict) and isinstance(record.get(key), dict):
+            record[key] = _merge_extra(dict(record[key]), value)
+        else:
+            record[key] = value
+    return record
+
+
+def _integral_mask(values):
+    """Bit mask of which values in a numeric row are Python ints"""
+    return sum(1 << i for i, v in enumerate(values) if isinstance(v, (int, np.integer)) and not isinstance(v, bool))
+
+
+def _table_dtype(id_width, name_width):
+    return np.dtype(
+        [("id", f"S{max(id_width, 1)}"), ("name", f"S{max(name_width, 1)}")]
+        + [(col, "i4") for col in CATEGORY_COLUMNS]
+        + [("launch_quarter", "i4"), ("npv", "f8"), ("uptake", "f8", (len(UPTAKE_YEARS),)),
+           ("peak_share", "f8"), ("wac", "f8"), ("asp", "f8"), ("gtn", "f8"),
+           ("access", "f8", (len(ACCESS_TIERS),)), ("market_units", "f8"), ("integral", "u4")]
+    )
+
+
+def _encode_text(values):
+    return np.array([str(v).encode("utf-8") for v in values], dtype=bytes)
+
+
+class ProductTable:
+    """Portfolio of products in one structured array with string pools and sparse extras"""
+
+    def __init__(self, rows, categories, extras=None):
+        self.rows = rows
+        self.categories = {col: list(pool) for col, pool in categories.items()}
+        self._codes = {col: {value: i for i, value in enumerate(pool)} for col, pool in self.categories.items()}
+        self.extras = dict(extras or {})
+
+    # -- construction -------------------------------------------------------------
+
+    @classmethod
+    def _build(cls, text, categories, launch_dates, numbers, integral, extras):
+        """Assemble a table from decoded column arrays"""
+        ids, names = _encode_text(text["id"]), _encode_text(text["name"])
+        rows = np.zeros(len(ids), dtype=_table_dtype(ids.dtype.itemsize, names.dtype.itemsize))
+        rows["id"], rows["name"] = ids, names
+        pools = {}
+        for col, values in categories.items():
+            codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+            if col in REQUIRED_CATEGORIES and (codes < 0).any():
+                raise ValueError(f"Products are missing {CATEGORY_COLUMNS[col]}")
+            rows[col] = codes
+            pools[col] = [str(v) for v in uniques]
+        rows["launch_quarter"] = parse_quarters(launch_dates)
+        for bit, (col, index, flat) in enumerate(NUMBER_SLOTS):
+            if col not in OPTIONAL_NUMBERS and np.isnan(numbers[:, bit]).any():
+                raise ValueError(f"Products are missing {flat}")
+            if index is None:
+                rows[col] = numbers[:, bit]
+            else:
+                rows[col][:, index] = numbers[:, bit]
+        rows["integral"] = integral
+        return cls(rows, pools, extras)
+
+    @classmethod
+    def from_products(cls, products):
+        """Table from Product dataclasses"""
+        products = list(products)
+        numbers = [p.numbers() for p in products]
+        a = [p.assumptions for p in products]
+        return cls._build(
+            text={"id": [p.id for p in products], "name": [p.name for p in products]},
+            categories={
+                "archetype": [p.archetype for p in products],
+                "phase": [p.phase for p in products],
+                "territory": [p.territory for p in products],
+                "priority": [p.priority for p in products],
+                "last_updated": [p.last_updated for p in products],
+                "updated_by": [p.updated_by for p in products],
+                "competition": [x.competition for x in a],
+                "jcode": [x.jcode for x in a],
+                "distribution": [x.distribution for x in a],
+            },
+            launch_dates=[p.launch_date for p in products],
+            numbers=np.array(numbers, dtype=float).reshape(len(products), len(NUMBER_SLOTS)),
+            integral=np.array([_integral_mask(n) for n in numbers], dtype=np.uint32),
+            extras={i: p.extra for i, p in enumerate(products) if p.extra},
+        )
+
+    @classmethod
+    def from_records(cls, records):
+        """Table from nested record dicts"""
+        return cls.from_products(Product.from_record(r) for r in records)
+
+    @classmethod
+    def from_frame(cls, frame):
+        """Table from a flat DataFrame with dotted column names, as stored by the loaders"""
+        known = set(TEXT_COLUMNS.values()) | set(CATEGORY_COLUMNS.values()) | {"launchDate"}
+        known |= {flat for _, _, flat in NUMBER_SLOTS}
+        missing = [col for col in ("id", "name", "launchDate") if col not in frame.columns]
+        if missing:
+            raise ValueError(f"Products are missing {', '.join(missing)}")
+        n = len(frame)
+
+        def column(name):
+            return frame[name] if name in frame.columns else pd.Series([np.nan] * n, dtype=float)
+
+        numbers = np.column_stack([column(flat).to_numpy(float) for _, _, flat in NUMBER_SLOTS]) \
+            if n else np.empty((0, len(NUMBER_SLOTS)))
+        integer_columns = np.array(
+            [flat in frame.columns and pd.api.types.is_integer_dtype(frame[flat]) for _, _, flat in NUMBER_SLOTS]
+        )
+        integral = np.where(integer_columns, BIT_WEIGHTS, 0).sum().astype(np.uint32)
+
+        extras = {}
+        extra_columns = [col for col in frame.columns if col not in known]
+        if extra_columns:
+            for i, row in enumerate(frame[extra_columns].itertuples(index=False, name=None)):
+                extra = {}
+                for col, value in zip(extra_columns, row):
+                    if value is None or (isinstance(value, float) and value != value):
+                        continue
+                    target = extra
+                    *parents, leaf = col.split(".")
+                    for part in parents:
+                        target = target.setdefault(part, {})
+                    target[leaf] = value.item() if hasattr(value, "item") else value
+                if extra:
+                    extras[i] = extra
+
+        return cls._build(
+            text={key: column(flat).astype(str).to_numpy() for key, flat in TEXT_COLUMNS.items()},
+            categories={
+                col: column(flat).astype(object).where(column(flat).notna(), None).to_numpy()
+                for col, flat in CATEGORY_COLUMNS.items()
+            },
+            launch_dates=frame["launchDate"].astype(str).to_numpy(),
+            numbers=numbers,
+            integral=np.full(n, integral, dtype=np.uint32),
+            extras=extras,
+        )
+
+    @classmethod
+    def concat(cls, tables):
+        """One table from several, re-coding categories into shared pools"""
+        tables = list(tables)
+        widths = {col: max([t.rows.dtype[col].itemsize for t in tables] + [1]) for col in TEXT_COLUMNS}
+        dtype = _table_dtype(widths["id"], widths["name"])
+        table = cls(np.zeros(sum(len(t) for t in tables), dtype=dtype), {col: [] for col in CATEGORY_COLUMNS})
+        offset = 0
+        for part in tables:
+            rows = table.rows[offset:offset + len(part)]
+            for name in dtype.names:
+                rows[name] = part.rows[name]
+            for col in CATEGORY_COLUMNS:
+                # The trailing -1 keeps absent values (code -1) absent
+                recode = np.array([table._code(col, value) for value in part.categories[col]] + [-1], dtype=np.int32)
+                rows[col] = recode[part.rows[col]]
+            table.extras.update({offset + pos: extra for pos, extra in part.extras.items()})
+            offset += len(rows)
+        return table
+
+    def upsert(self, other):
+        """New table where other's products replace rows with the same ID and the rest are appended"""
+        combined = ProductTable.concat([self, other])
+        n = len(self)
+        targets = pd.Index(self.rows["id"]).get_indexer(other.rows["id"])
+        order = np.arange(n)
+        order[targets[targets >= 0]] = n + np.flatnonzero(targets >= 0)
+        order = np.concatenate([order, n + np.flatnonzero(targets < 0)])
+        moved = np.full(len(combined), -1)
+        moved[order] = np.arange(len(order))
+        extras = {int(moved[pos]): extra for pos, extra in combined.extras.items() if moved[pos] >= 0}
+        return ProductTable(combined.rows[order], combined.categories, extras)
+
+    # -- access -------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the structured array (pools and extras are small by comparison)"""
+        return self.rows.nbytes
+
+    def _category(self, col, code):
+        return None if code < 0 else self.categories[col][code]
+
+    def _decode_category(self, col):
+        # Code -1 (absent) picks the trailing None
+        return np.array(self.categories[col] + [None], dtype=object)[self.rows[col]]
+
+    def product(self, pos):
+        """Product dataclass for one row"""
+        # One item() call unpacks the whole row; fields follow _table_dtype order
+        (pid, name, *codes, quarter, npv, uptake, peak_share, wac, asp, gtn, access,
+         market_units, mask) = self.rows[pos].item()
+        values = [npv, *uptake.tolist(), peak_share, wac, asp, gtn, *access.tolist(), market_units]
+        for bit, value in enumerate(values):
+            if value != value:
+                values[bit] = None
+            elif mask >> bit & 1:
+                values[bit] = int(value)
+        npv, *uptake = values[:1 + len(UPTAKE_YEARS)]
+        peak_share, wac, asp, gtn, tier1, tier2, tier3, market_units = values[1 + len(UPTAKE_YEARS):]
+        category = {col: self._category(col, code) for col, code in zip(CATEGORY_COLUMNS, codes)}
+        extra = self.extras.get(pos)
+        return Product(
+            id=pid.decode("utf-8"),
+            name=name.decode("utf-8"),
+            archetype=category["archetype"],
+            phase=category["phase"],
+            launch_date=quarter_label(quarter),
+            territory=category["territory"],
+            priority=category["priority"],
+            npv=npv,
+            assumptions=Assumptions(
+                uptake=tuple(uptake),
+                peak_share=peak_share,
+                pricing=Pricing(wac, asp, gtn),
+                access=Access(tier1, tier2, tier3),
+                competition=category["competition"],
+                jcode=category["jcode"],
+                distribution=category["distribution"],
+                market_units=market_units,
+            ),
+            last_updated=category["last_updated"],
+            updated_by=category["updated_by"],
+            extra=_merge_extra({}, extra) if extra else None,
+        )
+
+    def record(self, pos):
+        """Nested record dict for one row"""
+        return self.product(pos).to_record()
+
+    def products(self):
+        """Product dataclasses for every row"""
+        return [self.product(pos) for pos in range(len(self))]
+
+    def to_records(self):
+        """Nested record dicts for every row"""
+        return [self.record(pos) for pos in range(len(self))]
+
+    def column(self, key):
+        """Decoded values of one scalar record column (see SCALAR_KEYS) for every row"""
+        col = SCALAR_KEYS[key]
+        values = self.rows[col]
+        if col in TEXT_COLUMNS:
+            return np.array([v.decode("utf-8") for v in values], dtype=object)
+        if col in CATEGORY_COLUMNS:
+            return self._decode_category(col)
+        if col == "launch_quarter":
+            return np.array([quarter_label(int(q)) for q in values], dtype=object)
+        return values.copy()
+
+    def assumption_columns(self):
+        """Valuation inputs as column arrays, as build_assumption_arrays stacks them from records"""
+        return {
+            "id": self.column("id"),
+            "npv": self.rows["npv"].copy(),
+            "uptake": self.rows["uptake"].copy(),
+            "peak_share": self.rows["peak_share"].copy(),
+            "wac": self.rows["wac"].copy(),
+            "asp": self.rows["asp"].copy(),
+            "gtn": self.rows["gtn"].copy(),
+            "access": self.rows["access"].copy(),
+            "launch_quarter": self.rows["launch_quarter"].astype(np.int64),
+            "market_units": self.rows["market_units"].copy(),
+            "territory": self.column("territory"),
+        }
+
+    def to_frame(self):
+        """Flat DataFrame with dotted column names, the inverse of from_frame"""
+        frame = pd.DataFrame({flat: self.column(key) for key, flat in TEXT_COLUMNS.items()})
+        for col, flat in CATEGORY_COLUMNS.items():
+            frame[flat] = self._decode_category(col)
+        frame["launchDate"] = self.column("launchDate")
+        for bit, (col, index, flat) in enumerate(NUMBER_SLOTS):
+            values = self.rows[col] if index is None else self.rows[col][:, index]
+            integral = (self.rows["integral"] >> bit & 1).astype(bool)
+            if len(values) and integral.all() and not np.isnan(values).any():
+                values = values.astype(np.int64)
+            frame[flat] = values
+        # Optional columns no product uses are left out, as flatten_records would
+        optional = [flat for col, flat in CATEGORY_COLUMNS.items() if col not in REQUIRED_CATEGORIES]
+        optional += [flat for col, _, flat in NUMBER_SLOTS if col in OPTIONAL_NUMBERS]
+        frame = frame.drop(columns=[col for col in optional if frame[col].isna().all()])
+        if self.extras:
+            extra = pd.json_normalize([self.extras.get(i, {}) for i in range(len(self))], sep=".")
+            frame = pd.concat([frame, extra], axis=1)
+        return frame
+
+    # -- edits --------------------------------------------------------------------
+
+    def _code(self, col, value):
+        if pd.isna(value):
+            return -1
+        code = self._codes[col].get(value)
+        if code is None:
+            code = len(self.categories[col])
+            self.categories[col].append(value)
+            self._codes[col][value] = code
+        return code
+
+    def _fit_text(self, col, encoded):
+        """Widen a fixed-width text column when a longer value arrives"""
+        width = self.rows.dtype[col].itemsize
+        if len(encoded) > width:
+            widths = {name: self.rows.dtype[name].itemsize for name in TEXT_COLUMNS}
+            widths[col] = len(encoded)
+            self.rows = self.rows.astype(_table_dtype(widths["id"], widths["name"]))
+
+    def set_product(self, pos, product):
+        """Overwrite one row from a Product dataclass
+
+        Every value is parsed before the row is touched, so a bad launch
+        quarter or number, or a missing required field, raises with the row
+        unchanged (with the same message as a bulk build).
+        """
+        quarter = parse_quarters([product.launch_date])[0]
+        numbers = product.numbers()
+        values = [np.nan if value is None else float(value) for value in numbers]
+        texts = {col: str(getattr(product, col)).encode("utf-8") for col in TEXT_COLUMNS}
+        a = product.assumptions
+        owners = {"competition": a, "jcode": a, "distribution": a}
+        categories = {col: getattr(owners.get(col, product), col) for col in CATEGORY_COLUMNS}
+        for col in REQUIRED_CATEGORIES:
+            if pd.isna(categories[col]):
+                raise ValueError(f"Products are missing {CATEGORY_COLUMNS[col]}")
+        for value, (col, _, flat) in zip(values, NUMBER_SLOTS):
+            if col not in OPTIONAL_NUMBERS and np.isnan(value):
+                raise ValueError(f"Products are missing {flat}")
+
+        for col, encoded in texts.items():
+            self._fit_text(col, encoded)
+            self.rows[col][pos] = encoded
+        for col, value in categories.items():
+            self.rows[col][pos] = self._code(col, value)
+        self.rows["launch_quarter"][pos] = quarter
+        for value, (col, index, _) in zip(values, NUMBER_SLOTS):
+            if index is None:
+                self.rows[col][pos] = value
+            else:
+                self.rows[col][pos, index] = value
+        self.rows["integral"][pos] = _integral_mask(numbers)
+        if product.extra:
+            self.extras[pos] = product.extra
+        else:
+            self.extras.pop(pos, None)
+
+    def set_number(self, pos, flat, value):
+        """Overwrite one numeric field, addressed by its flat record column"""
+        for bit, (col, index, name) in enumerate(NUMBER_SLOTS):
+            if name == flat:
+                break
+        else:
+            raise KeyError(f"Not a numeric product field: {flat}")
+        if index is None:
+            self.rows[col][pos] = np.nan if value is None else float(value)
+        else:
+            self.rows[col][pos, index] = np.nan if value is None else float(value)
+        mask = int(self.rows["integral"][pos]) & ~(1 << bit)
+        self.rows["integral"][pos] = mask | _integral_mask([value]) << bit
+
+    def set_record(self, pos, record):
+        """Overwrite one row from a nested record dict"""
+        self.set_product(pos, Product.from_record(record))
+
+    def copy(self):
+        """Independent copy, e.g. a frozen snapshot before further edits"""
+        return ProductTable(self.rows.copy(), self.categories, self.extras)
+
+
+class ProductRecords(Sequence):
+    """List-like view of a table as nested record dicts, materialized per access"""
+
+    def __init__(self, table):
+        self.table = table
+
+    def __len__(self):
+        return len(self.table)
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [self.table.record(i) for i in range(*pos.indices(len(self)))]
+        if pos < 0:
+            pos += len(self)
+        if not 0 <= pos < len(self):
+            raise IndexError("product position out of range")
+        return self.table.record(pos)
+
+    def __setitem__(self, pos, record):
+        self.table.set_record(pos, record)
+
+
+class RecordMap(Mapping):
+    """Read-only product ID -> record mapping over a table"""
+
+    def __init__(self, table):
+        self.table = table
+        self.index = {pid: pos for pos, pid in enumerate(table.column("id"))}
+
+    def __getitem__(self, product_id):
+        return self.table.record(self.index[product_id])
+
+    def __contains__(self, product_id):
+        return product_id in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
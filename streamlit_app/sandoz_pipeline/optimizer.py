@@ -0,0 +1,235 @@
+"""
+Portfolio selection optimizer for Sandoz Pipeline Application
+
+Chooses which products to launch, and in which quarter, to maximize total
+risk-adjusted NPV under a launch-cost budget and a cap on launches per
+quarter. Each product can be dropped, launched in its planned quarter or
+slipped by up to ``max_delay`` quarters, which discounts its value at the
+product's own discount rate.
+
+Two solvers share one problem layout (a value per product and delay, a
+cost per product, planned quarters):
+
+- ``branch_and_bound`` is exact. Products are explored in value-density
+  order and a node is pruned when a fractional-knapsack bound on the
+  remaining budget (capacity relaxed) cannot beat the incumbent.
+- ``greedy`` serves thousands of candidates. It fills the budget in
+  value-density order and in value order, placing each product in its best
+  quarter with capacity left, and keeps the better of the two.
+
+``method="auto"`` picks the exact solver up to
+``OPTIMIZER_CONFIG["exact_max_products"]`` eligible products.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from .config import OPTIMIZER_CONFIG, PRIORITY_COLORS
+from .launch_calendar import quarter_label
+
+OPTIMIZER_METHODS = ("auto", "branch_and_bound", "greedy")
+
+
+def launch_costs(store, config=OPTIMIZER_CONFIG):
+    """Launch cost per product: archetype default, or the product's assumptions.launchCost"""
+    costs = (
+        store.frame["archetype"].astype(object).map(config["launch_costs"])
+        .fillna(config["default_launch_cost"]).to_numpy(float)
+    )
+    for pos, extra in store.table.extras.items():
+        cost = extra.get("assumptions", {}).get("launchCost")
+        if cost is not None:
+            costs[pos] = float(cost)
+    return costs
+
+
+def launch_candidates(store, max_delay=None, config=OPTIMIZER_CONFIG):
+    """Optimizer inputs for every product in a store
+
+    ``values`` is rNPV (phases.risk_adjust) in the reporting currency,
+    shaped (products, max_delay + 1), with column d discounted for a
+    further d-quarter slip.
+    """
+    max_delay = config["max_delay"] if max_delay is None else max_delay
+    arrays = store.arrays
+    risked = store.risk_adjustment()["rnpv"] * arrays["fx_rate"]
+    delays = np.arange(max_delay + 1)
+    return {
+        "ids": store.frame["id"].to_numpy(),
+        "values": risked[:, None] * (1 + arrays["discount_rate"][:, None]) ** (-delays / 4),
+        "costs": launch_costs(store, config),
+        "quarters": store.table.rows["launch_quarter"].astype(np.int64),
+        "priority": store.frame["priority"].astype(object).to_numpy(),
+    }
+
+
+def _eligible(values, costs, budget):
+    """Products worth considering: positive value and affordable on their own"""
+    return np.flatnonzero((values.max(axis=1) > 0) & (costs <= budget))
+
+
+def branch_and_bound(values, costs, quarters, budget, capacity, node_limit=None):
+    """Exact selection, returns (delay per product or -1, nodes explored, proven optimal)"""
+    node_limit = node_limit or OPTIMIZER_CONFIG["node_limit"]
+    items = _eligible(values, costs, budget)
+    best = values[items].max(axis=1)
+    order = np.argsort(-best / np.maximum(costs[items], 1e-12), kind="stable")
+    items, best = items[order], best[order]
+    item_values = values[items].tolist()
+    item_costs = costs[items].tolist()
+    item_quarters = quarters[items].tolist()
+    options = np.argsort(-values[items], axis=1, kind="stable").tolist()
+    best = best.tolist()
+    m = len(items)
+
+    used = {}
+    choice = [-1] * m
+    incumbent = {"value": 0.0, "choice": list(choice)}
+    nodes = 0
+
+    def bound(k, remaining):
+        # Fractional knapsack over the rest in density order, ignoring quarter capacity
+        total = 0.0
+        for j in range(k, m):
+            if item_costs[j] <= remaining:
+                total += best[j]
+                remaining -= item_costs[j]
+            else:
+                return total + best[j] * remaining / item_costs[j]
+        return total
+
+    def search(k, value, remaining):
+        nonlocal nodes
+        nodes += 1
+        if value > incumbent["value"]:
+            incumbent["value"], incumbent["choice"] = value, list(choice)
+        if k == m or nodes > node_limit or value + bound(k, remaining) <= incumbent["value"] + 1e-9:
+            return
+        if item_costs[k] <= remaining:
+            for delay in options[k]:
+                if item_values[k][delay] <= 0:
+                    break
+                quarter = item_quarters[k] + delay
+                if used.get(quarter, 0) < capacity:
+                    used[quarter] = used.get(quarter, 0) + 1
+                    choice[k] = delay
+                    search(k + 1, value + item_values[k][delay], remaining - item_costs[k])
+                    choice[k] = -1
+                    used[quarter] -= 1
+        search(k + 1, value, remaining)
+
+    search(0, 0.0, float(budget))
+    delay = np.full(len(values), -1, dtype=np.int64)
+    delay[items] = incumbent["choice"]
+    return delay, nodes, nodes <= node_limit
+
+
+def _fill(values, costs, quarters, budget, capacity, order):
+    """Take products in order while budget allows, each in its best quarter with capacity left"""
+    delay = np.full(len(values), -1, dtype=np.int64)
+    options = np.argsort(-values[order], axis=1, kind="stable")
+    remaining, used, total = float(budget), {}, 0.0
+    for i, item_options in zip(order.tolist(), options.tolist()):
+        if costs[i] > remaining:
+            continue
+        for d in item_options:
+            if values[i, d] <= 0:
+                break
+            quarter = quarters[i] + d
+            if used.get(quarter, 0) < capacity:
+                used[quarter] = used.get(quarter, 0) + 1
+                delay[i] = d
+                remaining -= costs[i]
+                total += values[i, d]
+                break
+    return delay, total
+
+
+def greedy(values, costs, quarters, budget, capacity):
+    """Heuristic selection: the better of value-density and value-ordered fills"""
+    items = _eligible(values, costs, budget)
+    best = values[items].max(axis=1)
+    by_density = items[np.argsort(-best / np.maximum(costs[items], 1e-12), kind="stable")]
+    by_value = items[np.argsort(-best, kind="stable")]
+    fills = [_fill(values, costs, quarters, budget, capacity, order) for order in (by_density, by_value)]
+    return max(fills, key=lambda fill: fill[1])[0]
+
+
+def priority_ranking(candidates, budget, capacity):
+    """Selection by priority label then NPV in planned quarters, the ranking the optimizer replaces"""
+    rank = {label: i for i, label in enumerate(PRIORITY_COLORS)}
+    values = candidates["values"][:, :1]
+    priority = np.array([rank.get(p, len(rank)) for p in candidates["priority"]])
+    order = np.lexsort((-values[:, 0], priority))
+    order = order[values[order, 0] > 0]
+    delay, _ = _fill(values, candidates["costs"], candidates["quarters"], budget, capacity, order)
+    return delay
+
+
+def summarize(candidates, delay):
+    """Totals of a selection: products, risk-adjusted value, cost and launches per quarter"""
+    selected = delay >= 0
+    rows = np.flatnonzero(selected)
+    quarters = candidates["quarters"][rows] + delay[rows]
+    labels, counts = np.unique(quarters, return_counts=True)
+    return {
+        "selected": int(selected.sum()),
+        "value": float(candidates["values"][rows, delay[rows]].sum()),
+        "cost": float(candidates["costs"][rows].sum()),
+        "launches": {quarter_label(int(q)): int(c) for q, c in zip(labels, counts)},
+    }
+
+
+def optimize_portfolio(candidates, budget=None, capacity=None, method="auto", config=OPTIMIZER_CONFIG):
+    """Select products and launch quarters maximizing risk-adjusted NPV
+
+    ``candidates`` comes from launch_candidates(). Returns the delay per
+    product (-1 = not selected), the selection totals, the budget and
+    capacity applied, the solver used, whether the result is proven
+    optimal, nodes explored and elapsed time.
+    """
+    if method not in OPTIMIZER_METHODS:
+        raise ValueError(f"Unknown optimizer method: {method}")
+    budget = config["budget"] if budget is None else float(budget)
+    capacity = config["quarter_capacity"] if capacity is None else int(capacity)
+    if budget < 0 or capacity < 0:
+        raise ValueError("Budget and quarter capacity must not be negative")
+    values, costs, quarters = candidates["values"], candidates["costs"], candidates["quarters"]
+    if method == "auto":
+        small = len(_eligible(values, costs, budget)) <= config["exact_max_products"]
+        method = "branch_and_bound" if small else "greedy"
+
+    start = time.perf_counter()
+    if method == "branch_and_bound":
+        delay, nodes, optimal = branch_and_bound(values, costs, quarters, budget, capacity, config["node_limit"])
+    else:
+        delay, nodes, optimal = greedy(values, costs, quarters, budget, capacity), 0, False
+    elapsed = time.perf_counter() - start
+    return {
+        "delay": delay,
+        **summarize(candidates, delay),
+        "budget": budget,
+        "capacity": capacity,
+        "method": method,
+        "optimal": optimal,
+        "nodes": nodes,
+        "elapsed": elapsed,
+    }
+
+
+def selection_frame(store, candidates, delay):
+    """Selected products with planned and optimized launch quarters, by risk-adjusted NPV"""
+    rows = np.flatnonzero(delay >= 0)
+    frame = pd.DataFrame({
+        "id": candidates["ids"][rows],
+        "name": store.frame["name"].to_numpy()[rows],
+        "phase": store.frame["phase"].astype(object).to_numpy()[rows],
+        "priority": candidates["priority"][rows],
+        "planned_launch": [quarter_label(int(q)) for q in candidates["quarters"][rows]],
+        "launch": [quarter_label(int(q)) for q in candidates["quarters"][rows] + delay[rows]],
+        "delay_quarters": delay[rows],
+        "risk_adjusted_npv": candidates["values"][rows, delay[rows]],
+        "launch_cost": candidates["costs"][rows],
+    })
+    return frame.sort_values("risk_adjusted_npv", ascending=False, ignore_index=True)
@@ -0,0 +1,66 @@
+"""
+Development phase model for Sandoz Pipeline Application
+
+Each phase in ``PHASE_MODEL`` carries a probability of success (reaching
+launch) and a typical time to launch. Risk-adjusted NPV (rNPV) weights a
+product's NPV by its phase's probability of success and, when the planned
+launch is sooner than the phase allows, discounts it for the slip:
+
+    rNPV = NPV * PoS * (1 + discount rate) ** -(slip quarters / 4)
+    slip = max(0, valuation quarter + quarters to launch - planned launch quarter)
+
+Phase parameters are looked up once per distinct phase and broadcast by
+category code, so the whole portfolio is risk-adjusted in a few array
+operations.
+"""
+
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+from .config import PHASE_MODEL, VALUATION_CONFIG
+from .launch_calendar import quarter_number
+
+
+class Phase(Enum):
+    PRE_LAUNCH = "Pre-Launch"
+    FILED = "Filed"
+    PHASE_3 = "Phase 3"
+
+    @property
+    def color(self):
+        return PHASE_MODEL[self.value]["color"]
+
+    @property
+    def probability_of_success(self):
+        return PHASE_MODEL[self.value]["probability_of_success"]
+
+    @property
+    def quarters_to_launch(self):
+        return PHASE_MODEL[self.value]["quarters_to_launch"]
+
+
+def phase_parameters(phases, model=PHASE_MODEL):
+    """Probability of success and quarters to launch per product
+
+    ``phases`` may be labels or a categorical column. Phases outside the
+    model are left unadjusted (probability 1, no time to launch).
+    """
+    categorical = phases.array if isinstance(phases, pd.Series) else phases
+    if not isinstance(categorical, pd.Categorical):
+        categorical = pd.Categorical(np.asarray(phases, dtype=object))
+    specs = [model.get(phase, {}) for phase in categorical.categories]
+    # The trailing entry serves code -1 (missing phase)
+    probability = np.array([spec.get("probability_of_success", 1.0) for spec in specs] + [1.0])
+    quarters = np.array([spec.get("quarters_to_launch", 0) for spec in specs] + [0], dtype=np.int64)
+    codes = categorical.codes
+    return probability[codes], quarters[codes]
+
+
+def risk_adjust(npv, phases, launch_quarters, discount_rate, config=VALUATION_CONFIG, model=PHASE_MODEL):
+    """Phase probability of success, launch slip in quarters and rNPV for every product"""
+    probability, quarters_to_launch = phase_parameters(phases, model)
+    earliest = quarter_number(config["valuation_date"]) + quarters_to_launch
+    slip = np.maximum(earliest - np.asarray(launch_quarters, dtype=np.int64), 0)
+    rnpv = np.asarray(npv, dtype=float) * probability * (1 + np.asarray(discount_rate, dtype=float)) ** (-slip / 4)
+    return {"probability_of_success": probability, "slip_quarters": slip, "rnpv": rnpv}
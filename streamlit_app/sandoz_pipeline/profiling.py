@@ -0,0 +1,151 @@
+"""
+Rerun profiling for Sandoz Pipeline Application
+
+Times named sections of a script run, recording wall time, the change in
+allocated memory blocks and cache hits/misses, keeps a rolling history of
+runs and exports it as Chrome trace-event JSON (chrome://tracing, Perfetto).
+
+Cache hits/misses are counted on the profiler whose run is active on the
+calling thread, so concurrent sessions never see each other's lookups.
+"""
+
+import functools
+import json
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+# Profiler with a run in progress on each thread (Streamlit runs each session's script on its own thread)
+_ACTIVE = threading.local()
+
+
+def _active_counters():
+    profiler = getattr(_ACTIVE, "profiler", None)
+    return profiler.cache_counters if profiler is not None else None
+
+
+def record_cache(name, hit):
+    """Count one cache lookup on the active profiler, if any"""
+    counters = _active_counters()
+    if counters is not None:
+        counters[f"{name}.{'hit' if hit else 'miss'}"] += 1
+
+
+def tracked_call(name, func, *args, **kwargs):
+    """Call a cached function that records its own misses, counting a hit otherwise"""
+    counters = _active_counters()
+    if counters is None:
+        return func(*args, **kwargs)
+    misses = counters[f"{name}.miss"]
+    result = func(*args, **kwargs)
+    if counters[f"{name}.miss"] == misses:
+        record_cache(name, hit=True)
+    return result
+
+
+class Profiler:
+    """Section timer with a rolling history of runs"""
+
+    def __init__(self, history_size=50):
+        self.history = deque(maxlen=history_size)
+        self.current = None
+        self.enabled = False
+        self.cache_counters = Counter()  # keyed "<cache>.hit" / "<cache>.miss"
+        self._depth = 0
+
+    def _cache_totals(self):
+        hits = sum(v for k, v in self.cache_counters.items() if k.endswith(".hit"))
+        misses = sum(v for k, v in self.cache_counters.items() if k.endswith(".miss"))
+        return hits, misses
+
+    def begin_run(self, label="rerun"):
+        """Start recording a new run, counting this thread's cache lookups"""
+        _ACTIVE.profiler = self
+        self.current = {
+            "label": label,
+            "started_at": time.time(),
+            "start": time.perf_counter(),
+            "spans": [],
+        }
+        self._depth = 0
+
+    def end_run(self):
+        """Finish the current run and add it to the history"""
+        run = self.current
+        if run is None:
+            return None
+        run["duration"] = time.perf_counter() - run["start"]
+        self.history.append(run)
+        self.current = None
+        _ACTIVE.profiler = None
+        return run
+
+    @contextmanager
+    def section(self, name):
+        """Time a named section; outside a run (e.g. a fragment rerun) it becomes its own run"""
+        if not self.enabled:
+            yield
+            return
+        implicit = self.current is None
+        if implicit:
+            self.begin_run(f"fragment:{name}")
+        run = self.current
+        hits, misses = self._cache_totals()
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            end = time.perf_counter()
+            end_hits, end_misses = self._cache_totals()
+            run["spans"].append({
+                "name": name,
+                "start": start - run["start"],
+                "duration": end - start,
+                "depth": self._depth,
+                "alloc_blocks": sys.getallocatedblocks() - blocks,
+                "cache_hits": end_hits - hits,
+                "cache_misses": end_misses - misses,
+            })
+            if implicit:
+                self.end_run()
+
+    def wrap(self, name):
+        """Decorator form of section()"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.section(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def last_run(self):
+        """Most recently completed run, or None"""
+        return self.history[-1] if self.history else None
+
+
+def chrome_trace(runs, pid=1):
+    """Chrome trace-event JSON for a sequence of runs"""
+    events = []
+    for index, run in enumerate(runs):
+        origin = run["started_at"] * 1e6
+        events.append({
+            "name": run["label"], "cat": "run", "ph": "X", "pid": pid, "tid": 0,
+            "ts": origin, "dur": run.get("duration", 0) * 1e6, "args": {"run": index},
+        })
+        for span in run["spans"]:
+            events.append({
+                "name": span["name"], "cat": "section", "ph": "X", "pid": pid, "tid": 0,
+                "ts": origin + span["start"] * 1e6, "dur": span["duration"] * 1e6,
+                "args": {
+                    "alloc_blocks": span["alloc_blocks"],
+                    "cache_hits": span["cache_hits"],
+                    "cache_misses": span["cache_misses"],
+                },
+            })
+    return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
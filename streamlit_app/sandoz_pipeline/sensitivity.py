@@ -0,0 +1,100 @@
+"""
+Batched sensitivity analysis for Sandoz Pipeline Application
+
+Every driver is flexed up and down for every product at once: the input
+arrays are tiled into (1 + 2 x drivers) blocks, one column is perturbed per
+block, and the whole stack is valued in a single engine call.
+"""
+
+import numpy as np
+import pandas as pd
+from .config import REPORTING_CURRENCY, SENSITIVITY_CONFIG, VALUATION_CONFIG
+from .fx import load_rate_table
+from .valuation import UPTAKE_YEARS, ACCESS_TIERS, TERRITORY_PARAMETERS, value_arrays
+
+# (driver key, input array, column within that array or None)
+DRIVERS = (
+    [(f"uptake_{year}", "uptake", i) for i, year in enumerate(UPTAKE_YEARS)]
+    + [("peak_share", "peak_share", None), ("wac", "wac", None),
+       ("asp", "asp", None), ("gtn", "gtn", None)]
+    + [(f"access_{tier}", "access", i) for i, tier in enumerate(ACCESS_TIERS)]
+)
+
+DRIVER_LABELS = {
+    **{f"uptake_{year}": f"Uptake {year.upper()}" for year in UPTAKE_YEARS},
+    "peak_share": "Peak Share",
+    "wac": "WAC",
+    "asp": "ASP",
+    "gtn": "GTN %",
+    **{f"access_{tier}": f"Access Tier {i + 1}" for i, tier in enumerate(ACCESS_TIERS)},
+}
+
+VALUATION_INPUTS = (
+    "uptake", "peak_share", "wac", "asp", "gtn", "access", "launch_offset", "market_units", "tier_weights"
+) + TERRITORY_PARAMETERS
+
+
+def run_sensitivity(arrays, step=None, config=VALUATION_CONFIG):
+    """NPV deltas for every product and driver flexed by +/- step
+
+    Returns base NPV (products,) and up/down deltas shaped (products, drivers).
+    """
+    step = SENSITIVITY_CONFIG["relative_step"] if step is None else step
+    n_products = len(arrays["npv"])
+    n_drivers = len(DRIVERS)
+    n_blocks = 1 + 2 * n_drivers
+
+    stacked = {
+        key: np.tile(arrays[key], (n_blocks,) + (1,) * (arrays[key].ndim - 1))
+        for key in VALUATION_INPUTS
+    }
+    for d, (_, name, column) in enumerate(DRIVERS):
+        for block, factor in ((1 + d, 1 + step), (1 + n_drivers + d, 1 - step)):
+            rows = slice(block * n_products, (block + 1) * n_products)
+            if column is None:
+                stacked[name][rows] *= factor
+            else:
+                stacked[name][rows, column] *= factor
+
+    npv = value_arrays(stacked, config)["npv"].reshape(n_blocks, n_products)
+    base = npv[0]
+    return {
+        "ids": arrays["id"],
+        "drivers": [key for key, _, _ in DRIVERS],
+        "step": step,
+        "fx_rate": arrays["fx_rate"],
+        "base": base,
+        "up": (npv[1:1 + n_drivers] - base).T,
+        "down": (npv[1 + n_drivers:] - base).T,
+    }
+
+
+def tornado_frame(sensitivity, index):
+    """Tornado rows for one product, largest swing first"""
+    up = sensitivity["up"][index]
+    down = sensitivity["down"][index]
+    frame = pd.DataFrame({
+        "Driver": [DRIVER_LABELS[d] for d in sensitivity["drivers"]],
+        "Low": np.minimum(up, down),
+        "High": np.maximum(up, down),
+        "Swing": np.abs(up - down),
+    })
+    return frame.sort_values("Swing", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def driver_ranking(sensitivity, currency=REPORTING_CURRENCY, rates=None):
+    """Portfolio-wide driver ranking by total NPV swing, converted to and labelled in ``currency``"""
+    fx = sensitivity["fx_rate"] * (rates or load_rate_table()).rate(REPORTING_CURRENCY, currency)
+    swing = np.abs(sensitivity["up"] - sensitivity["down"])
+    base_total = sensitivity["base"] @ fx
+    upside, downside, total = (f"{label} ({currency}M)" for label in ("Upside", "Downside", "Swing"))
+    frame = pd.DataFrame({
+        "Driver": [DRIVER_LABELS[d] for d in sensitivity["drivers"]],
+        upside: fx @ sensitivity["up"],
+        downside: fx @ sensitivity["down"],
+        total: fx @ swing,
+        "Products Most Sensitive": np.bincount(swing.argmax(axis=1), minlength=len(DRIVERS))
+        if len(swing) else np.zeros(len(DRIVERS), dtype=int),
+    })
+    frame["Swing (% of NPV)"] = frame[total] / base_total * 100 if base_total else 0.0
+    return frame.sort_values(total, ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,149 @@
+"""
+Monte Carlo scenario simulator for Sandoz Pipeline Application
+
+Draws uptake, GTN, access and launch-delay outcomes for every product and
+revalues them in batches. NPV is linear in the uptake and access multipliers
+and the delay only shifts discounting, so each draw reduces to a handful of
+element-wise operations on a (draws, products) block.
+"""
+
+import numpy as np
+import pandas as pd
+from .config import SCENARIO_DISTRIBUTIONS, SIMULATION_CONFIG, VALUATION_CONFIG
+from .valuation import (
+    build_assumption_arrays, uptake_curve, net_price, access_factor
+)
+
+PERCENTILES = (10, 50, 90)
+
+
+def build_distribution_arrays(products, distributions=SCENARIO_DISTRIBUTIONS):
+    """Per-product distribution parameters, merging assumptions.uncertainty overrides"""
+    overrides = [p["assumptions"].get("uncertainty", {}) for p in products]
+
+    def column(driver, key):
+        default = distributions[driver][key]
+        return np.array(
+            [o.get(driver, {}).get(key, default) for o in overrides], dtype=float
+        )
+
+    delay_probs = column("launch_delay", "probabilities").reshape(
+        len(products), len(distributions["launch_delay"]["quarters"])
+    )
+    return {
+        "uptake_low": column("uptake", "low"),
+        "uptake_mode": column("uptake", "mode"),
+        "uptake_high": column("uptake", "high"),
+        "gtn_sd": column("gtn", "sd"),
+        "access_low": column("access", "low"),
+        "access_mode": column("access", "mode"),
+        "access_high": column("access", "high"),
+        "delay_quarters": np.asarray(distributions["launch_delay"]["quarters"], dtype=float),
+        "delay_cdf": np.cumsum(delay_probs / delay_probs.sum(axis=1, keepdims=True), axis=1),
+    }
+
+
+def _base_components(arrays, config):
+    """Draw-independent part of NPV for each product"""
+    horizon = config["horizon_years"]
+    rate = arrays["discount_rate"]
+    share = uptake_curve(arrays["uptake"], arrays["peak_share"], horizon) / 100
+    years = np.arange(1, horizon + 1) - 0.5
+    pv_share = (share * (1 + rate[:, None]) ** -years).sum(axis=1)
+    launch_discount = (1 + rate) ** -np.maximum(arrays["launch_offset"], 0)
+    return arrays["operating_margin"] * arrays["market_units"] * pv_share * launch_discount
+
+
+def _draw_block(rng, arrays, params, n_draws):
+    """Sample one block of driver outcomes, each shaped (draws, products)"""
+    n_products = len(arrays["npv"])
+    shape = (n_draws, n_products)
+    uptake = rng.triangular(params["uptake_low"], params["uptake_mode"], params["uptake_high"], shape)
+    # Scaling the whole ramp cannot push peak share above 100%
+    uptake = np.minimum(uptake, 100 / np.maximum(arrays["peak_share"], 1e-9))
+    gtn = np.clip(arrays["gtn"] + params["gtn_sd"] * rng.standard_normal(shape), 0, 100)
+    access = rng.triangular(params["access_low"], params["access_mode"], params["access_high"], shape)
+    u = rng.random(shape)
+    delay_index = (u[:, :, None] > params["delay_cdf"][None, :, :]).sum(axis=2)
+    delay = params["delay_quarters"][np.minimum(delay_index, len(params["delay_quarters"]) - 1)]
+    return uptake, gtn, access, delay
+
+
+def _histograms(samples, bins):
+    """Per-column histograms in one bincount, returns (counts, edges)"""
+    n_products = samples.shape[1]
+    lo = samples.min(axis=0)
+    hi = samples.max(axis=0)
+    width = np.where(hi > lo, (hi - lo) / bins, 1.0)
+    index = np.clip(((samples - lo) / width).astype(np.int64), 0, bins - 1)
+    flat = index + np.arange(n_products) * bins
+    counts = np.bincount(flat.ravel(), minlength=n_products * bins).reshape(n_products, bins)
+    edges = lo[:, None] + width[:, None] * np.arange(bins + 1)
+    return counts, edges
+
+
+def simulate_arrays(arrays, params, n_draws=None, seed=None,
+                    config=VALUATION_CONFIG, sim_config=SIMULATION_CONFIG):
+    """Run a seeded Monte Carlo valuation over stacked assumptions"""
+    n_draws = n_draws or sim_config["draws"]
+    rng = np.random.default_rng(seed)
+    rate = arrays["discount_rate"]
+    n_products = len(arrays["npv"])
+
+    base = _base_components(arrays, config)
+    reach = access_factor(arrays["access"], arrays["tier_weights"])
+    npv = np.empty((n_draws, n_products))
+    peak_share = np.empty((n_draws, n_products))
+    gtn = np.empty((n_draws, n_products))
+
+    # Bound working memory to roughly chunk_size draw-product cells per block
+    block = max(1, sim_config["chunk_size"] // max(n_products, 1))
+    for start in range(0, n_draws, block):
+        stop = min(start + block, n_draws)
+        uptake_m, gtn_d, access_m, delay = _draw_block(rng, arrays, params, stop - start)
+        npv[start:stop] = (
+            base
+            * uptake_m
+            * np.minimum(reach * access_m, 1.0)
+            * net_price(arrays["wac"], arrays["asp"], gtn_d)
+            * (1 + rate) ** (-delay / 4)
+        )
+        peak_share[start:stop] = arrays["peak_share"] * uptake_m
+        gtn[start:stop] = gtn_d
+
+    # Portfolio totals are in the reporting currency
+    portfolio = npv @ arrays["fx_rate"]
+    counts, edges = _histograms(npv, sim_config["bins"])
+    portfolio_counts, portfolio_edges = _histograms(portfolio[:, None], sim_config["bins"])
+
+    return {
+        "ids": arrays["id"],
+        "draws": n_draws,
+        "seed": seed,
+        "npv": npv,
+        "npv_percentiles": np.percentile(npv, PERCENTILES, axis=0),
+        "peak_share_percentiles": np.percentile(peak_share, PERCENTILES, axis=0),
+        "gtn_percentiles": np.percentile(gtn, PERCENTILES, axis=0),
+        "histogram_counts": counts,
+        "histogram_edges": edges,
+        "portfolio_npv": portfolio,
+        "portfolio_percentiles": np.percentile(portfolio, PERCENTILES),
+        "portfolio_histogram": (portfolio_counts[0], portfolio_edges[0]),
+    }
+
+
+def simulate_portfolio(products, n_draws=None, seed=SIMULATION_CONFIG["seed"],
+                       distributions=SCENARIO_DISTRIBUTIONS):
+    """Run the Monte Carlo simulation for a list of products"""
+    arrays = build_assumption_arrays(products)
+    params = build_distribution_arrays(products, distributions)
+    return simulate_arrays(arrays, params, n_draws=n_draws, seed=seed)
+
+
+def percentile_table(simulation):
+    """P10/P50/P90 NPV per product as a DataFrame indexed by product ID"""
+    return pd.DataFrame(
+        simulation["npv_percentiles"].T,
+        columns=[f"P{p}" for p in PERCENTILES],
+        index=pd.Index(simulation["ids"], name="id"),
+    )
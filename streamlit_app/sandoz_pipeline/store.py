@@ -0,0 +1,342 @@
+"""
+Indexed, columnar product store for Sandoz Pipeline Application
+
+Products are held in a compact model.ProductTable and materialized as
+nested records only when read, alongside a pandas column layout with a
+hash index on product ID and categorical position indexes on priority,
+phase, archetype and territory.
+
+Edits go through update_product(), which patches the edited rows and lets
+the dependency graph refresh only the affected valuations and aggregates.
+"""
+
+import numpy as np
+import pandas as pd
+from .valuation import build_assumption_arrays, value_arrays, valuation_frame, gross_to_net
+from .dependencies import DependencyGraph
+from .aggregation import aggregate_portfolio, cell_keys, kpi_columns
+from .launch_calendar import LaunchCalendar
+from .profiling import record_cache
+from .model import ProductRecords, ProductTable, RecordMap
+from .phases import risk_adjust
+from .diffusion import fit_uptake
+from .config import DIFFUSION_CONFIG
+
+SCALAR_COLUMNS = (
+    "id", "name", "archetype", "phase", "launchDate", "territory",
+    "priority", "npv", "lastUpdated", "updatedBy"
+)
+CATEGORICAL_COLUMNS = ("priority", "phase", "archetype", "territory")
+
+# Edited field -> dependency graph node it feeds; unlisted fields are display-only
+FIELD_NODES = {
+    "launchDate": "assumptions",
+    "territory": "assumptions",
+    "npv": "calibration",
+    "marketUnits": "calibration",
+    "priority": "priority",
+    "archetype": "archetype",
+    "phase": "phase",
+}
+
+
+def merge_changes(record, changes):
+    """Copy of a record with nested changes applied"""
+    merged = dict(record)
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_changes(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _row_slice(arrays, positions):
+    return {key: values[positions] for key, values in arrays.items()}
+
+
+class ProductView:
+    """Read-only selection of store rows, holding positions instead of copies"""
+
+    def __init__(self, store, positions):
+        self.store = store
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __iter__(self):
+        records = self.store.products
+        return (records[i] for i in self.positions)
+
+    def __bool__(self):
+        return len(self.positions) > 0
+
+    @property
+    def ids(self):
+        """Product IDs in this view"""
+        return self.store.frame["id"].to_numpy()[self.positions]
+
+    def column(self, name):
+        """Values of one store column for the rows in this view"""
+        return self.store.frame[name].to_numpy()[self.positions]
+
+    def to_list(self):
+        """Product records in this view"""
+        return list(self)
+
+
+class ProductStore:
+    """Columnar product store with O(1) ID lookup and indexed filters"""
+
+    def __init__(self, products, archetypes=()):
+        # Tables are copied so edits never reach a loader's cached parse
+        self.table = products.copy() if isinstance(products, ProductTable) else ProductTable.from_records(products)
+        self.products = ProductRecords(self.table)
+        self.frame = pd.DataFrame(
+            {col: self.table.column(col) for col in SCALAR_COLUMNS},
+            columns=list(SCALAR_COLUMNS),
+        )
+        for col in CATEGORICAL_COLUMNS:
+            self.frame[col] = self.frame[col].astype("category")
+
+        self.id_index = {pid: pos for pos, pid in enumerate(self.frame["id"])}
+        self.category_index = {
+            col: {
+                key: np.asarray(pos, dtype=np.intp)
+                for key, pos in self.frame.groupby(col, observed=True).indices.items()
+            }
+            for col in CATEGORICAL_COLUMNS
+        }
+        self.archetype_colors = {a["name"]: a["color"] for a in archetypes}
+        self.calendar = LaunchCalendar(self.frame["launchDate"].to_numpy())
+        self._arrays = None
+        self._valuation = None
+        self._aggregates = None
+        self._gross_to_net = None
+        self._uptake_fits = {}
+        self.version = 0
+        self.graph = self._build_graph()
+
+    def __len__(self):
+        return len(self.products)
+
+    @property
+    def ids(self):
+        """All product IDs in store order"""
+        return self.frame["id"].tolist()
+
+    @property
+    def arrays(self):
+        """Valuation input arrays, stacked once per store"""
+        if self._arrays is None:
+            self._arrays = build_assumption_arrays(self.table)
+        return self._arrays
+
+    def snapshot(self):
+        """Frozen product ID -> record mapping of the current state, e.g. as a version log base"""
+        return RecordMap(self.table.copy())
+
+    def valuation(self):
+        """Portfolio valuation DataFrame indexed by product ID, computed once"""
+        record_cache("valuation", hit=self._valuation is not None)
+        if self._valuation is None:
+            self._valuation = valuation_frame(self.arrays, value_arrays(self.arrays))
+        return self._valuation
+
+    def risk_adjustment(self):
+        """Phase probability of success, launch slip and rNPV (local currency) per product
+
+        Not cached: one vectorized pass, cheap enough to rerun on every read.
+        """
+        return risk_adjust(
+            self.frame["npv"].to_numpy(float), self.frame["phase"],
+            self.table.rows["launch_quarter"], self.arrays["discount_rate"],
+        )
+
+    def aggregates(self):
+        """Grouped portfolio KPIs, built in one pass and then kept current by edits
+
+        The single source of every portfolio total and breakdown.
+        """
+        record_cache("aggregates", hit=self._aggregates is not None)
+        if self._aggregates is None:
+            self._aggregates = aggregate_portfolio(self.frame, self.valuation(), self.arrays["fx_rate"],
+                                                   self.calendar.years, rnpv=self.risk_adjustment()["rnpv"])
+        return self._aggregates
+
+    def gross_to_net(self):
+        """Gross-to-net components for all products and years, recomputed only after the store changes"""
+        cached = self._gross_to_net is not None and self._gross_to_net[0] == self.version
+        record_cache("gross_to_net", hit=cached)
+        if not cached:
+            self._gross_to_net = (self.version, gross_to_net(self.arrays))
+        return self._gross_to_net[1]
+
+    def uptake_fit(self, model=None):
+        """Diffusion fit of every product's uptake, fitted once per model and refitted per edited product"""
+        model = model or DIFFUSION_CONFIG["model"]
+        record_cache("uptake_fit", hit=model in self._uptake_fits)
+        if model not in self._uptake_fits:
+            self._uptake_fits[model] = fit_uptake(self.arrays["uptake"], self.arrays["peak_share"], model)
+        return self._uptake_fits[model]
+
+    def portfolio_totals(self):
+        """Portfolio NPV, revenue (reporting currency) and high-priority totals, read from the aggregates"""
+        totals = self.aggregates().totals()
+        return {
+            "total_npv": totals["npv"],
+            "total_products": totals["count"],
+            "high_priority_count": totals["high_priority"],
+            "total_five_year_revenue": totals["five_year_revenue"],
+            "total_peak_revenue": totals["peak_revenue"],
+        }
+
+    def update_product(self, product_id, changes):
+        """Apply field changes to one product and recompute only what depends on them
+
+        ``changes`` mirrors the record layout, e.g.
+        ``{"assumptions": {"pricing": {"gtn": 38.0}}}``. Assumption edits hold
+        the calibrated market volume fixed and revalue the product, writing
+        the new NPV back to the record; editing ``npv`` or
+        ``assumptions.marketUnits`` recalibrates the volume instead.
+        A change that does not parse (e.g. launch quarter '2026-Q5') or
+        empties a required field (e.g. phase None) raises ValueError with
+        the store unchanged. Returns the updated record.
+        """
+        pos = self.id_index.get(product_id)
+        if pos is None:
+            raise KeyError(f"Unknown product ID: {product_id}")
+        if changes.get("id", product_id) != product_id:
+            raise ValueError("Product IDs cannot be changed")
+
+        # Calibrate market volumes against the pre-edit records before they change
+        self.arrays
+        old = self.products[pos]
+        record = merge_changes(old, changes)
+        # The table write checks every value before changing anything and is the first write,
+        # so what follows only applies values already known to be valid
+        self.products[pos] = record
+        for col in SCALAR_COLUMNS:
+            if record[col] != old[col]:
+                self._set_scalar(pos, col, old[col], record[col])
+
+        for key, value in changes.items():
+            if key == "assumptions":
+                for field in value:
+                    self.graph.mark_dirty(FIELD_NODES.get(field, "assumptions"), [pos])
+            elif key in FIELD_NODES:
+                self.graph.mark_dirty(FIELD_NODES[key], [pos])
+        self.graph.recompute()
+        self.version += 1
+        return self.products[pos]
+
+    def _build_graph(self):
+        graph = DependencyGraph()
+        graph.add_node("assumptions", self._refresh_assumptions)
+        graph.add_node("calibration", self._refresh_calibration)
+        graph.add_node("valuation", self._refresh_valuation, depends_on=("assumptions", "calibration"))
+        graph.add_node("uptake_fit", self._refresh_uptake_fit, depends_on=("assumptions",))
+        graph.add_node("priority")
+        graph.add_node("archetype")
+        graph.add_node("phase")
+        graph.add_node("aggregates", self._refresh_aggregates, depends_on=("valuation", "priority", "archetype", "phase"))
+        return graph
+
+    def _records(self, positions):
+        return [self.products[pos] for pos in positions]
+
+    def _refresh_assumptions(self, positions):
+        rows = build_assumption_arrays(self._records(positions))
+        for key, values in rows.items():
+            if key != "market_units":
+                self._arrays[key][positions] = values
+
+    def _refresh_calibration(self, positions):
+        rows = build_assumption_arrays(self._records(positions))
+        self._arrays["npv"][positions] = rows["npv"]
+        self._arrays["market_units"][positions] = rows["market_units"]
+
+    def _refresh_uptake_fit(self, positions):
+        for model, fit in self._uptake_fits.items():
+            refit = fit_uptake(self._arrays["uptake"][positions], self._arrays["peak_share"][positions], model)
+            for key in ("params", "rmse", "converged"):
+                fit[key][positions] = refit[key]
+
+    def _refresh_valuation(self, positions):
+        results = value_arrays(_row_slice(self._arrays, positions))
+        if self._valuation is not None:
+            for col in self._valuation.columns:
+                self._valuation.iloc[positions, self._valuation.columns.get_loc(col)] = results[col]
+        # The revalued NPV becomes the product's recorded NPV
+        self._arrays["npv"][positions] = results["npv"]
+        for pos, npv in zip(positions, results["npv"]):
+            npv = float(npv)
+            if npv != self.table.rows["npv"][pos]:
+                self.table.set_number(pos, "npv", npv)
+                self.frame.iat[pos, self.frame.columns.get_loc("npv")] = npv
+
+    def _refresh_aggregates(self, positions):
+        if self._aggregates is None:
+            return
+        rows = self.frame.iloc[positions]
+        rnpv = risk_adjust(rows["npv"].to_numpy(float), rows["phase"], self.table.rows["launch_quarter"][positions],
+                           self._arrays["discount_rate"][positions])["rnpv"]
+        columns = kpi_columns(rows, self._valuation.iloc[positions], self._arrays["fx_rate"][positions],
+                              self.calendar.years[positions], self._aggregates.reference_year, rnpv)
+        self._aggregates.update(positions, cell_keys(rows), columns)
+
+    def _set_scalar(self, pos, col, old, new):
+        column = self.frame[col]
+        if col in CATEGORICAL_COLUMNS:
+            if new not in column.cat.categories:
+                self.frame[col] = column.cat.add_categories([new])
+            index = self.category_index[col]
+            index[old] = index[old][index[old] != pos]
+            current = index.get(new, np.empty(0, dtype=np.intp))
+            index[new] = np.insert(current, np.searchsorted(current, pos), pos)
+        elif col == "launchDate":
+            self.calendar.move(pos, new)
+        self.frame.iat[pos, self.frame.columns.get_loc(col)] = new
+
+    def position(self, product_id):
+        """Row position of a product ID, or None"""
+        return self.id_index.get(product_id)
+
+    def get(self, product_id):
+        """Product record by ID, or None"""
+        pos = self.id_index.get(product_id)
+        return None if pos is None else self.products[pos]
+
+    def name_of(self, product_id):
+        """Display name for a product ID, falling back to the ID itself"""
+        pos = self.id_index.get(product_id)
+        return product_id if pos is None else self.frame["name"].iat[pos]
+
+    def positions(self, column, values):
+        """Row positions whose categorical column matches any of values"""
+        index = self.category_index[column]
+        if isinstance(values, str):
+            values = [values]
+        parts = [index[v] for v in values if v in index]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        if len(parts) == 1:
+            return parts[0]
+        return np.sort(np.concatenate(parts))
+
+    def filter(self, **criteria):
+        """View of products matching every column=value(s) criterion"""
+        positions = None
+        for column, values in criteria.items():
+            matched = self.positions(column, values)
+            positions = matched if positions is None else np.intersect1d(
+                positions, matched, assume_unique=True
+            )
+        if positions is None:
+            positions = np.arange(len(self.products))
+        return ProductView(self, positions)
+
+    def archetype_color(self, archetype, default="#95A5A6"):
+        """Color for an archetype name"""
+        return self.archetype_colors.get(archetype, default)
@@ -0,0 +1,225 @@
+"""
+Bulk validation of product data for Sandoz Pipeline Application
+
+Checks a whole batch of products in one pass over a flat frame with dotted
+column names (as read by the loaders), instead of walking records one at a
+time. Every check is a vectorized mask over a column or a block of
+columns, so tens of thousands of rows validate in well under a second.
+
+Each failing cell becomes one violation with its row position, product
+id, dotted field name, rule and offending value, collected in a
+``ValidationReport``. Rules:
+
+- ``required``   - a field the model needs is missing or empty
+- ``type``       - a number that is not numeric, or text that is not a string
+- ``format``     - a launch date not in 'YYYY-Qn' form
+- ``unique``     - a product id already used by an earlier valid row
+- ``range``      - a percentage, GTN or price outside its bounds
+- ``monotone``   - uptake falling from one year to the next
+- ``sum``        - access tiers not summing to 100
+- ``asp_le_wac`` - ASP above WAC
+- ``reference``  - archetype, phase or priority not in the configured lists
+"""
+
+import numpy as np
+import pandas as pd
+from .config import ARCHETYPES, PHASE_COLORS, PRIORITY_COLORS, VALIDATION_CONFIG
+from .launch_calendar import QUARTER_PATTERN
+from .model import ACCESS_TIERS, NUMBER_SLOTS, OPTIONAL_NUMBERS, PRICING_FIELDS, ProductTable, UPTAKE_YEARS
+
+TEXT_FIELDS = ("id", "name", "archetype", "phase", "launchDate", "territory", "priority")
+NUMBER_FIELDS = tuple(flat for col, _, flat in NUMBER_SLOTS if col not in OPTIONAL_NUMBERS)
+UPTAKE_FIELDS = tuple(f"assumptions.uptake.{year}" for year in UPTAKE_YEARS)
+ACCESS_FIELDS = tuple(f"assumptions.access.{tier}" for tier in ACCESS_TIERS)
+PRICING = {name: f"assumptions.pricing.{name}" for name in PRICING_FIELDS}
+
+# Field -> allowed values, for referential integrity against the configuration
+REFERENCES = {
+    "archetype": [a["name"] for a in ARCHETYPES],
+    "phase": list(PHASE_COLORS),
+    "priority": list(PRIORITY_COLORS),
+}
+
+REPORT_COLUMNS = ["row", "id", "field", "rule", "value", "message"]
+
+
+class ValidationReport:
+    """Violations found in a batch of products, one row per (row, field, rule)"""
+
+    def __init__(self, violations, n_rows):
+        self.violations = violations
+        self.n_rows = n_rows
+
+    def __len__(self):
+        return len(self.violations)
+
+    @property
+    def ok(self):
+        return self.violations.empty
+
+    @property
+    def invalid_rows(self):
+        """Sorted positions of rows with at least one violation"""
+        return np.unique(self.violations["row"].to_numpy(dtype=np.int64))
+
+    def valid_mask(self):
+        """Boolean mask over the input rows, True where a row has no violations"""
+        mask = np.ones(self.n_rows, dtype=bool)
+        mask[self.invalid_rows] = False
+        return mask
+
+    def summary(self):
+        """Violation and affected-row counts per field and rule"""
+        return (
+            self.violations.groupby(["field", "rule"], sort=True)
+            .agg(violations=("row", "size"), rows=("row", "nunique"))
+            .reset_index()
+        )
+
+    @classmethod
+    def concat(cls, reports):
+        """One report over consecutive batches, with rows renumbered across them"""
+        frames, offset = [], 0
+        for report in reports:
+            frames.append(report.violations.assign(row=report.violations["row"] + offset))
+            offset += report.n_rows
+        if not frames:
+            return validate_products([])
+        return cls(pd.concat(frames, ignore_index=True), offset)
+
+    def messages(self, limit=None):
+        """Display lines 'row N (id) field: message', in row order"""
+        rows = self.violations if limit is None else self.violations.head(limit)
+        return [
+            f"row {row} ({product_id}) {field}: {message}"
+            for row, product_id, field, message in rows[["row", "id", "field", "message"]].itertuples(index=False)
+        ]
+
+
+def validation_frame(products):
+    """Flat dotted-column frame from a DataFrame, a ProductTable or nested records"""
+    if isinstance(products, pd.DataFrame):
+        return products
+    if isinstance(products, ProductTable):
+        return products.to_frame()
+    return pd.json_normalize(list(products), sep=".")
+
+
+def _column(frame, field):
+    if field in frame.columns:
+        return frame[field]
+    return pd.Series(np.nan, index=frame.index, dtype=object)
+
+
+def _numbers(column):
+    """Float values and a mask of present cells that are not numbers"""
+    if pd.api.types.is_bool_dtype(column):
+        return np.full(len(column), np.nan), column.notna().to_numpy()
+    if pd.api.types.is_numeric_dtype(column):
+        return column.to_numpy(float), np.zeros(len(column), dtype=bool)
+    # One bad cell makes a CSV column text, so numeric strings ("12.5") still count as numbers
+    booleans = column.map(lambda v: isinstance(v, (bool, np.bool_))).to_numpy(bool)
+    values = pd.to_numeric(column.where(~booleans), errors="coerce").to_numpy(float)
+    return values, column.notna().to_numpy() & np.isnan(values)
+
+
+def validate_products(products, config=VALIDATION_CONFIG, existing_ids=()):
+    """Check every row of a product batch, returns a ValidationReport
+
+    An ID is a duplicate when an earlier row passing every other check
+    has it, or when it is in ``existing_ids`` (e.g. from earlier chunks of
+    the same file), so a valid row is kept even if an invalid row with its
+    ID came first.
+    """
+    frame = validation_frame(products).reset_index(drop=True)
+    n = len(frame)
+    ids = _column(frame, "id").to_numpy(object)
+    found = []
+
+    def flag(mask, field, rule, message, values):
+        rows = np.flatnonzero(mask)
+        if len(rows):
+            found.append((rows, field, rule, message, np.asarray(values, dtype=object)[rows]))
+
+    # Text fields: present, non-empty strings
+    text = {}
+    for field in TEXT_FIELDS:
+        column = _column(frame, field)
+        if not pd.api.types.is_numeric_dtype(column):
+            column = column.astype(object)
+        raw = column.to_numpy(object)
+        lengths = column.str.len() if column.dtype == object else pd.Series(np.nan, index=frame.index)
+        is_text = lengths.notna().to_numpy()
+        present = column.notna().to_numpy()
+        flag(~present | (is_text & (lengths == 0).to_numpy()), field, "required", "is required", raw)
+        flag(present & ~is_text, field, "type", "must be text", raw)
+        text[field] = column.where(is_text)
+
+    # Numeric fields: present numbers
+    numbers = {}
+    for field in NUMBER_FIELDS:
+        column = _column(frame, field)
+        values, wrong_type = _numbers(column)
+        flag(~column.notna().to_numpy(), field, "required", "is required", column.to_numpy(object))
+        flag(wrong_type, field, "type", "must be a number", column.to_numpy(object))
+        numbers[field] = values
+
+    dates = text["launchDate"]
+    flag(dates.notna().to_numpy() & ~dates.str.fullmatch(QUARTER_PATTERN).fillna(False).to_numpy(bool),
+         "launchDate", "format", "must be YYYY-Qn", dates.to_numpy(object))
+    for field, allowed in REFERENCES.items():
+        values = text[field]
+        flag(values.notna().to_numpy() & ~values.isin(allowed).to_numpy(), field, "reference",
+             f"must be one of {', '.join(allowed)}", values.to_numpy(object))
+
+    # Ranges: uptake, peak share and access are percentages, GTN within its bounds, prices non-negative
+    low, high = config["percent_range"]
+    for field in (*UPTAKE_FIELDS, "assumptions.peakShare", *ACCESS_FIELDS):
+        values = numbers[field]
+        flag((values < low) | (values > high), field, "range", f"must be between {low} and {high}", values)
+    low, high = config["gtn_range"]
+    gtn = numbers[PRICING["gtn"]]
+    flag((gtn < low) | (gtn > high), PRICING["gtn"], "range", f"must be between {low} and {high}", gtn)
+    for name in ("wac", "asp"):
+        values = numbers[PRICING[name]]
+        flag(values < 0, PRICING[name], "range", "must not be negative", values)
+
+    uptake = np.column_stack([numbers[field] for field in UPTAKE_FIELDS])
+    falling = np.diff(uptake, axis=1) < 0
+    for year, field in enumerate(UPTAKE_FIELDS[1:]):
+        flag(falling[:, year], field, "monotone", f"must not fall below {UPTAKE_FIELDS[year].rsplit('.', 1)[1]}",
+             uptake[:, year + 1])
+
+    access = np.column_stack([numbers[field] for field in ACCESS_FIELDS]).sum(axis=1)
+    total = config["access_total"]
+    flag(np.abs(access - total) > config["access_tolerance"], "assumptions.access", "sum",
+         f"tiers must sum to {total}", access)
+
+    wac, asp = numbers[PRICING["wac"]], numbers[PRICING["asp"]]
+    flag(asp > wac, PRICING["asp"], "asp_le_wac", "must not exceed WAC", asp)
+
+    # Uniqueness last: only rows passing every other check claim their ID
+    invalid = np.zeros(n, dtype=bool)
+    for rows, *_ in found:
+        invalid[rows] = True
+    valid_ids = text["id"][~invalid & text["id"].notna().to_numpy()]
+    claimed = valid_ids[~valid_ids.duplicated()]
+    first_valid = text["id"].map(pd.Series(claimed.index, index=claimed.to_numpy()))
+    repeated = (first_valid < frame.index) | text["id"].isin(existing_ids)
+    flag(text["id"].notna().to_numpy() & repeated.to_numpy(), "id", "unique", "duplicates an earlier row", ids)
+
+    if found:
+        rows = np.concatenate([rows for rows, *_ in found])
+        violations = pd.DataFrame({
+            "row": rows,
+            "id": ids[rows],
+            "field": np.concatenate([np.repeat(field, len(r)) for r, field, *_ in found]),
+            "rule": np.concatenate([np.repeat(rule, len(r)) for r, _, rule, *_ in found]),
+            "value": np.concatenate([values for *_, values in found]),
+            "message": np.concatenate([np.repeat(message, len(r)) for r, _, _, message, _ in found]),
+        })
+        violations = violations.sort_values("row", kind="stable", ignore_index=True)
+    else:
+        violations = pd.DataFrame({col: pd.Series(dtype=np.int64 if col == "row" else object)
+                                   for col in REPORT_COLUMNS})
+    return ValidationReport(violations, n)
@@ -0,0 +1,193 @@
+"""
+Vectorized valuation engine for Sandoz Pipeline Application
+
+Products are stacked into column arrays once, and every cash-flow step
+(uptake ramp, access, net price, discounting) runs as a single NumPy
+operation over the whole portfolio. Discount rate, margin, access tier
+weights and currency come from each product's territory assumption set,
+so they are per-product arrays too.
+"""
+
+import numpy as np
+import pandas as pd
+from .config import VALUATION_CONFIG, TERRITORY_ASSUMPTIONS, REPORTING_CURRENCY
+from .fx import load_rate_table
+from .launch_calendar import parse_quarters, quarter_number
+from .model import UPTAKE_YEARS, ACCESS_TIERS
+TERRITORY_PARAMETERS = ("discount_rate", "operating_margin", "admin_fee_rate")
+
+
+def territory_parameters(territories, config=VALUATION_CONFIG, territory_sets=TERRITORY_ASSUMPTIONS,
+                         rates=None):
+    """Per-product valuation parameters, currency and FX factor from territory assumption sets"""
+    rates = rates or load_rate_table()
+    names, inverse = np.unique(np.asarray(territories, dtype=str), return_inverse=True)
+    sets = [{"currency": REPORTING_CURRENCY, **config, **territory_sets.get(name, {})} for name in names]
+    params = {
+        name: np.array([s[name] for s in sets], dtype=float)[inverse] for name in TERRITORY_PARAMETERS
+    }
+    params["tier_weights"] = np.array(
+        [[s["access_tier_weights"][t] for t in ACCESS_TIERS] for s in sets], dtype=float
+    ).reshape(len(sets), len(ACCESS_TIERS))[inverse]
+    currencies = np.array([s["currency"] for s in sets], dtype=object)
+    params["currency"] = currencies[inverse]
+    params["fx_rate"] = rates.factors(currencies)[inverse] if len(sets) else np.empty(0)
+    return params
+
+
+def record_columns(products):
+    """Valuation inputs stacked field by field from nested product records"""
+    assumptions = [p["assumptions"] for p in products]
+    return {
+        "id": np.array([p["id"] for p in products], dtype=object),
+        "npv": np.array([p["npv"] for p in products], dtype=float),
+        "uptake": np.array(
+            [[a["uptake"][k] for k in UPTAKE_YEARS] for a in assumptions], dtype=float
+        ).reshape(len(products), len(UPTAKE_YEARS)),
+        "peak_share": np.array([a["peakShare"] for a in assumptions], dtype=float),
+        "wac": np.array([a["pricing"]["wac"] for a in assumptions], dtype=float),
+        "asp": np.array([a["pricing"]["asp"] for a in assumptions], dtype=float),
+        "gtn": np.array([a["pricing"]["gtn"] for a in assumptions], dtype=float),
+        "access": np.array(
+            [[a["access"][k] for k in ACCESS_TIERS] for a in assumptions], dtype=float
+        ).reshape(len(products), len(ACCESS_TIERS)),
+        "launch_quarter": parse_quarters([p["launchDate"] for p in products]),
+        "market_units": np.array(
+            [a.get("marketUnits", np.nan) for a in assumptions], dtype=float
+        ),
+        "territory": [p["territory"] for p in products],
+    }
+
+
+def build_assumption_arrays(products, config=VALUATION_CONFIG):
+    """Stack product assumptions into portfolio-wide column arrays
+
+    ``products`` is a list of records or a model.ProductTable, whose
+    columns are used directly.
+    """
+    if hasattr(products, "assumption_columns"):
+        arrays = products.assumption_columns()
+    else:
+        arrays = record_columns(products)
+    arrays["launch_offset"] = (arrays.pop("launch_quarter") - quarter_number(config["valuation_date"])) / 4
+    arrays.update(territory_parameters(arrays.pop("territory"), config))
+    arrays["market_units"] = calibrate_market_units(arrays, config)
+    return arrays
+
+
+def uptake_curve(uptake, peak_share, horizon):
+    """Extend the five-year uptake ramp to the horizon, holding at peak share"""
+    n_years = uptake.shape[1]
+    if horizon <= n_years:
+        return uptake[:, :horizon]
+    tail = np.repeat(peak_share[:, None], horizon - n_years, axis=1)
+    return np.hstack([uptake, tail])
+
+
+def net_price(wac, asp, gtn):
+    """Net price per unit after gross-to-net, capped at ASP"""
+    return np.minimum(wac * (1 - gtn / 100), asp)
+
+
+def access_factor(access, weights):
+    """Share of the addressable market reachable given formulary tier mix and tier weights"""
+    return (access * weights).sum(axis=-1) / 100
+
+
+def discount_factors(launch_offset, horizon, rate):
+    """Mid-year discount factors for each launch year, shape (products, horizon)"""
+    years = np.arange(1, horizon + 1) - 0.5
+    rate = np.asarray(rate, dtype=float)
+    if rate.ndim:
+        rate = rate[:, None]
+    return (1 + rate) ** -(np.maximum(launch_offset, 0)[:, None] + years)
+
+
+def unit_revenue(arrays, config=VALUATION_CONFIG):
+    """Net revenue per million addressable units for every product and year"""
+    share = uptake_curve(arrays["uptake"], arrays["peak_share"], config["horizon_years"]) / 100
+    price = net_price(arrays["wac"], arrays["asp"], arrays["gtn"])
+    return share * (access_factor(arrays["access"], arrays["tier_weights"]) * price)[:, None]
+
+
+def gross_to_net(arrays, config=VALUATION_CONFIG):
+    """Gross-to-net revenue components ($M) for every product and year
+
+    Each unit's deduction from WAC to net price is split in order into
+    admin fees (``admin_fee_rate`` of WAC), chargebacks (up to WAC - ASP)
+    and rebates & discounts (the remainder). Deductions are negative, so
+    the components sum to net revenue. Each array has shape
+    (products, horizon).
+    """
+    horizon = config["horizon_years"]
+    share = uptake_curve(arrays["uptake"], arrays["peak_share"], horizon) / 100
+    volume = share * (access_factor(arrays["access"], arrays["tier_weights"]) * arrays["market_units"])[:, None]
+
+    wac = arrays["wac"]
+    price = net_price(wac, arrays["asp"], arrays["gtn"])
+    deduction = np.maximum(wac - price, 0)
+    admin = np.minimum(arrays["admin_fee_rate"] * wac, deduction)
+    chargeback = np.clip(wac - arrays["asp"], 0, deduction - admin)
+    rebate = deduction - admin - chargeback
+
+    return {
+        "wac_revenue": volume * wac[:, None],
+        "rebates": -volume * rebate[:, None],
+        "chargebacks": -volume * chargeback[:, None],
+        "admin_fees": -volume * admin[:, None],
+        "net_revenue": volume * price[:, None],
+    }
+
+
+def calibrate_market_units(arrays, config=VALUATION_CONFIG):
+    """Addressable volume per product, implied by the approved NPV where not given
+
+    Products carry no explicit market size, so the volume is solved such that
+    the base-case assumptions reproduce the recorded ``npv``. An explicit
+    ``assumptions.marketUnits`` (millions of units) takes precedence.
+    """
+    per_unit = arrays["operating_margin"] * (
+        unit_revenue(arrays, config)
+        * discount_factors(arrays["launch_offset"], config["horizon_years"], arrays["discount_rate"])
+    ).sum(axis=1)
+    implied = np.divide(
+        arrays["npv"], per_unit, out=np.zeros_like(per_unit), where=per_unit > 0
+    )
+    return np.where(np.isnan(arrays["market_units"]), implied, arrays["market_units"])
+
+
+def value_arrays(arrays, config=VALUATION_CONFIG):
+    """Compute cash flows, NPV, 5-year and peak revenue for stacked assumptions"""
+    revenue = unit_revenue(arrays, config) * arrays["market_units"][:, None]
+    cash_flows = arrays["operating_margin"][:, None] * revenue
+    discounted = cash_flows * discount_factors(
+        arrays["launch_offset"], config["horizon_years"], arrays["discount_rate"]
+    )
+
+    return {
+        "revenue": revenue,
+        "cash_flows": cash_flows,
+        "npv": discounted.sum(axis=1),
+        "five_year_revenue": revenue[:, :len(UPTAKE_YEARS)].sum(axis=1),
+        "peak_revenue": revenue.max(axis=1),
+        "peak_year": revenue.argmax(axis=1) + 1,
+    }
+
+
+def valuation_frame(arrays, results):
+    """Summary valuation columns as a DataFrame indexed by product ID"""
+    return pd.DataFrame(
+        {
+            "npv": results["npv"],
+            "five_year_revenue": results["five_year_revenue"],
+            "peak_revenue": results["peak_revenue"],
+            "peak_year": results["peak_year"],
+        },
+        index=pd.Index(arrays["id"], name="id"),
+    )
+
+
+def value_portfolio(products, config=VALUATION_CONFIG):
+    """Value every product and return a DataFrame indexed by product ID"""
+    arrays = build_assumption_arrays(products, config)
+    return valuation_frame(arrays, value_arrays(arrays, config))
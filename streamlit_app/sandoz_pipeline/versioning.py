@@ -0,0 +1,237 @@
+"""
+Delta-encoded version history for Sandoz Pipeline Application
+
+Every edit is stored as a structured delta (field path, old value, new
+value) with the NPV impact measured by revaluing the product. Full
+portfolio snapshots are kept every ``checkpoint_every`` versions, so a
+product or the whole portfolio can be rebuilt as of any version or date by
+replaying at most ``checkpoint_every`` deltas from the nearest checkpoint.
+
+The base state is any ID -> record mapping (e.g. a frozen
+ProductStore.snapshot()); the log itself only holds records for products
+edited since the base, and checkpoints copy just that mapping. Records are
+never mutated in place, so checkpoints share the records themselves.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import ChainMap
+from collections.abc import Mapping
+from datetime import date as Date
+
+from .config import REPORTING_CURRENCY, VERSIONING_CONFIG
+
+FIELD_LABELS = {
+    "npv": "NPV ({currency}M)",
+    "launchDate": "launch date",
+    "assumptions.peakShare": "peak share %",
+    "assumptions.pricing.wac": "WAC",
+    "assumptions.pricing.asp": "ASP",
+    "assumptions.pricing.gtn": "GTN%",
+    "assumptions.access.tier1": "Tier 1 access",
+    "assumptions.access.tier2": "Tier 2 access",
+    "assumptions.access.tier3": "Tier 3 access",
+    "assumptions.marketUnits": "market volume",
+}
+
+
+def diff_records(old, new, prefix=""):
+    """Field-level changes between two nested records as [{field, old, new}]"""
+    changes = []
+    for key in list(old) + [k for k in new if k not in old]:
+        field = f"{prefix}{key}"
+        before, after = old.get(key), new.get(key)
+        if isinstance(before, dict) and isinstance(after, dict):
+            changes.extend(diff_records(before, after, f"{field}."))
+        elif before != after:
+            changes.append({"field": field, "old": before, "new": after})
+    return changes
+
+
+def apply_change(record, field, value):
+    """Copy of a record with one dotted field set, sharing untouched branches"""
+    key, _, rest = field.partition(".")
+    updated = dict(record)
+    if rest:
+        updated[key] = apply_change(record.get(key) or {}, rest, value)
+    elif value is None:
+        updated.pop(key, None)
+    else:
+        updated[key] = value
+    return updated
+
+
+def _format_value(value):
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def describe_change(change, currency=REPORTING_CURRENCY):
+    """Human-readable summary of one structured change; money fields are labelled in ``currency``"""
+    field = change["field"]
+    label = FIELD_LABELS.get(field)
+    if label is None and field.startswith("assumptions.uptake."):
+        label = f"{field.rsplit('.', 1)[1].upper()} uptake"
+    label = (label or field.rsplit(".", 1)[-1]).format(currency=currency)
+    if change["old"] is None:
+        return f"Set {label} to {_format_value(change['new'])}"
+    return f"Updated {label} from {_format_value(change['old'])} to {_format_value(change['new'])}"
+
+
+def normalize_date(value):
+    """ISO 'YYYY-MM-DD' for a date, datetime or date string (today if None)"""
+    if value is None:
+        value = Date.today()
+    return str(value.isoformat() if hasattr(value, "isoformat") else value)[:10]
+
+
+def is_structured(entry):
+    """Whether a history entry carries replayable deltas rather than free-text notes"""
+    changes = entry.get("changes") or []
+    return bool(entry.get("product_id")) and all(isinstance(c, dict) for c in changes)
+
+
+class VersionLog:
+    """Append-only product edit log with periodic checkpoints"""
+
+    def __init__(self, products, checkpoint_every=None):
+        self.checkpoint_every = checkpoint_every or VERSIONING_CONFIG["checkpoint_every"]
+        self.base = products if isinstance(products, Mapping) else {p["id"]: p for p in products}
+        # Current records of products edited since the base state
+        self.head = {}
+        self.entries = []
+        self.dates = []
+        self.product_versions = {}
+        self.checkpoints = [(0, {})]
+        self.checkpoint_versions = [0]
+        self.legacy = []
+
+    @classmethod
+    def from_history(cls, products, history, checkpoint_every=None):
+        """Rebuild a log from saved history entries and the current products
+
+        Structured entries are unwound from the current records to recover
+        the base state, then replayed to rebuild checkpoints. Free-text
+        entries (no product_id or string changes) are kept as legacy notes.
+        """
+        structured = sorted(
+            (e for e in history if is_structured(e)), key=lambda e: e["version"]
+        )
+        current = products if isinstance(products, Mapping) else {p["id"]: p for p in products}
+        unwound = {}
+        for entry in reversed(structured):
+            record = unwound.get(entry["product_id"]) or current[entry["product_id"]]
+            for change in reversed(entry["changes"]):
+                record = apply_change(record, change["field"], change["old"])
+            unwound[entry["product_id"]] = record
+
+        log = cls(ChainMap(unwound, current) if unwound else current, checkpoint_every)
+        for entry in structured:
+            log.append(entry)
+        log.legacy = [e for e in history if not is_structured(e)]
+        return log
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def version(self):
+        """Latest version number (0 before any edit)"""
+        return len(self.entries)
+
+    def record(self, store, product_id, changes, user, date=None, note=""):
+        """Apply an edit through the store and log it with its revalued NPV impact"""
+        before = store.get(product_id)
+        if before is None:
+            raise KeyError(f"Unknown product ID: {product_id}")
+        self._check_date(normalize_date(date))
+        after = store.update_product(product_id, changes)
+        return self.append({
+            "product_id": product_id,
+            "date": date,
+            "user": user,
+            "changes": diff_records(before, after),
+            "npvImpact": after["npv"] - before["npv"],
+            "note": note,
+        })
+
+    def append(self, entry):
+        """Append a structured delta, replaying it onto the head state"""
+        product_id = entry["product_id"]
+        if product_id not in self.base:
+            raise KeyError(f"Unknown product ID: {product_id}")
+        day = normalize_date(entry.get("date"))
+        self._check_date(day)
+        version = self.version + 1
+        entry = dict(entry, version=version, date=day)
+
+        record = self.head.get(product_id) or self.base[product_id]
+        for change in entry["changes"]:
+            record = apply_change(record, change["field"], change["new"])
+        self.head[product_id] = record
+
+        self.entries.append(entry)
+        self.dates.append(day)
+        self.product_versions.setdefault(product_id, []).append(version)
+        if version % self.checkpoint_every == 0:
+            self.checkpoints.append((version, dict(self.head)))
+            self.checkpoint_versions.append(version)
+        return entry
+
+    def version_at(self, date):
+        """Latest version recorded on or before a date"""
+        return bisect_right(self.dates, normalize_date(date))
+
+    def _resolve(self, version, date):
+        if date is not None:
+            return self.version_at(date)
+        if version is None:
+            return self.version
+        return max(0, min(int(version), self.version))
+
+    def _checkpoint(self, version):
+        index = bisect_right(self.checkpoint_versions, version) - 1
+        return self.checkpoints[index]
+
+    def product_at(self, product_id, version=None, date=None):
+        """A product record as of a version or date, or None if it did not exist"""
+        version = self._resolve(version, date)
+        start, snapshot = self._checkpoint(version)
+        record = snapshot.get(product_id) or self.base.get(product_id)
+        versions = self.product_versions.get(product_id, [])
+        for v in versions[bisect_right(versions, start):bisect_right(versions, version)]:
+            for change in self.entries[v - 1]["changes"]:
+                record = apply_change(record, change["field"], change["new"])
+        return record
+
+    def portfolio_at(self, version=None, date=None):
+        """All product records as of a version or date"""
+        version = self._resolve(version, date)
+        start, snapshot = self._checkpoint(version)
+        edited = dict(snapshot)
+        for entry in self.entries[start:version]:
+            record = edited.get(entry["product_id"]) or self.base[entry["product_id"]]
+            for change in entry["changes"]:
+                record = apply_change(record, change["field"], change["new"])
+            edited[entry["product_id"]] = record
+        return [edited.get(pid) or self.base[pid] for pid in self.base]
+
+    def history(self, product_id=None, include_legacy=True):
+        """Entries newest first, optionally for one product, followed by legacy notes"""
+        if product_id is None:
+            entries = self.entries[::-1]
+        else:
+            entries = [self.entries[v - 1] for v in reversed(self.product_versions.get(product_id, []))]
+        return entries + (self.legacy if include_legacy else [])
+
+    def entries_between(self, start_date, end_date):
+        """Entries dated within [start_date, end_date]"""
+        lo = bisect_left(self.dates, normalize_date(start_date))
+        hi = bisect_right(self.dates, normalize_date(end_date))
+        return self.entries[lo:hi]
+
+    def to_records(self):
+        """History rows for save_dataset(..., "version_history"), newest first"""
+        return self.history()
+
+    def _check_date(self, day):
+        if self.dates and day < self.dates[-1]:
+            raise ValueError(f"Version dates must not go backwards: {day} is before {self.dates[-1]}")
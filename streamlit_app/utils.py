@@ -1,86 +1,105 @@
 """
 Utility functions for Sandoz Pipeline Application
+
+Helpers that read products take the ProductStore to read from, so the app
+passes its cached store and every helper sees the same data.
 """
 
 import pandas as pd
-from config import (
-    PIPELINE_PRODUCTS, ARCHETYPES, PRIORITY_COLORS, 
-    PHASE_COLORS, FINANCIAL_FACTORS
+from sandoz_pipeline.config import (
+    PRIORITY_COLORS, PHASE_COLORS, REVENUE_WATERFALL, REPORTING_CURRENCY
 )
+from sandoz_pipeline.fx import currency_symbol
+from sandoz_pipeline.valuation import value_portfolio
+from sandoz_pipeline.simulation import simulate_portfolio
+from sandoz_pipeline.validation import validate_products
+from sandoz_pipeline.launch_calendar import LaunchCalendar
 
 def get_priority_color(priority):
     """Get color for priority level"""
     return PRIORITY_COLORS.get(priority, "#95A5A6")
 
-def get_archetype_color(archetype):
+def get_archetype_color(store, archetype):
     """Get color for archetype"""
-    for arch in ARCHETYPES:
-        if arch["name"] == archetype:
-            return arch["color"]
-    return "#95A5A6"
+    return store.archetype_color(archetype)
 
 def get_phase_color(phase):
     """Get color for development phase"""
     return PHASE_COLORS.get(phase, "#6B7280")
 
-def get_product_by_id(product_id):
+def get_product_by_id(store, product_id):
     """Get product data by ID"""
-    for product in PIPELINE_PRODUCTS:
-        if product["id"] == product_id:
-            return product
-    return None
+    return store.get(product_id)
 
-def get_all_products():
+def get_all_products(store):
     """Get all products"""
-    return PIPELINE_PRODUCTS
+    return store.products
+
+def update_product(store, version_log, product_id, changes, user, date=None, note=""):
+    """Edit one product in a store and log the change in its version log, returns the version entry"""
+    return version_log.record(store, product_id, changes, user, date, note)
 
-def calculate_portfolio_metrics():
+def calculate_portfolio_metrics(store):
     """Calculate portfolio-level metrics"""
-    products = get_all_products()
+    totals = store.aggregates().totals()
     
     metrics = {
-        "total_npv": sum(p["npv"] for p in products),
-        "total_products": len(products),
-        "high_priority_count": len([p for p in products if p["priority"] in ["High", "Strategic"]]),
-        "launches_this_year": 3,
-        "average_npv": sum(p["npv"] for p in products) / len(products) if products else 0
+        "total_npv": totals["npv"],
+        "total_products": totals["count"],
+        "high_priority_count": totals["high_priority"],
+        "launches_this_year": totals["launches_this_year"],
+        "launches_next_four_quarters": len(store.calendar.next_quarters(4)),
+        "average_npv": totals["npv_mean"]
     }
     
     return metrics
 
-def calculate_financial_metrics(product):
-    """Calculate financial metrics for a product"""
-    npv = product["npv"]
+def calculate_financial_metrics(store, product):
+    """Calculate financial metrics for a product, valued by the store when it holds this record"""
+    if store.get(product["id"]) == product:
+        valuation = store.valuation().loc[product["id"]]
+    else:
+        valuation = value_portfolio([product]).iloc[0]
+    npv = valuation["npv"]
     
     metrics = {
         "npv": npv,
-        "five_year_revenue": npv * FINANCIAL_FACTORS["five_year_multiplier"],
-        "peak_year_revenue": npv * FINANCIAL_FACTORS["peak_year_multiplier"],
-        "optimistic_npv": npv * FINANCIAL_FACTORS["optimistic_npv_multiplier"],
-        "conservative_npv": npv * FINANCIAL_FACTORS["conservative_npv_multiplier"]
+        "five_year_revenue": valuation["five_year_revenue"],
+        "peak_year_revenue": valuation["peak_revenue"],
+        "peak_year": int(valuation["peak_year"])
     }
     
     return metrics
 
-def create_portfolio_dataframe():
-    """Create DataFrame for portfolio table"""
-    products = get_all_products()
-    
-    df_data = []
-    for product in products:
-        df_data.append({
-            "Product": product["name"],
-            "ID": product["id"],
-            "Archetype": product["archetype"],
-            "Phase": product["phase"],
-            "Launch Date": product["launchDate"],
-            "Priority": product["priority"],
-            "NPV ($M)": f"${product['npv']:.1f}",
-            "Last Updated": product["lastUpdated"],
-            "Updated By": product["updatedBy"]
-        })
-    
-    return pd.DataFrame(df_data)
+def create_portfolio_table(store):
+    """Create sortable portfolio table with valuation (reporting currency) and display colors in one pass"""
+    table = store.frame[["id", "name", "archetype", "phase", "launchDate", "territory", "priority"]].copy()
+    valuation = store.valuation()
+    fx_rate = store.arrays["fx_rate"]
+    table["currency"] = store.arrays["currency"]
+    for column in ("npv", "five_year_revenue", "peak_revenue"):
+        table[column] = valuation[column].to_numpy() * fx_rate
+    risk = store.risk_adjustment()
+    table["rnpv"] = risk["rnpv"] * fx_rate
+    table["probability_of_success"] = risk["probability_of_success"] * 100
+    table["priority_rank"] = table["priority"].map(
+        {name: rank for rank, name in enumerate(PRIORITY_COLORS)}
+    ).astype(float).fillna(len(PRIORITY_COLORS))
+    table["priority_color"] = table["priority"].map(PRIORITY_COLORS).astype(object).fillna("#95A5A6")
+    table["archetype_color"] = table["archetype"].map(store.archetype_colors).astype(object).fillna("#95A5A6")
+    return table
+
+def sort_portfolio_table(table, column, ascending=True):
+    """Sort the portfolio table server-side, ranking priorities by importance"""
+    key = "priority_rank" if column == "priority" else column
+    return table.sort_values(key, ascending=ascending, kind="stable")
+
+def paginate(table, page, page_size):
+    """Slice one page of rows, returns (page rows, page count)"""
+    n_pages = max(1, -(-len(table) // page_size))
+    page = min(max(page, 1), n_pages)
+    start = (page - 1) * page_size
+    return table.iloc[start:start + page_size], n_pages
 
 def create_uptake_dataframe(uptake_dict):
     """Create DataFrame for uptake data"""
@@ -94,122 +113,146 @@ def create_uptake_dataframe(uptake_dict):
     
     return pd.DataFrame(data)
 
-def create_scenario_comparison_dataframe(product):
-    """Create DataFrame for scenario comparison"""
+def create_scenario_comparison_dataframe(product, simulation=None, fx_rate=1.0, currency=REPORTING_CURRENCY):
+    """Create DataFrame for scenario comparison from Monte Carlo percentiles
+
+    NPVs are converted from the product's local currency with ``fx_rate``
+    and shown in ``currency``.
+    """
+    if simulation is None:
+        simulation = simulate_portfolio([product])
+    index = list(simulation["ids"]).index(product["id"])
+    npv = simulation["npv_percentiles"][:, index] * fx_rate
+    peak_share = simulation["peak_share_percentiles"][:, index]
+    gtn = simulation["gtn_percentiles"][:, index]
     assumptions = product["assumptions"]
-    pricing = assumptions["pricing"]
-    peak_share = assumptions["peakShare"]
-    gtn_pct = pricing["gtn"]
     
+    # Higher GTN erodes net price, so the conservative case takes its P90
     data = {
         "Metric": ["NPV", "Peak Share", "GTN %"],
         "Base Case": [
-            f"${product['npv']}M",
-            f"{peak_share}%",
-            f"{gtn_pct}%"
+            format_currency(product["npv"] * fx_rate, currency=currency),
+            f"{assumptions['peakShare']:.1f}%",
+            f"{assumptions['pricing']['gtn']:.1f}%"
         ],
-        "Optimistic": [
-            f"${product['npv'] * 1.25:.1f}M",
-            f"{peak_share + 8}%",
-            f"{gtn_pct - 5}%"
+        "Conservative (P10)": [
+            format_currency(npv[0], currency=currency),
+            f"{peak_share[0]:.1f}%",
+            f"{gtn[2]:.1f}%"
         ],
-        "Conservative": [
-            f"${product['npv'] * 0.75:.1f}M",
-            f"{peak_share - 8}%",
-            f"{gtn_pct + 5}%"
+        "Median (P50)": [
+            format_currency(npv[1], currency=currency),
+            f"{peak_share[1]:.1f}%",
+            f"{gtn[1]:.1f}%"
+        ],
+        "Optimistic (P90)": [
+            format_currency(npv[2], currency=currency),
+            f"{peak_share[2]:.1f}%",
+            f"{gtn[0]:.1f}%"
         ]
     }
     
     return pd.DataFrame(data)
 
-def format_currency(value, decimals=1):
-    """Format value as currency"""
-    return f"${value:,.{decimals}f}M"
+def format_currency(value, decimals=1, currency=REPORTING_CURRENCY):
+    """Format value (millions) in a currency"""
+    return f"{currency_symbol(currency)}{value:,.{decimals}f}M"
 
 def format_percentage(value):
     """Format value as percentage"""
     return f"{value}%"
 
-def get_products_by_priority(priority):
+def get_products_by_priority(store, priority):
     """Get all products with specific priority"""
-    return [p for p in get_all_products() if p["priority"] == priority]
+    return store.filter(priority=priority).to_list()
 
-def get_products_by_phase(phase):
+def get_products_by_phase(store, phase):
     """Get all products with specific phase"""
-    return [p for p in get_all_products() if p["phase"] == phase]
+    return store.filter(phase=phase).to_list()
 
-def get_products_by_archetype(archetype):
+def get_products_by_archetype(store, archetype):
     """Get all products with specific archetype"""
-    return [p for p in get_all_products() if p["archetype"] == archetype]
+    return store.filter(archetype=archetype).to_list()
+
+def get_products_by_territory(store, territory):
+    """Get all products in a specific territory"""
+    return store.filter(territory=territory).to_list()
 
-def get_high_priority_products():
+def get_high_priority_products(store):
     """Get all high and strategic priority products"""
-    return [p for p in get_all_products() if p["priority"] in ["High", "Strategic"]]
+    return store.filter(priority=["High", "Strategic"]).to_list()
 
-def calculate_archetype_distribution():
+def calculate_archetype_distribution(store):
     """Calculate product distribution by archetype"""
     distribution = {}
     
-    for archetype in ARCHETYPES:
-        name = archetype["name"]
-        count = len(get_products_by_archetype(name))
+    total = len(store)
+    counts = store.aggregates().counts("archetype")
+    for name, color in store.archetype_colors.items():
+        count = counts.get(name, 0)
         distribution[name] = {
             "count": count,
-            "color": archetype["color"],
-            "percentage": (count / len(get_all_products()) * 100) if get_all_products() else 0
+            "color": color,
+            "percentage": (count / total * 100) if total else 0
         }
     
     return distribution
 
-def create_waterfall_data():
-    """Create waterfall chart data"""
+def create_waterfall_data(store, product=None, year=1):
+    """Create gross-to-net waterfall chart data for a product (or the portfolio) in a launch year"""
+    components = store.gross_to_net()
+    if product is None:
+        rows = slice(None)
+    else:
+        rows = store.position(product["id"])
+        if rows is None:
+            raise KeyError(f"Unknown product ID: {product['id']}")
     return {
-        "categories": ["Gross Revenue\n(WAC)", "Rebates &\nDiscounts", "Chargebacks", "Admin Fees", "Net Revenue"],
-        "values": [125.0, -42.5, -8.2, -6.8, 67.5],
-        "measures": ["relative", "relative", "relative", "relative", "total"]
+        "categories": [step["Category"] for step in REVENUE_WATERFALL],
+        "values": [float(components[step["Component"]][rows, year - 1].sum()) for step in REVENUE_WATERFALL],
+        "measures": [step["Type"] for step in REVENUE_WATERFALL]
     }
 
-def get_product_timeline(product):
-    """Get timeline for specific product"""
-    return [
-        {"Stage": "FDA Approval", "Date": "2025-Q4", "Status": "Completed"},
-        {"Stage": "Payer Negotiations", "Date": "2026-Q1", "Status": "In Progress"},
-        {"Stage": "Commercial Launch", "Date": product["launchDate"], "Status": "Upcoming"},
-        {"Stage": "Formulary Wins", "Date": "2026-Q3", "Status": "Upcoming"},
-        {"Stage": "Market Expansion", "Date": "2026-Q4", "Status": "Upcoming"}
-    ]
+def get_product_timeline(store, product):
+    """Get timeline for specific product, derived from its launch quarter"""
+    pos = store.position(product["id"])
+    if pos is not None and store.frame["launchDate"].iat[pos] == product["launchDate"]:
+        return store.calendar.milestones(pos)
+    return LaunchCalendar([product["launchDate"]]).milestones(0)
+
+def get_launches_between(store, start, end):
+    """Get products launching between two quarters (inclusive), in launch order"""
+    return [store.products[pos] for pos in store.calendar.between(start, end)]
+
+def get_launches_in_year(store, year):
+    """Get products launching in a calendar year, in launch order"""
+    return [store.products[pos] for pos in store.calendar.in_year(year)]
 
 def validate_product_data(product):
-    """Validate product data structure"""
-    required_fields = [
-        "id", "name", "archetype", "phase", "launchDate",
-        "territory", "priority", "npv", "assumptions",
-        "lastUpdated", "updatedBy"
-    ]
-    
-    for field in required_fields:
-        if field not in product:
-            return False, f"Missing field: {field}"
-    
-    return True, "Valid"
+    """Validate one product record, returns (is_valid, first problem or "Valid")"""
+    report = validate_products([product])
+    if report.ok:
+        return True, "Valid"
+    return False, report.messages(limit=1)[0]
 
-def get_summary_statistics():
+def get_summary_statistics(store):
     """Get summary statistics for portfolio"""
-    products = get_all_products()
-    npvs = [p["npv"] for p in products]
+    aggregates = store.aggregates()
+    totals = aggregates.totals()
     
     stats = {
-        "total_products": len(products),
-        "total_npv": sum(npvs),
-        "average_npv": sum(npvs) / len(npvs) if npvs else 0,
-        "max_npv": max(npvs) if npvs else 0,
-        "min_npv": min(npvs) if npvs else 0,
-        "high_priority": len([p for p in products if p["priority"] in ["High", "Strategic"]]),
-        "by_phase": {
-            "Pre-Launch": len([p for p in products if p["phase"] == "Pre-Launch"]),
-            "Filed": len([p for p in products if p["phase"] == "Filed"]),
-            "Phase 3": len([p for p in products if p["phase"] == "Phase 3"])
-        }
+        "total_products": totals["count"],
+        "total_npv": totals["npv"],
+        "total_rnpv": totals["rnpv"],
+        "average_npv": totals["npv_mean"],
+        "max_npv": totals["npv_max"],
+        "min_npv": totals["npv_min"],
+        "high_priority": totals["high_priority"],
+        "launches_this_year": totals["launches_this_year"],
+        "by_phase": aggregates.counts("phase", PHASE_COLORS),
+        "by_priority": aggregates.counts("priority", PRIORITY_COLORS),
+        "by_archetype": aggregates.counts("archetype"),
+        "by_territory": aggregates.counts("territory")
     }
     
     return stats
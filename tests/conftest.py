@@ -0,0 +1,29 @@
+"""
+Shared fixtures for the sandoz_pipeline tests
+
+The app and its core package live in streamlit_app/, which is put on the
+import path so tests import them the way app.py does.
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+import pytest
+
+APP_DIR = Path(__file__).resolve().parents[1] / "streamlit_app"
+sys.path.insert(0, str(APP_DIR))
+
+from sandoz_pipeline.loaders import load_dataset  # noqa: E402
+from sandoz_pipeline.store import ProductStore  # noqa: E402
+
+
+@pytest.fixture
+def products():
+    """Independent copies of the sample products"""
+    return copy.deepcopy(load_dataset("products"))
+
+
+@pytest.fixture
+def store(products):
+    return ProductStore(products, load_dataset("archetypes"))
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from sandoz_pipeline.batch import value_variants
+from sandoz_pipeline.sensitivity import VALUATION_INPUTS
+from sandoz_pipeline.valuation import value_arrays
+
+
+def revalued(arrays, **multipliers):
+    """Per-product NPVs with whole input arrays scaled, valued directly"""
+    inputs = {key: np.array(arrays[key], dtype=float) for key in VALUATION_INPUTS}
+    for key, factor in multipliers.items():
+        inputs[key] = inputs[key] * np.reshape(factor, (-1,) + (1,) * (inputs[key].ndim - 1))
+    return value_arrays(inputs)["npv"]
+
+
+def test_variants_match_direct_valuation(store):
+    arrays = store.arrays
+    per_product = np.ones((2, len(store)))
+    per_product[1, 0] = 2.0
+    result = value_variants(arrays, {"wac": [1.0, 1.0], "uptake": per_product}, workers=1, keep_products=True)
+
+    base, doubled = revalued(arrays), revalued(arrays, uptake=per_product[1])
+    np.testing.assert_allclose(result["npv"], [base, doubled])
+    np.testing.assert_allclose(result["portfolio_npv"], [base @ arrays["fx_rate"], doubled @ arrays["fx_rate"]])
+    assert result["variants"] == 2
+
+
+def test_worker_processes_match_a_single_process(store):
+    variants = {"discount_rate": np.linspace(0.8, 1.2, 9), "gtn": np.linspace(1.1, 0.9, 9)}
+    single = value_variants(store.arrays, variants, workers=1)
+    pooled = value_variants(store.arrays, variants, workers=2)
+    assert pooled["workers"] == 2
+    np.testing.assert_allclose(pooled["portfolio_npv"], single["portfolio_npv"])
+
+
+@pytest.mark.parametrize("variants, message", [
+    ({}, "No variant drivers"),
+    ({"colour": [1.0]}, "Unknown variant drivers: colour"),
+    ({"wac": [1.0, 1.1], "asp": [1.0]}, "same number of variants"),
+    ({"wac": np.ones((2, 3))}, r"must be shaped \(variants,\) or \(variants, 4\)"),
+])
+def test_rejects_malformed_variants(store, variants, message):
+    with pytest.raises(ValueError, match=message):
+        value_variants(store.arrays, variants, workers=1)
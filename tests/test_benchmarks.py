@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from benchmarks.run_benchmarks import compare, main
+
+
+def test_missing_baseline_is_an_error(tmp_path):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--sizes", "4", "--baseline", str(tmp_path / "baseline.json")])
+    assert exit_info.value.code == 2
+
+
+def test_compare_flags_regressions_and_cases_missing_from_baseline():
+    baseline = {"portfolio/4": {"warm_run_s": 0.1, "elements": 80}}
+    results = {
+        "portfolio/4": {"warm_run_s": 0.2, "elements": 80},
+        "single/4": {"warm_run_s": 0.1, "elements": 99},
+    }
+    regressions = compare(results, baseline)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("portfolio/4 warm_run_s")
+    assert regressions[1].startswith("single/4: not in the baseline")
+
+
+def test_committed_baseline_covers_every_case():
+    from benchmarks.run_benchmarks import DEFAULT_BASELINE, SIZES, VIEWS
+
+    baseline = json.loads(DEFAULT_BASELINE.read_text())
+    assert set(baseline) == {f"{view}/{size}" for view in VIEWS for size in SIZES}
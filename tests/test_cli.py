@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from sandoz_pipeline.cli import main
+from sandoz_pipeline.loaders import save_dataset
+
+
+@pytest.fixture
+def portfolio(tmp_path, products):
+    path = tmp_path / "portfolio.csv"
+    save_dataset(products, str(path), "products")
+    return str(path)
+
+
+def test_recompute_exports_every_product(tmp_path, portfolio, products, capsys):
+    out = tmp_path / "results.csv"
+    assert main(["recompute", "--input", portfolio, "--out", str(out), "--chunk-size", "3"]) == 0
+    assert list(pd.read_csv(out)["ID"]) == [p["id"] for p in products]
+    assert "Recomputed 4 products" in capsys.readouterr().out
+
+
+def test_unknown_output_suffix_is_an_error(tmp_path, portfolio, capsys):
+    assert main(["recompute", "--input", portfolio, "--out", str(tmp_path / "results.txt")]) == 1
+    assert "Cannot infer export format" in capsys.readouterr().err
+
+
+def test_validate_reports_violations_and_fails(tmp_path, products, capsys):
+    products[2]["assumptions"]["pricing"]["asp"] = 10000
+    path = tmp_path / "assumptions.csv"
+    save_dataset(products, str(path), "products")
+    report = tmp_path / "violations.csv"
+    assert main(["validate", "--input", str(path), "--report", str(report)]) == 1
+    assert pd.read_csv(report)[["row", "rule"]].values.tolist() == [[2, "asp_le_wac"]]
+    assert "1 violations in 1 rows" in capsys.readouterr().out
+
+
+def test_batch_values_each_variant_row(tmp_path, portfolio):
+    variants = tmp_path / "variants.csv"
+    pd.DataFrame({"scenario": ["base", "cheap"], "wac": [1.0, 0.5]}).to_csv(variants, index=False)
+    out = tmp_path / "npv.csv"
+    assert main(["batch", "--input", portfolio, "--variants", str(variants), "--out", str(out), "--workers", "1"]) == 0
+    result = pd.read_csv(out)
+    assert result["scenario"].tolist() == ["base", "cheap"]
+    npv = result.iloc[:, -1]
+    assert npv[1] < npv[0]
+
+
+def test_optimize_and_uptake_write_their_outputs(tmp_path, portfolio):
+    selection, fits, curves = (tmp_path / name for name in ("selection.csv", "fits.csv", "curves.csv"))
+    assert main(["optimize", "--input", portfolio, "--budget", "100", "--capacity", "1", "--out", str(selection)]) == 0
+    assert pd.read_csv(selection)["launch_cost"].sum() <= 100
+    assert main(["uptake", "--input", portfolio, "--years", "10", "--out", str(fits), "--curves", str(curves)]) == 0
+    assert len(pd.read_csv(fits)) == 4
+    assert pd.read_csv(curves).shape == (4, 1 + 10 * 12)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from sandoz_pipeline.dependencies import DependencyGraph, GroupedSum
+
+
+def test_recompute_runs_dirty_nodes_downstream_in_order():
+    calls = []
+    graph = DependencyGraph()
+    graph.add_node("input")
+    for name, upstream in [("price", ["input"]), ("volume", ["input"]), ("revenue", ["price", "volume"]),
+                           ("unrelated", [])]:
+        graph.add_node(name, lambda rows, name=name: calls.append((name, rows.tolist())), upstream)
+
+    graph.mark_dirty("input", [3, 1])
+    graph.mark_dirty("volume", [5])
+    assert graph.recompute() == ["input", "price", "volume", "revenue"]
+    assert calls == [("price", [1, 3]), ("volume", [1, 3, 5]), ("revenue", [1, 3, 5])]
+    assert graph.recompute() == []
+
+
+def test_nodes_must_follow_their_dependencies():
+    graph = DependencyGraph()
+    with pytest.raises(ValueError, match="depends on unknown nodes: input"):
+        graph.add_node("price", depends_on=["input"])
+
+
+def test_grouped_sum_moves_rows_between_groups():
+    grouped = GroupedSum(["US", "EU", "US"], {"npv": [1.0, 2.0, 4.0]})
+    assert grouped["US"] == {"npv": 5.0, "count": 2}
+    grouped.update([0, 1], ["EU", "JP"], {"npv": np.array([10.0, 3.0])})
+    assert grouped["US"] == {"npv": 4.0, "count": 1}
+    assert grouped["EU"] == {"npv": 10.0, "count": 1}
+    assert grouped["JP"] == {"npv": 3.0, "count": 1}
+    assert grouped["UK"] == {"count": 0, "npv": 0}
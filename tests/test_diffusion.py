@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from sandoz_pipeline.config import DIFFUSION_CONFIG
+from sandoz_pipeline.diffusion import UPTAKE_TIMES, diffusion_share, fit_uptake
+
+KNOWN = {
+    "bass": [[0.03, 0.38, 40.0], [0.01, 0.9, 25.0], [0.1, 0.5, 60.0], [0.005, 0.7, 15.0], [0.02, 0.6, 50.0]],
+    "logistic": [[1.2, 2.5, 30.0], [0.8, 3.0, 45.0], [1.5, 1.5, 20.0]],
+}
+
+
+@pytest.mark.parametrize("model", sorted(KNOWN))
+def test_recovers_known_parameters(model):
+    params = np.array(KNOWN[model])
+    fit = fit_uptake(diffusion_share(model, params, UPTAKE_TIMES), params[:, 2], model)
+    assert fit["converged"].all()
+    assert fit["rmse"].max() < 1e-4
+    np.testing.assert_allclose(fit["params"], params, rtol=1e-3)
+
+
+def test_exact_bass_curves_converge_with_small_error():
+    rng = np.random.default_rng(0)
+    n = 2000
+    params = np.column_stack([10 ** rng.uniform(-2.5, -0.5, n), rng.uniform(0.1, 1.0, n), rng.uniform(10, 60, n)])
+    fit = fit_uptake(diffusion_share("bass", params, UPTAKE_TIMES), params[:, 2] / rng.uniform(0.6, 1.0, n), "bass")
+    assert fit["converged"].all()
+    assert fit["rmse"].max() < DIFFUSION_CONFIG["restart_rmse"]
+
+
+def test_rejects_unknown_model():
+    with pytest.raises(ValueError, match="Unknown diffusion model"):
+        fit_uptake(np.ones((1, len(UPTAKE_TIMES))), [10.0], "gompertz")
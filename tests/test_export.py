@@ -0,0 +1,33 @@
+import io
+
+import pandas as pd
+import pytest
+
+from sandoz_pipeline.export import export_to_file, write_export
+
+
+def csv_export(store, chunk_size):
+    sink = io.BytesIO()
+    write_export(store, "csv", sink, chunk_size)
+    return sink.getvalue()
+
+
+def test_csv_is_the_same_whatever_the_chunk_size(store):
+    data = csv_export(store, chunk_size=3)
+    assert data == csv_export(store, chunk_size=1000)
+    frame = pd.read_csv(io.BytesIO(data))
+    assert list(frame["ID"]) == [p["id"] for p in store.products]
+    assert frame["NPV (M)"].tolist() == pytest.approx(store.valuation()["npv"].tolist())
+
+
+@pytest.mark.parametrize("fmt, read", [("parquet", pd.read_parquet), ("arrow", pd.read_feather)])
+def test_arrow_formats_match_csv(tmp_path, store, fmt, read):
+    pytest.importorskip("pyarrow")
+    path = export_to_file(store, fmt, tmp_path / f"portfolio.{fmt}", chunk_size=3)
+    expected = pd.read_csv(io.BytesIO(csv_export(store, chunk_size=3)), keep_default_na=False)
+    pd.testing.assert_frame_equal(read(path), expected, check_dtype=False)
+
+
+def test_unsupported_format_is_rejected(store):
+    with pytest.raises(ValueError, match="Unsupported export format: pdf"):
+        write_export(store, "pdf", io.BytesIO())
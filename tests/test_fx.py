@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from sandoz_pipeline.config import FX_RATES
+from sandoz_pipeline.fx import RateTable, load_rate_table
+from sandoz_pipeline.valuation import territory_parameters
+
+
+@pytest.fixture
+def rates():
+    return RateTable(FX_RATES)
+
+
+def test_converts_amounts_along_their_leading_axis(rates):
+    amounts = np.array([[1.0, 2.0], [100.0, 200.0], [10.0, 20.0]])
+    converted = rates.convert(amounts, ["USD", "JPY", "EUR"])
+    np.testing.assert_allclose(converted, [[1.0, 2.0], [0.67, 1.34], [10.8, 21.6]])
+    np.testing.assert_allclose(rates.convert([1.08], ["EUR"], target="EUR"), [1.08])
+    assert rates.rate("GBP", "EUR") == pytest.approx(1.27 / 1.08)
+
+
+def test_unknown_currency_is_rejected(rates):
+    with pytest.raises(ValueError, match="No FX rate for currency: XYZ"):
+        rates.factors(["USD", "XYZ"])
+    with pytest.raises(ValueError, match="No FX rate"):
+        rates.rate("USD", "XYZ")
+
+
+def test_territories_take_their_currency_rate(rates):
+    params = territory_parameters(["US", "JP", "EU", "US"], rates=rates)
+    assert params["currency"].tolist() == ["USD", "JPY", "EUR", "USD"]
+    np.testing.assert_allclose(params["fx_rate"], [1.0, 0.0067, 1.08, 1.0])
+
+
+def test_rate_table_is_rebuilt_only_when_its_source_changes(tmp_path):
+    path = tmp_path / "fx_rates.csv"
+    path.write_text("currency,usd_per_unit\nUSD,1.0\nEUR,1.10\n")
+    table = load_rate_table(str(path))
+    assert load_rate_table(str(path)) is table
+    assert table.rate("EUR") == pytest.approx(1.10)
+
+    path.write_text("currency,usd_per_unit\nUSD,1.0\nEUR,1.125\n")
+    assert load_rate_table(str(path)).rate("EUR") == pytest.approx(1.125)
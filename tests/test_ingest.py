@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from sandoz_pipeline.ingest import ingest_products
+from sandoz_pipeline.model import ProductTable
+
+
+@pytest.fixture
+def frame(products):
+    return ProductTable.from_records(products).to_frame()
+
+
+def write_csv(tmp_path, frame):
+    path = tmp_path / "products.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+
+def test_keeps_valid_rows_and_counts_per_chunk(tmp_path, frame):
+    frame = frame.astype({"assumptions.pricing.wac": object})
+    frame.loc[1, "assumptions.pricing.wac"] = "abc"
+    result = ingest_products(write_csv(tmp_path, frame), chunk_rows=2)
+    assert list(result["table"].column("id")) == ["PRODUCT-001", "PRODUCT-003", "PRODUCT-004"]
+    assert result["chunks"][["rows", "kept", "rejected"]].values.tolist() == [[2, 1, 1], [2, 2, 0]]
+    assert result["report"].violations[["row", "rule"]].values.tolist() == [[1, "type"]]
+
+
+@pytest.mark.parametrize("chunk_rows", [10, 1])
+def test_invalid_first_row_does_not_shadow_valid_duplicate(tmp_path, frame, chunk_rows):
+    invalid = frame.iloc[[0]].astype({"assumptions.pricing.wac": object})
+    invalid["assumptions.pricing.wac"] = "abc"
+    rows = pd.concat([invalid, frame, frame.iloc[[1]]], ignore_index=True)
+    result = ingest_products(write_csv(tmp_path, rows), chunk_rows=chunk_rows)
+    assert list(result["table"].column("id")) == ["PRODUCT-001", "PRODUCT-002", "PRODUCT-003", "PRODUCT-004"]
+    violations = result["report"].violations
+    assert violations[["row", "rule"]].values.tolist() == [[0, "type"], [5, "unique"]]
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from sandoz_pipeline.launch_calendar import LaunchCalendar, parse_quarters, quarter_label, quarter_number
+
+DATES = ["2026-Q3", "2025-Q1", "2026-Q1", "2027-Q4", "2026-Q3"]
+
+
+@pytest.fixture
+def calendar():
+    return LaunchCalendar(DATES, as_of="2026-Q1")
+
+
+def test_quarter_labels_round_trip():
+    numbers = parse_quarters(DATES * 10)
+    assert [quarter_label(n) for n in numbers] == DATES * 10
+    assert quarter_number("2026-Q1") == 2026 * 4
+
+
+def test_invalid_labels_are_rejected():
+    with pytest.raises(ValueError, match="Invalid launch quarter"):
+        parse_quarters(["2026-Q1", "2026-Q5"])
+    with pytest.raises(ValueError, match="2026-05"):
+        parse_quarters(["2026-05"] * 40)
+
+
+def test_range_queries_return_positions_in_launch_order(calendar):
+    assert calendar.in_year(2026).tolist() == [2, 0, 4]
+    assert calendar.between("2025-Q1", "2026-Q1").tolist() == [1, 2]
+    assert calendar.next_quarters(3).tolist() == [2, 0, 4]
+    assert calendar.next_launch("2026-Q4") == 3
+    assert calendar.next_launch("2028-Q1") is None
+    assert calendar.count_by_quarter("2026-Q1", "2026-Q4").tolist() == [1, 0, 2, 0]
+
+
+def test_move_keeps_queries_consistent_with_a_rebuild(calendar):
+    calendar.move(1, "2026-Q2")
+    calendar.move(3, "2026-Q3")
+    rebuilt = LaunchCalendar(["2026-Q3", "2026-Q2", "2026-Q1", "2026-Q3", "2026-Q3"], as_of="2026-Q1")
+    moved = calendar.in_year(2026)
+    assert sorted(moved.tolist()) == sorted(rebuilt.in_year(2026).tolist()) == [0, 1, 2, 3, 4]
+    assert np.array_equal(calendar.quarters[moved], rebuilt.sorted_quarters)
+    assert np.array_equal(calendar.sorted_quarters, rebuilt.sorted_quarters)
+
+
+def test_milestones_are_dated_from_launch(calendar):
+    milestones = calendar.milestones(2)
+    assert [m["Date"] for m in milestones] == [quarter_label(q) for q in calendar.milestone_quarters()[2]]
+    assert {m["Status"] for m in milestones} <= {"Completed", "In Progress", "Upcoming"}
@@ -0,0 +1,40 @@
+import pytest
+
+from sandoz_pipeline.loaders import load_dataset, save_dataset
+from sandoz_pipeline.model import ProductTable
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet", ".db"])
+def test_products_round_trip_through_each_format(tmp_path, products, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"products{suffix}")
+    save_dataset(products, path, "products")
+    table = load_dataset("products", path)
+    assert isinstance(table, ProductTable)
+    assert [table.record(i) for i in range(len(table))] == products
+
+
+def test_list_columns_round_trip(tmp_path):
+    history = load_dataset("version_history")
+    path = str(tmp_path / "portfolio.sqlite")
+    save_dataset(history, path, "version_history")
+    assert load_dataset("version_history", path) == history
+
+
+def test_parse_is_cached_until_the_source_changes(tmp_path, products):
+    path = str(tmp_path / "products.csv")
+    save_dataset(products, path, "products")
+    table = load_dataset("products", path)
+    assert load_dataset("products", path) is table
+
+    products[0]["name"] = "Renamed product"
+    save_dataset(products, path, "products")
+    reloaded = load_dataset("products", path)
+    assert reloaded is not table
+    assert reloaded.record(0)["name"] == "Renamed product"
+
+
+def test_unsupported_format_is_rejected(tmp_path, products):
+    with pytest.raises(ValueError, match="Unsupported data source format"):
+        save_dataset(products, str(tmp_path / "products.json"), "products")
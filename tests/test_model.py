@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from sandoz_pipeline.model import Product, ProductTable
+
+
+def test_round_trips_records(products):
+    table = ProductTable.from_records(products)
+    assert [table.record(i) for i in range(len(table))] == products
+
+
+@pytest.mark.parametrize("field", ["archetype", "phase", "territory", "priority"])
+def test_set_product_rejects_missing_category_like_bulk_build(products, field):
+    products[1][field] = None
+    with pytest.raises(ValueError) as bulk:
+        ProductTable.from_records(products)
+
+    table = ProductTable.from_records(products[:1] + products[2:])
+    rows = table.rows.copy()
+    with pytest.raises(ValueError) as single:
+        table.set_product(0, Product.from_record(products[1]))
+    assert str(single.value) == str(bulk.value) == f"Products are missing {field}"
+    assert table.rows.tobytes() == rows.tobytes()
+
+
+def test_set_product_leaves_row_unchanged_on_bad_quarter(products):
+    table = ProductTable.from_records(products)
+    rows = table.rows.copy()
+    products[0]["launchDate"] = "2026-Q5"
+    with pytest.raises(ValueError):
+        table.set_record(0, products[0])
+    assert table.rows.tobytes() == rows.tobytes()
+
+
+def test_set_product_adds_new_category(products):
+    table = ProductTable.from_records(products)
+    products[0]["phase"] = "Phase 1"
+    table.set_record(0, products[0])
+    assert table.record(0)["phase"] == "Phase 1"
+    assert np.isfinite(table.rows["npv"]).all()
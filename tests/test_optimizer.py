@@ -0,0 +1,72 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from sandoz_pipeline.optimizer import launch_candidates, optimize_portfolio, priority_ranking
+
+
+def random_candidates(seed, n=6, max_delay=2):
+    rng = np.random.default_rng(seed)
+    planned = rng.uniform(-20, 100, n)
+    return {
+        "ids": np.array([f"P{i}" for i in range(n)], dtype=object),
+        "values": planned[:, None] * 0.97 ** np.arange(max_delay + 1),
+        "costs": rng.uniform(10, 60, n),
+        "quarters": rng.integers(8100, 8103, n),
+        "priority": rng.choice(["High", "Medium", "Low"], n).astype(object),
+    }
+
+
+def feasible(candidates, delay, budget, capacity):
+    rows = np.flatnonzero(delay >= 0)
+    _, launches = np.unique(candidates["quarters"][rows] + delay[rows], return_counts=True)
+    return candidates["costs"][rows].sum() <= budget + 1e-9 and (launches <= capacity).all()
+
+
+def brute_force(candidates, budget, capacity):
+    best = 0.0
+    for choice in itertools.product(range(-1, candidates["values"].shape[1]), repeat=len(candidates["costs"])):
+        delay = np.array(choice)
+        if feasible(candidates, delay, budget, capacity):
+            rows = np.flatnonzero(delay >= 0)
+            best = max(best, candidates["values"][rows, delay[rows]].sum())
+    return best
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_branch_and_bound_matches_brute_force(seed):
+    candidates = random_candidates(seed)
+    result = optimize_portfolio(candidates, budget=100, capacity=1, method="branch_and_bound")
+    assert result["optimal"]
+    assert feasible(candidates, result["delay"], 100, 1)
+    assert result["value"] == pytest.approx(brute_force(candidates, 100, 1))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_greedy_and_priority_ranking_stay_feasible(seed):
+    candidates = random_candidates(seed)
+    exact = optimize_portfolio(candidates, budget=100, capacity=1, method="branch_and_bound")
+    greedy = optimize_portfolio(candidates, budget=100, capacity=1, method="greedy")
+    assert feasible(candidates, greedy["delay"], 100, 1)
+    assert greedy["value"] <= exact["value"] + 1e-9
+    assert feasible(candidates, priority_ranking(candidates, 100, 1), 100, 1)
+
+
+def test_store_candidates_are_discounted_per_quarter_of_delay(store):
+    candidates = launch_candidates(store, max_delay=2)
+    assert candidates["values"].shape == (len(store), 3)
+    assert (np.diff(candidates["values"], axis=1) <= 0).all()
+    result = optimize_portfolio(candidates, budget=1e9, capacity=len(store))
+    assert result["method"] == "branch_and_bound"
+    assert result["selected"] == int((candidates["values"][:, 0] > 0).sum())
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"method": "simplex"}, "Unknown optimizer method"),
+    ({"budget": -1}, "must not be negative"),
+    ({"capacity": -1}, "must not be negative"),
+])
+def test_rejects_bad_settings(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        optimize_portfolio(random_candidates(0), **kwargs)
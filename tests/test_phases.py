@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sandoz_pipeline.config import VALUATION_CONFIG
+from sandoz_pipeline.launch_calendar import quarter_number
+from sandoz_pipeline.phases import Phase, phase_parameters, risk_adjust
+
+NOW = quarter_number(VALUATION_CONFIG["valuation_date"])
+
+
+def test_parameters_follow_the_phase_model():
+    labels = ["Phase 3", "Filed", "Approved", None, "Pre-Launch"]
+    probability, quarters = phase_parameters(labels)
+    assert probability.tolist() == [0.60, 0.85, 1.0, 1.0, 0.95]
+    assert quarters.tolist() == [10, 4, 0, 0, 2]
+    categorical = pd.Series(labels, dtype="category")
+    assert [p.tolist() for p in phase_parameters(categorical)] == [probability.tolist(), quarters.tolist()]
+    assert Phase("Filed").probability_of_success == 0.85
+
+
+def test_rnpv_weights_by_success_and_discounts_the_slip():
+    result = risk_adjust([100.0, 100.0, 100.0], ["Phase 3", "Phase 3", "Filed"],
+                         [NOW + 10, NOW + 6, NOW + 8], [0.1, 0.1, 0.1])
+    assert result["slip_quarters"].tolist() == [0, 4, 0]
+    np.testing.assert_allclose(result["rnpv"], [60.0, 60.0 / 1.1, 85.0])
+
+
+def test_store_risk_adjustment_follows_phase_edits(store):
+    store.update_product("PRODUCT-001", {"phase": "Phase 3", "launchDate": "2030-Q1"})
+    result = store.risk_adjustment()
+    assert result["probability_of_success"][0] == 0.60
+    assert result["rnpv"][0] == pytest.approx(0.60 * store.arrays["npv"][0])
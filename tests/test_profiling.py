@@ -0,0 +1,50 @@
+import threading
+
+import pytest
+
+from sandoz_pipeline.profiling import Profiler, record_cache, tracked_call
+
+
+def test_run_interrupted_by_an_exception_is_kept():
+    profiler = Profiler()
+    profiler.enabled = True
+    profiler.begin_run()
+    with pytest.raises(RuntimeError):
+        try:
+            with profiler.section("body"):
+                raise RuntimeError("rerun")
+        finally:
+            profiler.end_run()
+    assert [span["name"] for span in profiler.last_run()["spans"]] == ["body"]
+    record_cache("after", hit=True)
+    assert "after.hit" not in profiler.cache_counters
+
+
+def test_cache_counts_stay_with_the_session_on_its_thread():
+    mine, other = Profiler(), Profiler()
+    mine.enabled = other.enabled = True
+    mine.begin_run()
+
+    def other_session():
+        other.begin_run()
+        record_cache("portfolio", hit=False)
+        other.end_run()
+
+    with mine.section("load"):
+        tracked_call("portfolio", lambda: None)
+        thread = threading.Thread(target=other_session)
+        thread.start()
+        thread.join()
+    mine.end_run()
+    assert mine.cache_counters == {"portfolio.hit": 1}
+    assert other.cache_counters == {"portfolio.miss": 1}
+    span = mine.last_run()["spans"][0]
+    assert (span["cache_hits"], span["cache_misses"]) == (1, 0)
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.section("body"):
+        record_cache("portfolio", hit=True)
+    assert profiler.last_run() is None
+    assert not profiler.cache_counters
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from sandoz_pipeline.config import FX_RATES
+from sandoz_pipeline.fx import RateTable
+from sandoz_pipeline.sensitivity import DRIVERS, VALUATION_INPUTS, driver_ranking, run_sensitivity, tornado_frame
+from sandoz_pipeline.valuation import value_arrays
+
+
+def test_deltas_match_flexing_one_driver_at_a_time(store):
+    arrays = store.arrays
+    sensitivity = run_sensitivity(arrays, step=0.1)
+    base = value_arrays({key: arrays[key] for key in VALUATION_INPUTS})["npv"]
+    np.testing.assert_allclose(sensitivity["base"], base)
+    for d, (_, name, column) in enumerate(DRIVERS):
+        for factor, deltas in ((1.1, sensitivity["up"]), (0.9, sensitivity["down"])):
+            inputs = {key: np.array(arrays[key], dtype=float) for key in VALUATION_INPUTS}
+            if column is None:
+                inputs[name] *= factor
+            else:
+                inputs[name][:, column] *= factor
+            np.testing.assert_allclose(deltas[:, d], value_arrays(inputs)["npv"] - base, atol=1e-9)
+
+
+def test_tornado_puts_the_largest_swing_first(store):
+    frame = tornado_frame(run_sensitivity(store.arrays), 0)
+    assert len(frame) == len(DRIVERS)
+    assert frame["Swing"].is_monotonic_decreasing
+    assert (frame["Low"] <= frame["High"]).all()
+
+
+def test_driver_ranking_converts_to_the_requested_currency(store):
+    sensitivity = run_sensitivity(store.arrays)
+    rates = RateTable(FX_RATES)
+    usd = driver_ranking(sensitivity, "USD", rates)
+    eur = driver_ranking(sensitivity, "EUR", rates)
+    assert usd["Driver"].tolist() == eur["Driver"].tolist()
+    np.testing.assert_allclose(eur["Swing (EURM)"], usd["Swing (USDM)"] * rates.rate("USD", "EUR"))
+    assert eur["Swing (% of NPV)"].tolist() == pytest.approx(usd["Swing (% of NPV)"].tolist())
@@ -0,0 +1,43 @@
+import numpy as np
+
+from sandoz_pipeline.config import SCENARIO_DISTRIBUTIONS
+from sandoz_pipeline.simulation import percentile_table, simulate_portfolio
+from sandoz_pipeline.valuation import build_assumption_arrays
+
+
+def with_delay(probabilities):
+    return {**SCENARIO_DISTRIBUTIONS, "gtn": {"sd": 0.0},
+            "launch_delay": {**SCENARIO_DISTRIBUTIONS["launch_delay"], "probabilities": probabilities}}
+
+
+def test_same_seed_gives_same_draws(products):
+    first = simulate_portfolio(products, n_draws=500, seed=7)
+    assert np.array_equal(simulate_portfolio(products, n_draws=500, seed=7)["npv"], first["npv"])
+    assert not np.array_equal(simulate_portfolio(products, n_draws=500, seed=8)["npv"], first["npv"])
+
+
+def test_summaries_cover_every_draw(products):
+    simulation = simulate_portfolio(products, n_draws=500, seed=7)
+    assert simulation["npv"].shape == (500, len(products))
+    assert (simulation["histogram_counts"].sum(axis=1) == 500).all()
+    assert simulation["portfolio_histogram"][0].sum() == 500
+    table = percentile_table(simulation)
+    assert list(table.columns) == ["P10", "P50", "P90"]
+    assert (table["P10"] <= table["P50"]).all() and (table["P50"] <= table["P90"]).all()
+
+
+def test_launch_delay_discounts_each_draw(products):
+    on_time = simulate_portfolio(products, n_draws=200, seed=3, distributions=with_delay([1, 0, 0, 0]))
+    a_year_late = simulate_portfolio(products, n_draws=200, seed=3, distributions=with_delay([0, 0, 0, 1]))
+    rate = build_assumption_arrays(products)["discount_rate"]
+    np.testing.assert_allclose(a_year_late["npv"], on_time["npv"] / (1 + rate))
+
+
+def test_product_uncertainty_overrides_the_defaults(products):
+    products[0]["assumptions"]["uncertainty"] = {"launch_delay": {"probabilities": [0, 0, 0, 1]}}
+    overridden = simulate_portfolio(products, n_draws=200, seed=3, distributions=with_delay([1, 0, 0, 0]))
+    del products[0]["assumptions"]["uncertainty"]
+    on_time = simulate_portfolio(products, n_draws=200, seed=3, distributions=with_delay([1, 0, 0, 0]))
+    rate = build_assumption_arrays(products)["discount_rate"][0]
+    np.testing.assert_allclose(overridden["npv"][:, 0], on_time["npv"][:, 0] / (1 + rate))
+    np.testing.assert_allclose(overridden["npv"][:, 1:], on_time["npv"][:, 1:])
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from sandoz_pipeline.aggregation import aggregate_portfolio
+
+
+def state(store):
+    return (
+        store.version,
+        store.table.rows.tobytes(),
+        store.frame.copy(),
+        {col: {key: pos.copy() for key, pos in index.items()} for col, index in store.category_index.items()},
+        store.aggregates().totals(),
+    )
+
+
+def assert_unchanged(store, before):
+    version, rows, frame, index, totals = before
+    assert store.version == version
+    assert store.table.rows.tobytes() == rows
+    assert store.frame.equals(frame)
+    assert {col: {k: list(v) for k, v in idx.items()} for col, idx in store.category_index.items()} == \
+        {col: {k: list(v) for k, v in idx.items()} for col, idx in index.items()}
+    assert store.aggregates().totals() == totals
+
+
+@pytest.mark.parametrize("changes", [
+    {"phase": None},
+    {"archetype": float("nan")},
+    {"priority": None},
+    {"launchDate": "2026-Q5"},
+    {"npv": None},
+    {"assumptions": {"pricing": {"wac": "abc"}}},
+])
+def test_failed_edit_leaves_store_unchanged(store, changes):
+    before = state(store)
+    with pytest.raises(ValueError):
+        store.update_product(store.ids[0], changes)
+    assert_unchanged(store, before)
+
+
+def test_unknown_category_updates_every_index(store):
+    pid = store.ids[0]
+    store.update_product(pid, {"phase": "Phase 1"})
+    assert store.get(pid)["phase"] == "Phase 1"
+    assert store.frame["phase"].iat[0] == "Phase 1"
+    assert list(store.positions("phase", "Phase 1")) == [0]
+    assert store.aggregates().counts("phase")["Phase 1"] == 1
+
+
+@pytest.mark.parametrize("changes", [
+    {"assumptions": {"pricing": {"gtn": 40.0}}},
+    {"priority": "Low"},
+    {"phase": "Phase 2"},
+    {"launchDate": "2030-Q2"},
+    {"npv": 999.0},
+])
+def test_incremental_aggregates_match_full_rebuild(store, changes):
+    store.aggregates()
+    store.update_product(store.ids[0], changes)
+    fresh = aggregate_portfolio(store.frame, store.valuation(), store.arrays["fx_rate"], store.calendar.years,
+                                rnpv=store.risk_adjustment()["rnpv"]).totals()
+    totals = store.aggregates().totals()
+    assert totals.keys() == fresh.keys()
+    assert all(np.isclose(totals[key], fresh[key]) for key in fresh)
+    assert store.portfolio_totals()["total_npv"] == totals["npv"]
+
+
+def test_unknown_product_raises_key_error(store):
+    with pytest.raises(KeyError):
+        store.update_product("PRODUCT-999", {"priority": "Low"})
@@ -0,0 +1,48 @@
+import pytest
+
+import utils
+from sandoz_pipeline.store import ProductStore
+from sandoz_pipeline.versioning import VersionLog
+
+
+def test_helpers_read_the_store_they_are_given(store, products):
+    other = ProductStore(products[:2])
+    assert utils.get_product_by_id(store, "PRODUCT-004")["id"] == "PRODUCT-004"
+    assert utils.get_product_by_id(other, "PRODUCT-004") is None
+    assert utils.calculate_portfolio_metrics(store)["total_products"] == 4
+    assert utils.calculate_portfolio_metrics(other)["total_products"] == 2
+    assert utils.get_summary_statistics(other)["total_products"] == 2
+
+
+def test_update_product_edits_only_the_given_store(store, products):
+    other = ProductStore(products)
+    log = VersionLog(store.snapshot())
+    entry = utils.update_product(store, log, "PRODUCT-001", {"priority": "Low"}, "Analyst", "2026-02-01")
+    assert entry["version"] == 1
+    assert store.get("PRODUCT-001")["priority"] == "Low"
+    assert other.get("PRODUCT-001")["priority"] == "High"
+    assert utils.calculate_portfolio_metrics(store)["high_priority_count"] == \
+        utils.calculate_portfolio_metrics(other)["high_priority_count"] - 1
+
+
+def test_failed_update_is_not_logged(store):
+    log = VersionLog(store.snapshot())
+    with pytest.raises(ValueError):
+        utils.update_product(store, log, "PRODUCT-001", {"phase": None}, "Analyst", "2026-02-01")
+    assert len(log) == 0
+
+
+def test_archetype_distribution_counts_every_store_archetype(store):
+    distribution = utils.calculate_archetype_distribution(store)
+    assert set(distribution) == set(store.archetype_colors)
+    assert sum(row["count"] for row in distribution.values()) == len(store)
+
+
+def test_waterfall_steps_sum_to_net_revenue(store):
+    portfolio = utils.create_waterfall_data(store, year=2)
+    *steps, total = portfolio["values"]
+    assert sum(steps) == pytest.approx(total)
+    products = [utils.create_waterfall_data(store, p, year=2)["values"] for p in utils.get_all_products(store)]
+    assert [sum(column) for column in zip(*products)] == pytest.approx(portfolio["values"])
+    with pytest.raises(KeyError):
+        utils.create_waterfall_data(store, {"id": "PRODUCT-999"})
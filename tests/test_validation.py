@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from sandoz_pipeline.validation import ValidationReport, validate_products
+from sandoz_pipeline.versioning import apply_change
+
+
+def test_sample_products_are_valid(products):
+    report = validate_products(products)
+    assert report.ok
+    assert report.valid_mask().all()
+
+
+@pytest.mark.parametrize("field, value, rule, reported", [
+    ("name", "", "required", "name"),
+    ("territory", None, "required", "territory"),
+    ("assumptions.pricing.wac", "abc", "type", "assumptions.pricing.wac"),
+    ("launchDate", "2026-05", "format", "launchDate"),
+    ("phase", "Unknown", "reference", "phase"),
+    ("assumptions.peakShare", 120, "range", "assumptions.peakShare"),
+    ("assumptions.pricing.gtn", -1, "range", "assumptions.pricing.gtn"),
+    ("assumptions.uptake.y3", 1, "monotone", "assumptions.uptake.y3"),
+    ("assumptions.access.tier1", 70, "sum", "assumptions.access"),
+    ("assumptions.pricing.asp", 10000, "asp_le_wac", "assumptions.pricing.asp"),
+    ("id", "PRODUCT-001", "unique", "id"),
+])
+def test_one_bad_cell_is_one_violation(products, field, value, rule, reported):
+    products[1] = apply_change(products[1], field, value)
+    report = validate_products(products)
+    assert report.violations[["row", "field", "rule"]].values.tolist() == [[1, reported, rule]]
+    assert report.valid_mask().tolist() == [True, False, True, True]
+    assert report.messages()[0].startswith(f"row 1 ({products[1]['id']}) {reported}: ")
+
+
+def test_existing_ids_are_duplicates(products):
+    report = validate_products(products[2:], existing_ids=["PRODUCT-004"])
+    assert report.violations[["row", "rule"]].values.tolist() == [[1, "unique"]]
+
+
+def test_concat_renumbers_rows_across_batches(products):
+    products[3]["phase"] = "Unknown"
+    report = ValidationReport.concat([validate_products(products[:2]), validate_products(products[2:])])
+    assert report.n_rows == 4
+    assert report.invalid_rows.tolist() == [3]
+    assert report.summary()[["field", "rule", "violations"]].values.tolist() == [["phase", "reference", 1]]
+    assert np.array_equal(report.valid_mask(), [True, True, True, False])
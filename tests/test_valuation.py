@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from sandoz_pipeline.model import ProductTable
+from sandoz_pipeline.valuation import build_assumption_arrays, gross_to_net, value_arrays, value_portfolio
+
+
+def test_base_case_reproduces_recorded_npv(products):
+    frame = value_portfolio(products)
+    assert list(frame.index) == [p["id"] for p in products]
+    np.testing.assert_allclose(frame["npv"], [p["npv"] for p in products])
+    assert (frame["peak_revenue"] >= frame["five_year_revenue"] / 5).all()
+
+
+def test_records_and_product_table_value_alike(products):
+    from_records = value_portfolio(products)
+    from_table = value_portfolio(ProductTable.from_records(products))
+    np.testing.assert_allclose(from_table.to_numpy(float), from_records.to_numpy(float))
+
+
+def test_explicit_market_units_take_precedence(products):
+    products[0]["assumptions"]["marketUnits"] = 10.0
+    small = value_portfolio(products)
+    products[0]["assumptions"]["marketUnits"] = 20.0
+    large = value_portfolio(products)
+    assert large["npv"].iloc[0] == pytest.approx(2 * small["npv"].iloc[0])
+    assert large["npv"].iloc[0] != pytest.approx(products[0]["npv"])
+    np.testing.assert_allclose(large["npv"].iloc[1:], small["npv"].iloc[1:])
+
+
+def test_npv_falls_with_a_later_launch_and_higher_gtn(products):
+    arrays = build_assumption_arrays(products)
+    base = value_arrays(arrays)["npv"]
+    later = value_arrays(dict(arrays, launch_offset=arrays["launch_offset"] + 1))["npv"]
+    deeper = value_arrays(dict(arrays, gtn=arrays["gtn"] + 10))["npv"]
+    assert (later < base).all()
+    assert (deeper <= base).all() and (deeper < base).any()
+
+
+def test_gross_to_net_components_bridge_wac_to_net_revenue(products):
+    arrays = build_assumption_arrays(products)
+    components = gross_to_net(arrays)
+    bridged = components["wac_revenue"] + components["rebates"] + components["chargebacks"] + components["admin_fees"]
+    np.testing.assert_allclose(bridged, components["net_revenue"])
+    np.testing.assert_allclose(components["net_revenue"], value_arrays(arrays)["revenue"])
+    assert all((components[key] <= 0).all() for key in ("rebates", "chargebacks", "admin_fees"))
@@ -0,0 +1,48 @@
+import pytest
+
+from sandoz_pipeline.versioning import VersionLog
+
+
+def test_rebuilds_products_and_portfolio_at_each_version(store):
+    base = store.snapshot()
+    log = VersionLog(base, checkpoint_every=2)
+    for day, priority in [("2026-02-01", "Low"), ("2026-02-02", "Medium"), ("2026-02-03", "Low")]:
+        log.record(store, "PRODUCT-001", {"priority": priority}, "Analyst", day)
+    log.record(store, "PRODUCT-002", {"phase": "Approved"}, "Analyst", "2026-02-04")
+
+    assert log.version == 4
+    assert log.product_at("PRODUCT-001", version=0) == base["PRODUCT-001"]
+    assert [log.product_at("PRODUCT-001", version=v)["priority"] for v in (1, 2, 3)] == ["Low", "Medium", "Low"]
+    assert log.product_at("PRODUCT-001", date="2026-02-02")["priority"] == "Medium"
+    assert log.portfolio_at() == list(store.products)
+    assert log.portfolio_at(version=3)[1] == base["PRODUCT-002"]
+    assert [e["version"] for e in log.history("PRODUCT-001")] == [3, 2, 1]
+
+
+def test_rebuilds_from_saved_history(store):
+    log = VersionLog(store.snapshot())
+    log.record(store, "PRODUCT-003", {"npv": 100.0}, "Analyst", "2026-02-01")
+    log.record(store, "PRODUCT-003", {"priority": "Low"}, "Analyst", "2026-02-02")
+    legacy = {"version": "v1.0", "date": "2026-01-01", "changes": ["Initial upload"]}
+
+    rebuilt = VersionLog.from_history(store.products, log.to_records() + [legacy])
+    assert rebuilt.version == 2
+    assert rebuilt.product_at("PRODUCT-003", version=0) == log.product_at("PRODUCT-003", version=0)
+    assert rebuilt.portfolio_at() == list(store.products)
+    assert rebuilt.legacy == [legacy]
+
+
+def test_date_going_backwards_is_rejected_before_the_edit(store):
+    log = VersionLog(store.snapshot())
+    log.record(store, "PRODUCT-001", {"priority": "Low"}, "Analyst", "2026-02-02")
+    with pytest.raises(ValueError, match="must not go backwards"):
+        log.record(store, "PRODUCT-001", {"priority": "Medium"}, "Analyst", "2026-02-01")
+    assert store.get("PRODUCT-001")["priority"] == "Low"
+    assert log.version == 1
+
+
+def test_unknown_product_is_rejected(store):
+    log = VersionLog(store.snapshot())
+    with pytest.raises(KeyError):
+        log.record(store, "PRODUCT-999", {"priority": "Low"}, "Analyst", "2026-02-01")
+    assert log.version == 0